@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark of mapper.DateTime against dateutil.parser.parse
+
+Usage: tools/bench_datetime.py [number of records]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+import dateutil.parser
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yakumo import mapper
+
+
+FORMATS = [
+    '2017-01-%02dT%02d:%02d:%02dZ',
+    '2017-01-%02dT%02d:%02d:%02d.000000',
+    '2017-01-%02dT%02d:%02d:%02d+09:00',
+    '2017-01-%02d %02d:%02d:%02d',
+]
+
+
+def make_records(count, unique):
+    """
+    Make timestamps like those in volume/server listings
+
+    Resources created in a batch share their timestamps, so only
+    `unique` of them differ.
+    """
+    ret = []
+    for i in range(count):
+        j = i % unique
+        fmt = FORMATS[i % len(FORMATS)]
+        ret.append(fmt % (j // 86400 % 28 + 1, j // 3600 % 24,
+                          j // 60 % 60, j % 60))
+    return ret
+
+
+def bench(name, func, records):
+    start = time.time()
+    for record in records:
+        func(record)
+    elapsed = time.time() - start
+    print('%-28s %8.3fs %10.0f records/s' %
+          (name, elapsed, len(records) / elapsed))
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for unique in (count, count // 10):
+        records = make_records(count, unique)
+        for record in set(records[:len(FORMATS) * 2]):
+            assert mapper.DateTime.to_attr(None, record) == \
+                dateutil.parser.parse(record), record
+        print('%d records, %d unique' % (count, unique))
+        base = bench('dateutil.parser.parse', dateutil.parser.parse,
+                     records)
+        mapper.DateTime._cache.clear()
+        fast = bench('mapper.DateTime.to_attr',
+                     lambda x: mapper.DateTime.to_attr(None, x), records)
+        print('speedup: %.1fx' % (base / fast))
+        print()
+
+
+if __name__ == '__main__':
+    main()
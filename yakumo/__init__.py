@@ -21,8 +21,10 @@ import os
 
 import os_client_config
 
+from . import batch
 from . import exception
 from . import session
+from . import snapshot
 
 
 class Client(object):
@@ -68,3 +70,126 @@ class Client(object):
             if self._session.config['object_store_api_version'] == '1':
                 import yakumo.swift.v1
                 self.swift = yakumo.swift.v1.Client(self, **kwargs)
+
+    def batch(self, max_workers=batch.MAX_WORKERS, per_service_limit=None):
+        """
+        Create a concurrent fan-out executor
+
+        @keyword max_workers: Number of worker threads
+        @type max_workers: int
+        @keyword per_service_limit: Maximum concurrent calls per service;
+        an int applied to every service or a dict keyed by service type
+        (e.g. {'compute': 4, 'volume': 2})
+        @type per_service_limit: int or dict
+        @return: Batch object
+        @rtype: yakumo.batch.Batch
+        """
+        return batch.Batch(max_workers=max_workers,
+                           per_service_limit=per_service_limit)
+
+    def retry_stats(self):
+        """
+        Retry and latency counters of the session
+
+        @return: {(service, method): {'calls', 'retries', 'failures',
+        'latency_total', 'latency_max'}}
+        @rtype: dict
+        """
+        return self._session.retry_stats.get()
+
+    def rate_limit_stats(self):
+        """
+        Queueing statistics of the client-side rate limiter
+
+        @return: {service: {'requests', 'delayed', 'wait_total',
+        'wait_max'}} (empty if no rate limit is configured)
+        @rtype: dict
+        """
+        if self._session.rate_limiter is None:
+            return {}
+        return self._session.rate_limiter.get_stats()
+
+    def request_stats(self):
+        """
+        Per-request statistics aggregated by the built-in histogram
+
+        @return: {(service, method, templated path): {'count', 'errors',
+        'retries', 'statuses', 'latency_sum', 'latency_max', 'latency_avg',
+        'latency_p50', 'latency_p90', 'latency_p99', 'latency_buckets',
+        'request_bytes', 'response_bytes'}}
+        @rtype: dict
+        """
+        return self._session.histogram.get_stats()
+
+    def add_request_callback(self, callback):
+        """
+        Register a callback called for every request
+
+        @param callback: Called with a yakumo.instrument.RequestRecord
+        @type callback: callable
+        @rtype: None
+        """
+        self._session.instrumentation.add_callback(callback)
+
+    def remove_request_callback(self, callback):
+        """
+        Unregister a callback registered by add_request_callback()
+
+        @param callback: Callback registered
+        @type callback: callable
+        @rtype: None
+        """
+        self._session.instrumentation.remove_callback(callback)
+
+    def snapshot(self, services=None):
+        """
+        Fetch collections in parallel into an in-memory inventory
+
+        References between the resources fetched are resolved without
+        further requests.
+
+        @keyword services: Service types (e.g. 'compute', 'network') or
+        manager paths (e.g. 'server', 'neutron.port'); compute, image,
+        network and volume if None
+        @type services: [str]
+        @return: Snapshot object
+        @rtype: yakumo.snapshot.Snapshot
+        """
+        return snapshot.Snapshot(self, services=services)
+
+    def reference_cache_stats(self):
+        """
+        Hit rate statistics of the cache of catalogs (volume types,
+        flavors, availability zones, etc.) used to resolve references
+
+        @return: {(service, list path): {'hits', 'misses', 'loads',
+        'invalidations', 'size'}} (empty if the cache is disabled)
+        @rtype: dict
+        """
+        if self._session.reference_cache is None:
+            return {}
+        return self._session.reference_cache.get_stats()
+
+    def cache_stats(self):
+        """
+        Statistics of the response cache (response_cache_size option)
+
+        @return: {'hits', 'misses', 'evictions', 'expirations',
+        'invalidations', 'size', 'maxsize'} (empty if the cache is
+        disabled)
+        @rtype: dict
+        """
+        if self._session.response_cache is None:
+            return {}
+        return self._session.response_cache.get_stats()
+
+    def clear_cache(self, service=None):
+        """
+        Drop cached responses
+
+        @keyword service: Service type (None: all services)
+        @type service: str
+        @rtype: None
+        """
+        if self._session.response_cache is not None:
+            self._session.response_cache.invalidate(service)
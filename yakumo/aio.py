@@ -0,0 +1,831 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Asyncio transport and awaitable counterparts of manager/resource methods
+
+aiohttp is required to use AsyncSession.
+"""
+
+import asyncio
+import functools
+import json
+import ssl
+import time
+
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from . import collection
+from . import constant
+from . import exception
+from . import session
+from . import utils
+
+
+ASYNC_POOL_MAXSIZE = 100
+
+
+def reauth(func):
+
+    @functools.wraps(func)
+    async def _wrapper(self, *args, **kwargs):
+        token = self.token
+        try:
+            return await func(self, *args, **kwargs)
+        except exception.Unauthorized:
+            await self.renew_token(token)
+            return await func(self, *args, **kwargs)
+
+    return _wrapper
+
+
+def safe_json_load(body):
+    try:
+        return json.loads(body.decode('utf-8'))
+    except ValueError:
+        return None
+
+
+async def _aiter(iterable):
+    for x in iterable:
+        yield x
+
+
+class AsyncSession(object):
+    """asyncio counterpart of yakumo.session.Session
+
+    It shares endpoints, configuration and the token with the Session
+    object passed, so the same SessionProxy surface can be used on it.
+    """
+
+    def __init__(self, session):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncSession")
+        self._session = session
+        self.config = session.config
+        self.endpoints = session.endpoints
+        self.pool_maxsize = int(self.config.get('async_pool_maxsize',
+                                                ASYNC_POOL_MAXSIZE))
+        self.http_sessions = {}
+
+    @property
+    def token(self):
+        return self._session.token
+
+    def has_endpoint(self, service):
+        return service in self.endpoints
+
+    def get_proxy(self, service):
+        return session.SessionProxy(self, service)
+
+    async def get_token(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._session.get_token)
+
+    async def ensure_token(self):
+        if self._session.token_will_expire():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._session.ensure_token)
+
+    async def renew_token(self, stale_token):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._session.renew_token,
+                                   stale_token)
+
+    def make_headers(self, kwargs, **options):
+        self._session.make_headers(kwargs, **options)
+
+    def make_http_session(self):
+        """
+        Create an aiohttp session with its own connection pool
+
+        :return: aiohttp.ClientSession object
+        """
+        connector = aiohttp.TCPConnector(limit=self.pool_maxsize)
+        return aiohttp.ClientSession(connector=connector)
+
+    def _get_http_session(self, service):
+        loop = asyncio.get_running_loop()
+        http, http_loop = self.http_sessions.get(service, (None, None))
+        if http is None or http.closed or http_loop is not loop:
+            http = self.make_http_session()
+            self.http_sessions[service] = (http, loop)
+        return http
+
+    async def close(self):
+        """
+        Close all pooled connections
+        """
+        for http, loop in self.http_sessions.values():
+            await http.close()
+        self.http_sessions = {}
+
+    @staticmethod
+    def _convert_kwargs(kwargs):
+        kwargs.pop('stream', None)
+        verify = kwargs.pop('verify', True)
+        if verify is False:
+            kwargs['ssl'] = False
+        elif isinstance(verify, str):
+            kwargs['ssl'] = ssl.create_default_context(cafile=verify)
+        headers = kwargs.get('headers')
+        if headers:
+            kwargs['headers'] = {k: str(v) for k, v in headers.items()
+                                 if v is not None}
+        data = kwargs.get('data')
+        if data is not None and \
+                not isinstance(data, (str, bytes, dict)) and \
+                hasattr(data, '__iter__'):
+            kwargs['data'] = _aiter(data)
+        params = kwargs.get('params')
+        if params:
+            # aiohttp takes repeated keys as a list of pairs
+            kwargs['params'] = [
+                (k, str(x)) for k, v in params.items()
+                for x in (v if isinstance(v, (list, tuple)) else [v])]
+        files = kwargs.pop('files', None)
+        if files:
+            form = aiohttp.FormData()
+            for name, f in files.items():
+                form.add_field(name, f)
+            kwargs['data'] = form
+        return kwargs
+
+    async def request(self, service, method, *args, **kwargs):
+        """
+        Send a request via the connection pool of the service
+
+        Don't forget to release the response returned. Error statuses
+        raise exceptions except ones in the ok_statuses keyword.
+
+        :return: aiohttp.ClientResponse object
+        """
+        ok_statuses = kwargs.pop('ok_statuses', ())
+        url = utils.join_path(self.endpoints[service], *args)
+        http = self._get_http_session(service)
+        policy = self._session.retry_policy
+        if policy is not None:
+            policy.budget.deposit()
+            if not session.is_replayable(kwargs):
+                policy = None
+        kwargs = self._convert_kwargs(kwargs)
+        headers = kwargs.setdefault('headers', {})
+        if method not in session.CACHE_SAFE_METHODS:
+            self._session.invalidate_cache(service, *args)
+        start = time.time()
+        retries = 0
+        limiter = self._session.rate_limiter
+        while True:
+            if limiter is not None:
+                wait = limiter.reserve(service)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            await self.ensure_token()
+            headers['X-Auth-Token'] = self.token
+            try:
+                response = await http.request(method, url, **kwargs)
+                status = response.status
+                if status < 400 or policy is None or \
+                        not policy.should_retry(method, retries,
+                                                status=status):
+                    break
+                delay = policy.get_backoff(
+                    retries, response.headers.get('Retry-After'))
+                response.release()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if policy is None or isinstance(e, aiohttp.ClientSSLError) or \
+                        not policy.should_retry(method, retries, error=True):
+                    self._session.record(service, method, args, None,
+                                         retries, time.time() - start)
+                    raise
+                delay = policy.get_backoff(retries)
+            await asyncio.sleep(delay)
+            retries += 1
+        data = kwargs.get('data')
+        request_bytes = None
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if isinstance(data, bytes):
+            request_bytes = len(data)
+        self._session.record(service, method, args, status, retries,
+                             time.time() - start, request_bytes,
+                             response.content_length)
+        if method not in session.CACHE_SAFE_METHODS:
+            self._session.invalidate_cache(service, *args)
+        if status >= 400 and status not in ok_statuses:
+            response.release()
+            raise exception.from_status(status)()
+        return response
+
+    async def _request_body(self, service, method, *args, **kwargs):
+        response = await self.request(service, method, *args, **kwargs)
+        try:
+            return await response.read()
+        finally:
+            response.release()
+
+    @staticmethod
+    def json_body(kwargs):
+        session.Session.json_body(kwargs)
+
+    @reauth
+    @session.config_wrapper
+    async def get(self, service, *args, **kwargs):
+        path = self._session.get_cache_path(args, kwargs)
+        if path is not None:
+            body = self._session.response_cache.get(service, path)
+            if body is not None:
+                return safe_json_load(body)
+        self.make_headers(kwargs)
+        body = await self._request_body(service, 'GET', *args, **kwargs)
+        ret = safe_json_load(body)
+        if path is not None and ret is not None:
+            self._session.response_cache.put(service, path, body)
+        return ret
+
+    @reauth
+    @session.config_wrapper
+    async def head(self, service, *args, **kwargs):
+        self.make_headers(kwargs)
+        response = await self.request(service, 'HEAD', *args, **kwargs)
+        response.release()
+        return CaseInsensitiveDict(response.headers)
+
+    @reauth
+    @session.config_wrapper
+    async def revalidate(self, service, method, *args, **kwargs):
+        self.make_headers(kwargs)
+        session.Session.make_conditional_headers(kwargs)
+        response = await self.request(service, method, *args, **kwargs)
+        try:
+            headers = CaseInsensitiveDict(response.headers)
+            if response.status == 304:
+                return False, headers, None
+            body = None
+            if method == 'GET':
+                body = safe_json_load(await response.read())
+            return True, headers, body
+        finally:
+            response.release()
+
+    @reauth
+    @session.config_wrapper
+    async def delete(self, service, *args, **kwargs):
+        self.make_headers(kwargs)
+        await self._request_body(service, 'DELETE', *args, **kwargs)
+
+    @reauth
+    @session.config_wrapper
+    async def patch(self, service, *args, **kwargs):
+        self.make_headers(kwargs)
+        self.json_body(kwargs)
+        body = await self._request_body(service, 'PATCH', *args, **kwargs)
+        return safe_json_load(body)
+
+    @reauth
+    @session.config_wrapper
+    async def post(self, service, *args, **kwargs):
+        self.make_headers(kwargs)
+        self.json_body(kwargs)
+        body = await self._request_body(service, 'POST', *args, **kwargs)
+        return safe_json_load(body)
+
+    @reauth
+    @session.config_wrapper
+    async def put(self, service, *args, **kwargs):
+        self.make_headers(kwargs)
+        self.json_body(kwargs)
+        body = await self._request_body(service, 'PUT', *args, **kwargs)
+        return safe_json_load(body)
+
+    @reauth
+    @session.config_wrapper
+    async def get_raw(self, service, *args, **kwargs):
+        self.make_headers(kwargs, compress=False)
+        return await self._request_body(service, 'GET', *args, **kwargs)
+
+    @reauth
+    @session.config_wrapper
+    async def post_raw(self, service, *args, **kwargs):
+        self.make_headers(kwargs, content_type="application/octet-stream")
+        body = await self._request_body(service, 'POST', *args, **kwargs)
+        return safe_json_load(body)
+
+    @reauth
+    @session.config_wrapper
+    async def put_raw(self, service, *args, **kwargs):
+        self.make_headers(kwargs, content_type="application/octet-stream")
+        body = await self._request_body(service, 'PUT', *args, **kwargs)
+        return safe_json_load(body)
+
+    @reauth
+    @session.config_wrapper
+    async def get_file(self, service, *args, **kwargs):
+        file = kwargs.pop('file')
+        chunk_size = kwargs.pop('chunk_size', None) or \
+            self._session.download_chunk_size
+        preallocate = kwargs.pop('preallocate', False)
+        offset = session.get_resume_offset(file, kwargs.pop('resume', False))
+        self.make_headers(kwargs, compress=False)
+        headers = kwargs['headers']
+        if offset:
+            headers['Range'] = 'bytes=%d-' % offset
+        response = await self.request(
+            service, 'GET', *args, ok_statuses=(416,) if offset else (),
+            **kwargs)
+        if response.status == 416:
+            # Range Not Satisfiable
+            response.release()
+            if session.get_range_total(response.headers) == offset:
+                # already downloaded completely
+                return CaseInsensitiveDict(response.headers)
+            offset = 0
+            headers.pop('Range')
+            response = await self.request(service, 'GET', *args, **kwargs)
+        if response.status != 206:
+            offset = 0
+        size = None
+        if preallocate and response.content_length:
+            size = offset + response.content_length
+        try:
+            with session.open_download(file, offset, size) as f:
+                try:
+                    async for c in response.content.iter_chunked(chunk_size):
+                        f.write(c)
+                finally:
+                    f.truncate()
+        finally:
+            response.release()
+        return CaseInsensitiveDict(response.headers)
+
+    @reauth
+    @session.config_wrapper
+    async def post_file(self, service, *args, **kwargs):
+        with open(kwargs.pop('file'), 'rb') as f:
+            kwargs['files'] = {'file': f}
+            self.make_headers(kwargs)
+            body = await self._request_body(service, 'POST', *args, **kwargs)
+        return safe_json_load(body)
+
+    @reauth
+    @session.config_wrapper
+    async def put_file(self, service, *args, **kwargs):
+        with open(kwargs.pop('file'), 'rb') as f:
+            kwargs['files'] = {'file': f}
+            self.make_headers(kwargs)
+            body = await self._request_body(service, 'PUT', *args, **kwargs)
+        return safe_json_load(body)
+
+
+class ResourceMixin(object):
+    """awaitable counterparts of yakumo.base.Resource methods"""
+
+    async def areload(self):
+        """
+        (Re)load attributes of a resource
+
+        @return: Whether attributes are updated
+        @rtype: bool
+        """
+        x = await self._manager._arevalidate(self)
+        if x:
+            self._clear_attrs()
+            self._set_attrs(x.__dict__)
+            self._set_validators(x)
+            self._raw = None
+            self._loaded = True
+            return True
+        return False
+
+    async def aupdate(self, **kwargs):
+        """
+        Update a resource and reload it.
+        kwargs: attributes and their values to update
+
+        @rtype: None
+        """
+        json_params = self._attr2json(kwargs)
+        method = getattr(self._manager._ahttp, self._update_method)
+        await method(utils.join_path(self._url_resource_path, self._id),
+                     data={self._json_resource_key: json_params})
+        self._manager._invalidate_cache()
+        await self.areload()
+
+    async def adelete(self):
+        """
+        Delete a resource
+
+        @rtype: None
+        """
+        await self._manager._ahttp.delete(
+            utils.join_path(self._url_resource_path, self._id))
+        self._manager._invalidate_cache()
+
+    async def await_for_finished(self, count=100, interval=15):
+        """
+        Wait for task finished
+
+        @keyword count: Maximum polling time
+        @type count: int
+        @keyword interval: Polling interval in seconds
+        @type interval: int
+        @rtype: None
+        """
+        if self._stable_state == []:
+            return
+        for i in range(count):
+            await asyncio.sleep(interval)
+            try:
+                await self.areload()
+            except exception.NotFound:
+                return
+            if getattr(self, self._state_attr, None) in self._stable_state:
+                return
+
+
+class ManagerMixin(object):
+    """awaitable counterparts of yakumo.base.Manager methods"""
+
+    @property
+    def _ahttp(self):
+        return self._session.get_async_session().get_proxy(self.service_type)
+
+    async def acreate(self, **kwargs):
+        """
+        Create a new resource
+
+        kwargs: attributes of the resource
+
+        @return: Resource object (empty)
+        @rtype: yakumo.base.Resource
+        """
+        json_params = self._attr2json(kwargs)
+        ret = await self._ahttp.post(
+            self._url_resource_path,
+            data={self._json_resource_key: json_params})
+        self._invalidate_cache()
+        attrs = self._json2attr(ret[self._json_resource_key])
+        return self.get_empty(attrs[self._id_attr])
+
+    async def aget(self, id):
+        """
+        Aquire an existing resource object
+
+        @param id: ID
+        @type id: str
+        @return: Resource object
+        @rtype: yakumo.base.Resource
+        """
+        try:
+            ret = await self._ahttp.get(
+                utils.join_path(self._url_resource_path, id))
+            json_params = ret.get(self._json_resource_key)
+            attrs = self._json2attr(json_params)
+            return self.resource_class(self, **attrs)
+        except exception.NotFound:
+            raise
+        except Exception:
+            return None
+
+    async def _arevalidate(self, resource):
+        if self._revalidate_method is None:
+            return await self.aget(resource._id)
+        modified, headers, body = await self._ahttp.revalidate(
+            self._revalidate_method, self._url_resource_path, resource._id,
+            etag=resource._etag, last_modified=resource._last_modified)
+        if not modified:
+            return None
+        ret = self._from_response(resource._id, headers, body)
+        ret._etag = headers.get('ETag')
+        ret._last_modified = headers.get('Last-Modified')
+        return ret
+
+    async def _alist_json(self, params=None):
+        query = dict(params or {})
+        params = dict(query)
+        page_size = self._page_size or self._session.page_size
+        if page_size:
+            params['limit'] = str(page_size)
+        while True:
+            ret = await self._ahttp.get(self._url_resource_list_path,
+                                        params=params)
+            for x in ret[self._json_resources_key]:
+                yield x
+            next_params = self._get_next_params(ret)
+            if not next_params:
+                return
+            next_params = dict(query, **next_params)
+            if next_params == params:
+                return
+            params = next_params
+
+    async def _afind_gen(self, fields=None, **kwargs):
+        kwargs = self._get_conditions(kwargs)
+        params, kwargs = self._get_query_params(kwargs)
+        if self._has_detail:
+            field_params = self._get_field_params(fields, kwargs)
+            params.update(field_params)
+            async for x in self._alist_json(params):
+                ret = self._make_listed(x, kwargs,
+                                        partial=bool(field_params))
+                if ret is not None:
+                    yield ret
+        else:
+            try:
+                ids = [x['id'] async for x in self._alist_json(params)]
+            except Exception:
+                return
+            for id in ids:
+                ret = await self.aget(id)
+                if ret is None:
+                    continue
+                for k, v in kwargs.items():
+                    if getattr(ret, k, None) != v:
+                        break
+                else:
+                    yield ret
+
+    async def afind(self, fields=None, **kwargs):
+        """
+        Query existing resource object matched the conditions
+
+        kwargs is key=value style query conditions.
+        Returns empty list if no matched resource.
+
+        @keyword fields: Attributes to receive if the API supports field
+        selection (Neutron)
+        @type fields: [str]
+        @return: List of Resource object
+        @rtype: yakumo.collection.ResourceSet
+        """
+        if fields is not None:
+            kwargs['fields'] = fields
+        return collection.ResourceSet(
+            [x async for x in self._afind_gen(**kwargs)])
+
+    async def afind_one(self, **kwargs):
+        """
+        Aquire an existing resource object matched the conditions
+
+        kwargs is key=value style query conditions.
+        Returns None if no matched resource.
+
+        @return: Resource object
+        @rtype: yakumo.base.Resource
+        """
+        gen = self._afind_gen(**kwargs)
+        try:
+            return await gen.__anext__()
+        except StopAsyncIteration:
+            return None
+        finally:
+            await gen.aclose()
+
+    async def _amap_parallel(self, func, items):
+        """
+        Await a coroutine function for items concurrently
+
+        Up to hydrate_workers (session option) calls run at once like
+        yakumo.base.Manager._map_parallel().
+
+        @param func: Coroutine function called with an item
+        @type func: callable
+        @param items: Items
+        @type items: iterable
+        @return: Results in the order of items
+        @rtype: list
+        """
+        semaphore = asyncio.Semaphore(max(1, self._session.hydrate_workers))
+
+        async def call(item):
+            async with semaphore:
+                return await func(item)
+        return await asyncio.gather(*[call(x) for x in items])
+
+    async def areload_many(self, resources):
+        """
+        Reload resources at once
+
+        @param resources: Resource objects of the manager
+        @type resources: [yakumo.base.Resource]
+        @return: Resource objects not found
+        @rtype: [yakumo.base.Resource]
+        """
+        resources = list(resources)
+        if not self._can_reload_by_list():
+            async def reload(resource):
+                try:
+                    await resource.areload()
+                    resource._deleted = False
+                except exception.NotFound:
+                    resource._deleted = True
+            await self._amap_parallel(reload, resources)
+            return [x for x in resources if x._deleted]
+        found = {}
+        for params in self._get_reload_params(resources):
+            async for x in self._alist_json(params):
+                attrs = self._json2attr(x)
+                found[attrs.get(self._id_attr)] = attrs
+        return self._set_reloaded(resources, found)
+
+    async def alist(self, fields=None):
+        """
+        Aquire an existing resource object
+
+        @keyword fields: Attributes to receive if the API supports field
+        selection (Neutron)
+        @type fields: [str]
+        @return: List of Resource objects
+        @rtype: yakumo.collection.ResourceSet
+        """
+        return await self.afind(fields=fields)
+
+
+class GlanceV2ResourceMixin(ResourceMixin):
+    """awaitable counterparts of yakumo.base.GlanceV2Resource methods"""
+
+    async def aupdate(self, **kwargs):
+        """
+        Update a resource and reload it.
+        kwargs: attributes and their values to update
+
+        @rtype: None
+        """
+        json_params = self._attr2json(kwargs)
+        await self._manager._ahttp.put(
+            utils.join_path(self._url_resource_path, self._id),
+            data=json_params)
+        self._manager._invalidate_cache()
+
+
+class GlanceV2ManagerMixin(ManagerMixin):
+    """awaitable counterparts of yakumo.base.GlanceV2Manager methods"""
+
+    async def acreate(self, **kwargs):
+        """
+        Create a new resource
+
+        kwargs: attributes of the resource
+
+        @return: Resource object (empty)
+        @rtype: yakumo.base.Resource
+        """
+        json_params = self._attr2json(kwargs)
+        ret = await self._ahttp.post(self._url_resource_path,
+                                     data=json_params)
+        self._invalidate_cache()
+        attrs = self._json2attr(ret)
+        return self.get_empty(attrs[self._id_attr])
+
+    async def aget(self, id):
+        """
+        Aquire an existing resource object
+
+        @param id: ID
+        @type id: str
+        @return: Resource object
+        @rtype: yakumo.base.Resource
+        """
+        try:
+            json_params = await self._ahttp.get(
+                utils.join_path(self._url_resource_path, id))
+            attrs = self._json2attr(json_params)
+            return self.resource_class(self, **attrs)
+        except exception.NotFound:
+            raise
+        except Exception:
+            return None
+
+
+class SwiftV1ResourceMixin(ResourceMixin):
+    """awaitable counterparts of yakumo.base.SwiftV1Resource methods"""
+
+    async def aupdate(self, **kwargs):
+        """
+        Update a resource and reload it.
+        kwargs: attributes and their values to update
+
+        @rtype: None
+        """
+        if not self._loaded:
+            await self.areload()
+        attrs = self.get_attrs()
+        for key, value in kwargs.items():
+            if value is constant.UNDEF:
+                continue
+            attrs[key] = value
+        headers = self._attr2json(attrs)
+        await self._manager._ahttp.post_raw(self._url_resource_path,
+                                            self._id, headers=headers)
+        self._manager._invalidate_cache()
+        await self.areload()
+
+
+class SwiftV1ManagerMixin(ManagerMixin):
+    """awaitable counterparts of yakumo.base.SwiftV1Manager methods"""
+
+    async def acreate(self, name, data=None, **kwargs):
+        """
+        Create a resource
+
+        kwargs: attributes of the resource
+
+        @keyword name: Resource name
+        @type name: str
+        @return: Resource object (empty)
+        @rtype: yakumo.base.Resource
+        """
+        headers = self._attr2json(kwargs)
+        await self._ahttp.put_raw(self._url_resource_path, name,
+                                  headers=headers, data=data)
+        self._invalidate_cache()
+        return self.get_empty(name)
+
+    async def aget(self, name):
+        """
+        Aquire an existing resource object
+
+        @param name: name
+        @type name: str
+        @return: Resource object
+        @rtype: yakumo.base.Resource
+        """
+        try:
+            json_params = await self._ahttp.head(
+                utils.join_path(self._url_resource_path, name))
+            json_params['name'] = name
+            attrs = self._json2attr(json_params)
+            return self.resource_class(self, **attrs)
+        except exception.NotFound:
+            raise
+        except Exception:
+            return None
+
+    async def _alist_json(self, params=None):
+        params = dict(params or {})
+        limit = self._page_size or self._session.page_size
+        params['limit'] = min(limit or constant.SWIFT_LIST_LIMIT,
+                              constant.SWIFT_LIST_LIMIT)
+        while True:
+            ret = await self._ahttp.get(self._url_resource_path,
+                                        params=params)
+            for x in ret:
+                yield x
+            if len(ret) < params['limit'] or 'name' not in ret[-1]:
+                return
+            params['marker'] = ret[-1]['name']
+
+    async def _afind_gen(self, fields=None, **kwargs):
+        try:
+            items = [x async for x in self._alist_json()]
+        except Exception:
+            return
+        for x in items:
+            if 'name' not in x:
+                continue
+            ret = self._listed_resource(x)
+            if any(k not in ret.__dict__ for k in kwargs):
+                await ret.areload()
+            for k, v in kwargs.items():
+                if getattr(ret, k, None) != v:
+                    break
+            else:
+                yield ret
+
+
+class NovaKeyPairManagerMixin(ManagerMixin):
+    """awaitable counterparts of Nova key pair manager methods"""
+
+    async def _afind_gen(self, fields=None, **kwargs):
+        ret = await self._ahttp.get(self._url_resource_list_path)
+        for x in self._find_listed(ret, kwargs):
+            yield x
+
+
+class NovaSecurityGroupRuleManagerMixin(ManagerMixin):
+    """awaitable counterparts of Nova security group rule manager methods"""
+
+    async def aget(self, id):
+        # rules are read from the security group without requests
+        return self.get(id)
+
+    async def _afind_gen(self, fields=None, **kwargs):
+        for x in self._find_gen(**kwargs):
+            yield x
@@ -17,11 +17,15 @@
 Abstract classes for resource management
 """
 
+import collections
+from concurrent import futures
 import copy
 import inspect
 import six
+import sys
 import time
 
+from . import collection
 from . import constant
 from . import exception
 from . import mapper
@@ -31,17 +35,66 @@ from . import utils
 WRAPPER_METHODS = []
 BAD_ATTRS = ['self']
 
+# maximum number of IDs in a list request of Manager.reload_many()
+RELOAD_CHUNK_SIZE = 100
 
-class Resource(object):
+# number of items older than the high-water mark checked by Manager.sync()
+# to confirm that the API sorted the list by update time
+SYNC_SORT_CHECK_SIZE = 20
+
+
+if sys.version_info >= (3, 7):
+    from .aio import GlanceV2ManagerMixin as _AsyncGlanceV2ManagerMixin
+    from .aio import GlanceV2ResourceMixin as _AsyncGlanceV2ResourceMixin
+    from .aio import ManagerMixin as _AsyncManagerMixin
+    from .aio import ResourceMixin as _AsyncResourceMixin
+    from .aio import SwiftV1ManagerMixin as _AsyncSwiftV1ManagerMixin
+    from .aio import SwiftV1ResourceMixin as _AsyncSwiftV1ResourceMixin
+else:
+    _AsyncGlanceV2ManagerMixin = _AsyncGlanceV2ResourceMixin = object
+    _AsyncManagerMixin = _AsyncResourceMixin = object
+    _AsyncSwiftV1ManagerMixin = _AsyncSwiftV1ResourceMixin = object
+
+
+def _manager_attr(name):
+    """
+    Property reading an attribute shared with the manager of a resource
+
+    @param name: Attribute name of the manager
+    @type name: str
+    @return: property object
+    @rtype: property
+    """
+    return property(lambda self: getattr(self._manager, name))
+
+
+class Resource(_AsyncResourceMixin):
     """Base class for resources."""
 
     _id = None
-    _attrs = []
+    _deleted = False
+    _etag = None
+    _last_modified = None
     _loaded = True
+    _raw = None
     _sub_manager_list = {}
     _state_attr = 'status'
     _stable_state = []
 
+    # shared with the manager instead of being copied per resource
+    _attr2json = _manager_attr('_attr2json')
+    _attrs = _manager_attr('_attrs')
+    _client = _manager_attr('_client')
+    _has_extra_attr = _manager_attr('_has_extra_attr')
+    _http = _manager_attr('_http')
+    _id_attr = _manager_attr('_id_attr')
+    _json2attr = _manager_attr('_json2attr')
+    _json_resource_key = _manager_attr('_json_resource_key')
+    _no_such_api = _manager_attr('_no_such_api')
+    _update_method = _manager_attr('_update_method')
+    _url_resource_path = _manager_attr('_url_resource_path')
+    _verbose = _manager_attr('_verbose')
+
     def __init__(self, manager, *args, **kwargs):
         """
         Create a resource object
@@ -54,33 +107,15 @@ class Resource(object):
         @rtype: yakumo.base.Resource
         """
         self._manager = manager
-        self._attr2json = manager._attr2json
-        self._client = manager._client
-        self._has_extra_attr = manager._has_extra_attr
-        self._http = manager._http
-        self._id_attr = manager._id_attr
-        self._json2attr = manager._json2attr
-        self._json_resource_key = manager._json_resource_key
-        self._no_such_api = manager._no_such_api
-        self._update_method = manager._update_method
-        self._url_resource_path = manager._url_resource_path
-        self._verbose = manager._verbose
 
         id = kwargs.get(self._id_attr)
         if isinstance(id, Resource):
             self._id = id._id
         else:
             self._id = id
-        self._attrs = [attr
-                       for attr, json_attr, _mapper
-                       in manager._attr_mapping]
         self._set_attrs(kwargs)
         if len(kwargs) == 1 and self._id_attr in kwargs:
             self._loaded = False
-        if len(kwargs) >= 1 and self._id_attr in kwargs:
-            for attr, sub_manager in self._sub_manager_list.items():
-                setattr(self, attr,
-                        sub_manager(self, *args, **kwargs))
 
     def __enter__(self):
         return self
@@ -95,12 +130,13 @@ class Resource(object):
     def __eq__(self, other):
         if not isinstance(other, Resource):
             return False
-        return self._id == other._id
+        return self.__class__ is other.__class__ and self._id == other._id
 
     def __ne__(self, other):
-        if not isinstance(other, Resource):
-            return True
-        return self._id != other._id
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.__class__, self._id))
 
     def __repr__(self):
         if 'name' in self._attrs and self._id_attr != 'name' and self._loaded:
@@ -123,15 +159,61 @@ class Resource(object):
             return self.__repr__()
 
     def __getattr__(self, name):
+        if name == '_manager':
+            # not initialized yet, e.g. while being unpickled
+            raise AttributeError(name)
+        sub_manager = self._sub_manager_list.get(name)
+        if sub_manager is not None and self._id is not None:
+            # sub managers are created on the first access
+            value = sub_manager(self)
+            setattr(self, name, value)
+            return value
         if not self._has_extra_attr and name not in self._attrs:
             raise AttributeError(name)
         if name == self._id_attr:
             return self._id
+        if self._raw is not None:
+            found, value = self._decode_raw(name)
+            if found:
+                return value
         if not self._loaded:
             self.reload()
             return self.__dict__.get(name)
         return None
 
+    def _decode_raw(self, name):
+        """
+        Decode an attribute from the JSON kept by a lazy resource
+
+        The value is memoised. Managers post-processing attributes in
+        their _json2attr() decode all attributes at once.
+
+        @param name: Attribute name
+        @type name: str
+        @return: (whether found, value)
+        @rtype: (bool, object)
+        """
+        if not self._manager._has_plain_json2attr():
+            attrs = self._decode_all()
+            return name in attrs, attrs.get(name)
+        found, value = self._manager._decode_attr(self._raw, name)
+        if found:
+            setattr(self, name, value)
+        return found, value
+
+    def _decode_all(self):
+        """
+        Decode all attributes from the JSON kept by a lazy resource
+
+        @return: Attributes decoded
+        @rtype: dict
+        """
+        attrs = self._manager._json2attr(self._raw)
+        self._raw = None
+        self._set_attrs({key: value for key, value in attrs.items()
+                         if key not in self.__dict__})
+        return attrs
+
     def _set_attrs(self, kwargs):
         _kwargs = copy.copy(kwargs)
         for attr in self._attrs:
@@ -171,6 +253,14 @@ class Resource(object):
         """
         return self._id
 
+    def is_deleted(self):
+        """
+        Check whether Manager.reload_many() found the resource deleted
+
+        @rtype: bool
+        """
+        return self._deleted
+
     def get_attrs(self):
         """
         Aquire attributes as a dictionary
@@ -179,29 +269,43 @@ class Resource(object):
         @rtype: dict
         """
         ret = {}
+        if self._raw is not None:
+            self._decode_all()
         if not self._loaded:
             self.reload()
             self._loaded = True
         for key in dir(self):
             if key.startswith('_'):
                 continue
+            if key in self._sub_manager_list:
+                continue
             value = getattr(self, key)
             if inspect.ismethod(value) or inspect.isfunction(value):
                 continue
             ret[key] = value
         return ret
 
+    def _set_validators(self, resource):
+        self._etag = resource._etag
+        self._last_modified = resource._last_modified
+
     def reload(self):
         """
         (Re)load attributes of a resource
 
+        Loaded resources of managers supporting conditional requests are
+        revalidated with their ETag/Last-Modified; attributes are kept as
+        they are if the resource isn't modified.
+
         @return: Whether attributes are updated
         @rtype: bool
         """
-        x = self._manager.get(getattr(self, self._id_attr))
+        x = self._manager._revalidate(self)
         if x:
             self._clear_attrs()
             self._set_attrs(x.__dict__)
+            self._set_validators(x)
+            self._raw = None
             self._loaded = True
             return True
         return False
@@ -217,6 +321,7 @@ class Resource(object):
         method = getattr(self._http, self._update_method)
         method(utils.join_path(self._url_resource_path, self._id),
                data={self._json_resource_key: json_params})
+        self._manager._invalidate_cache()
         self.reload()
 
     def delete(self):
@@ -226,6 +331,7 @@ class Resource(object):
         @rtype: None
         """
         self._http.delete(utils.join_path(self._url_resource_path, self._id))
+        self._manager._invalidate_cache()
 
     def wait_for_finished(self, count=100, interval=15):
         """
@@ -249,19 +355,29 @@ class Resource(object):
                 return
 
 
-class Manager(object):
+class Manager(_AsyncManagerMixin):
     """Base class for resource managers."""
 
     resource_class = None
     service_type = ''
     _attr_mapping = []
+    _changes_since_param = None
+    _deleted_status = None
     _has_detail = True
     _has_extra_attr = False
+    _has_field_filters = False
     _hidden_methods = None
     _json_resource_key = ''
     _json_resources_key = ''
     _id_attr = 'id'
+    _page_size = None
+    _query_filters = {}
+    _revalidate_method = None
+    _sort_by_updated_params = None
+    _sync_mark = None
+    _synced = None
     _update_method = 'put'
+    _updated_json_attr = 'updated_at'
     _url_resource_path = ''
     _url_resource_list_path = ''
 
@@ -281,43 +397,97 @@ class Manager(object):
         self._client = client
         self._session = client._session
         self._http = self._session.get_proxy(self.service_type)
-        self._to_json_mapping = {}
-        self._to_attr_mapping = {}
         self._verbose = verbose
         if not self._url_resource_list_path:
             self._url_resource_list_path = self._url_resource_path
+        if '_json2attr_table' not in type(self).__dict__:
+            type(self)._compile_mappings()
         if self.resource_class is None:
             return
-        mapper.make_mappings(self._attr_mapping,
-                             self._to_json_mapping,
-                             self._to_attr_mapping)
         if self._hidden_methods is not None:
             for method in self._hidden_methods:
                 setattr(self, method, self._no_such_api)
 
+    @classmethod
+    def _compile_mappings(cls):
+        """
+        Compile _attr_mapping once per manager class
+
+        Mappings and converter tables are shared by all instances of the
+        class, including sub managers created per resource.
+
+        @rtype: None
+        """
+        to_json = {}
+        to_attr = {}
+        mapper.make_mappings(cls._attr_mapping, to_json, to_attr)
+        cls._to_json_mapping = to_json
+        cls._to_attr_mapping = to_attr
+        cls._attrs = [attr for attr, json_attr, _mapper
+                      in cls._attr_mapping]
+        cls._json2attr_table, cls._attr2json_table = \
+            mapper.make_converters(to_json, to_attr)
+
     def _no_such_api(self, *args):
         raise exception.NoSuchAPI()
 
     def _json2attr(self, json_params):
         result = {}
+        table = self._json2attr_table
+        has_extra_attr = self._has_extra_attr
         for key, value in json_params.items():
-            _map = self._to_attr_mapping.get(key)
-            if _map is not None:
-                result[_map['attr']] = _map['mapper'].to_attr(self, value)
-            elif self._has_extra_attr and \
+            converter = table.get(key)
+            if converter is not None:
+                attr, to_attr = converter
+                result[attr] = value if to_attr is None \
+                    else to_attr(self, value)
+            elif has_extra_attr and \
                     not key.startswith('_') and key not in BAD_ATTRS:
                 result[key] = value
         return result
 
+    def _has_plain_json2attr(self):
+        return six.get_unbound_function(type(self)._json2attr) is \
+            six.get_unbound_function(Manager._json2attr)
+
+    def _decode_attr(self, json_params, name):
+        """
+        Decode an attribute from JSON like _json2attr() does
+
+        @param json_params: JSON of a resource
+        @type json_params: dict
+        @param name: Attribute name
+        @type name: str
+        @return: (whether found, value)
+        @rtype: (bool, object)
+        """
+        found = False
+        ret = None
+        table = self._json2attr_table
+        for key, value in json_params.items():
+            converter = table.get(key)
+            if converter is not None:
+                attr, to_attr = converter
+                if attr == name:
+                    found = True
+                    ret = value if to_attr is None else to_attr(self, value)
+            elif key == name and self._has_extra_attr and \
+                    not key.startswith('_') and key not in BAD_ATTRS:
+                found = True
+                ret = value
+        return found, ret
+
     def _attr2json(self, attrs):
         result = {}
+        table = self._attr2json_table
         for key, value in attrs.items():
             if value is constant.UNDEF:
                 continue
-            _map = self._to_json_mapping.get(key)
-            if _map is not None:
-                result[_map['json_attr']] = \
-                    _map['mapper'].to_json(self, value)
+            converter = table.get(key)
+            if converter is not None:
+                json_attr, to_json = converter
+                result[json_attr] = value if to_json is None \
+                    else to_json(self, value)
             elif self._has_extra_attr \
                     and not key.startswith('_') and key not in BAD_ATTRS:
                 result[key] = value
@@ -347,6 +517,7 @@ class Manager(object):
         json_params = self._attr2json(kwargs)
         ret = self._http.post(self._url_resource_path,
                               data={self._json_resource_key: json_params})
+        self._invalidate_cache()
         attrs = self._json2attr(ret[self._json_resource_key])
         return self.get_empty(attrs[self._id_attr])
 
@@ -369,40 +540,344 @@ class Manager(object):
         except:
             return None
 
-    def _find_gen(self, **kwargs):
-        if self._has_detail:
-            ret = self._http.get(self._url_resource_list_path)
-            for x in ret[self._json_resources_key]:
-                attrs = self._json2attr(x)
-                for k, v in kwargs.items():
-                    if attrs.get(k) != v:
-                        break
+    def _from_response(self, id, headers, body):
+        """
+        Create a resource object from a response of a revalidation
+
+        @param id: ID
+        @type id: str
+        @param headers: Response headers
+        @type headers: dict
+        @param body: JSON body (None for HEAD)
+        @type body: dict
+        @return: Resource object
+        @rtype: yakumo.base.Resource
+        """
+        attrs = self._json2attr(body[self._json_resource_key])
+        return self.resource_class(self, **attrs)
+
+    def _revalidate(self, resource):
+        """
+        Get the latest state of a resource
+
+        Managers with _revalidate_method ('GET' or 'HEAD') send the
+        validators of loaded resources and get nothing if not modified.
+
+        @param resource: Resource object
+        @type resource: yakumo.base.Resource
+        @return: Resource object (None if not modified)
+        @rtype: yakumo.base.Resource
+        """
+        if self._revalidate_method is None:
+            return self.get(resource._id)
+        modified, headers, body = self._http.revalidate(
+            self._revalidate_method, self._url_resource_path, resource._id,
+            etag=resource._etag, last_modified=resource._last_modified)
+        if not modified:
+            return None
+        ret = self._from_response(resource._id, headers, body)
+        ret._etag = headers.get('ETag')
+        ret._last_modified = headers.get('Last-Modified')
+        return ret
+
+    def _get_next_params(self, ret):
+        """
+        Query parameters for the next page of a resource list
+
+        Nova, Cinder and Neutron return '<resources>_links', Glance v2
+        returns 'next' and Keystone v3 returns 'links'.
+
+        @param ret: Top level members of the list response
+        @type ret: dict
+        @return: Query parameters (None if it's the last page)
+        @rtype: dict
+        """
+        href = None
+        for link in ret.get(self._json_resources_key + '_links') or []:
+            if link.get('rel') == 'next':
+                href = link.get('href')
+        if href is None and isinstance(ret.get('next'), six.string_types):
+            href = ret['next']
+        if href is None and isinstance(ret.get('links'), dict):
+            href = ret['links'].get('next')
+        if not href:
+            return None
+        return utils.get_query_params(href)
+
+    def _list_json(self, params=None):
+        """
+        Iterate JSON items in the resource list
+
+        All pages are walked lazily following the next links returned.
+        Each page is parsed while it is being received if the session
+        has the stream_lists option enabled.
+
+        @keyword params: Query parameters
+        @type params: dict
+        @return: JSON items
+        @rtype: iterable
+        """
+        query = dict(params or {})
+        params = dict(query)
+        page_size = self._page_size or self._session.page_size
+        if page_size:
+            params['limit'] = str(page_size)
+        while True:
+            if self._session.stream_lists:
+                ret = self._http.get_stream(self._url_resource_list_path,
+                                            key=self._json_resources_key,
+                                            params=params)
+                for x in ret:
+                    yield x
+                ret = ret.extras
+            else:
+                ret = self._http.get(self._url_resource_list_path,
+                                     params=params)
+                for x in ret[self._json_resources_key]:
+                    yield x
+            next_params = self._get_next_params(ret)
+            if not next_params:
+                return
+            # some services drop the filters from the next links
+            next_params = dict(query, **next_params)
+            if next_params == params:
+                return
+            params = next_params
+
+    def _get_query_params(self, kwargs):
+        """
+        Split query conditions into query parameters and the others
+
+        Conditions listed in _query_filters ({attribute: query parameter})
+        or any scalar attribute with _has_field_filters (Neutron) are sent
+        to the API. They are still checked on the client side as the API
+        may match loosely (e.g. Nova treats name as a regular expression),
+        except for query-only filters which aren't attributes (e.g. tag of
+        Glance v2 images).
+
+        @return: (query parameters, conditions to check on the client side)
+        @rtype: (dict, dict)
+        """
+        params = {}
+        conditions = {}
+        for key, value in kwargs.items():
+            query_key = self._query_filters.get(key)
+            _map = self._to_json_mapping.get(key)
+            if _map is None:
+                if query_key is not None:
+                    params[query_key] = value
                 else:
-                    yield self.resource_class(self, **attrs)
-        else:
+                    conditions[key] = value
+                continue
+            conditions[key] = value
+            if query_key is None and not self._has_field_filters:
+                continue
             try:
-                ret = self._http.get(self._url_resource_list_path)
-            except:
+                json_value = _map['mapper'].to_json(self, value)
+            except Exception:
+                continue
+            if isinstance(json_value, Resource):
+                json_value = json_value._id
+            elif isinstance(json_value, bool):
+                json_value = str(json_value).lower()
+            if json_value is None or isinstance(json_value, (dict, list)):
+                continue
+            params[query_key or _map['json_attr']] = json_value
+        return params, conditions
+
+    def _get_field_params(self, fields, conditions):
+        """
+        Query parameters to select fields of listed resources (Neutron)
+
+        The ID and the attributes in conditions are always selected.
+
+        @param fields: Attribute names
+        @type fields: [str]
+        @param conditions: Conditions to check on the client side
+        @type conditions: dict
+        @return: Query parameters (empty if not supported)
+        @rtype: dict
+        """
+        if not fields or not self._has_field_filters:
+            return {}
+        json_fields = []
+        for attr in [self._id_attr] + list(fields) + list(conditions):
+            _map = self._to_json_mapping.get(attr)
+            json_attr = _map['json_attr'] if _map is not None else attr
+            if json_attr not in json_fields:
+                json_fields.append(json_attr)
+        return {'fields': json_fields}
+
+    def _make_resource(self, attrs, partial=False):
+        """
+        Create a resource object from listed attributes
+
+        @param attrs: Attributes
+        @type attrs: dict
+        @keyword partial: Whether some attributes weren't selected; other
+        attributes are loaded on the first access
+        @type partial: bool
+        @return: Resource object
+        @rtype: yakumo.base.Resource
+        """
+        ret = self.resource_class(self, **attrs)
+        if partial:
+            ret._loaded = False
+        return ret
+
+    def _list_ids(self, params=None):
+        items = self._list_json(params)
+        while True:
+            # a failure of listing ends the iteration quietly as before
+            try:
+                x = six.next(items)
+            except Exception:
                 return
-            for x in ret[self._json_resources_key]:
-                ret = self.get(x['id'])
+            yield x['id']
+
+    def _map_parallel(self, func, items):
+        """
+        Call a function for items in parallel
+
+        Up to hydrate_workers (session option) calls run at once and
+        results are yielded in the order of items.
+
+        @param func: Function called with an item, e.g. self.get
+        @type func: callable
+        @param items: Items
+        @type items: iterable
+        @return: Results
+        @rtype: iterable
+        """
+        workers = max(1, self._session.hydrate_workers)
+        executor = futures.ThreadPoolExecutor(max_workers=workers)
+        pending = collections.deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) > workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _invalidate_cache(self):
+        """
+        Drop the cached list of the manager after a change
+
+        @rtype: None
+        """
+        if self._session.reference_cache is not None:
+            self._session.reference_cache.invalidate(
+                (self.service_type, self._url_resource_list_path))
+
+    def lookup(self, **kwargs):
+        """
+        Aquire a resource matched the conditions from the cached list
+
+        For small, slow-changing catalogs like volume types, flavors and
+        availability zones referred by other resources. The list is cached
+        in the session for reference_cache_ttl seconds.
+        kwargs is key=value style query conditions.
+
+        @return: Resource object (None if no matched resource)
+        @rtype: yakumo.base.Resource
+        """
+        reference_cache = self._session.reference_cache
+        if reference_cache is None:
+            return self.find_one(**kwargs)
+        return reference_cache.lookup(
+            (self.service_type, self._url_resource_list_path), self.list,
+            **kwargs)
+
+    def _make_listed(self, item, conditions, partial=False):
+        """
+        Create a resource object from an item of the list
+
+        With the lazy_attrs session option the resource keeps the JSON
+        and decodes attributes on the first access.
+
+        @param item: JSON of a resource
+        @type item: dict
+        @param conditions: Conditions to check on the client side
+        @type conditions: dict
+        @keyword partial: Whether some attributes weren't selected
+        @type partial: bool
+        @return: Resource object (None if not matched)
+        @rtype: yakumo.base.Resource
+        """
+        if self._session.lazy_attrs:
+            found, id = self._decode_attr(item, self._id_attr)
+            ret = self.resource_class(self, **{self._id_attr: id})
+            ret._raw = item
+            ret._loaded = not partial
+            for k, v in conditions.items():
+                if getattr(ret, k, None) != v:
+                    return None
+            return ret
+        attrs = self._json2attr(item)
+        for k, v in conditions.items():
+            if attrs.get(k) != v:
+                return None
+        return self._make_resource(attrs, partial=partial)
+
+    def _get_conditions(self, kwargs):
+        """
+        Add conditions implied by the manager to the query conditions
+
+        Sub managers listing resources from a collection of the whole
+        service (e.g. Neutron security group rules) add their parent here.
+        Both find() and afind() use it.
+
+        @param kwargs: Query conditions
+        @type kwargs: dict
+        @return: Query conditions
+        @rtype: dict
+        """
+        return kwargs
+
+    def _find_gen(self, fields=None, **kwargs):
+        kwargs = self._get_conditions(kwargs)
+        params, kwargs = self._get_query_params(kwargs)
+        if self._has_detail:
+            field_params = self._get_field_params(fields, kwargs)
+            params.update(field_params)
+            for x in self._list_json(params):
+                ret = self._make_listed(x, kwargs,
+                                        partial=bool(field_params))
+                if ret is not None:
+                    yield ret
+        else:
+            for id in self._list_ids(params):
+                ret = self.get(id)
+                if ret is None:
+                    continue
                 for k, v in kwargs.items():
                     if getattr(ret, k, None) != v:
                         break
                 else:
                     yield ret
 
-    def find(self, **kwargs):
+    def find(self, fields=None, **kwargs):
         """
         Query existing resource object matched the conditions
 
         kwargs is key=value style query conditions.
+        Conditions supported by the API are sent as query parameters.
         Returns empty list if no matched resource.
 
+        @keyword fields: Attributes to receive if the API supports field
+        selection (Neutron); the others are loaded on the first access
+        @type fields: [str]
         @return: List of Resource object
-        @rtype: yakumo.base.Resource
+        @rtype: yakumo.collection.ResourceSet
         """
-        return list(self._find_gen(**kwargs))
+        if fields is not None:
+            kwargs['fields'] = fields
+        return collection.ResourceSet(self._find_gen(**kwargs))
 
     def find_one(self, **kwargs):
         """
@@ -419,14 +894,257 @@ class Manager(object):
         except StopIteration:
             return None
 
-    def list(self):
+    def _can_reload_by_list(self):
+        return self._has_detail and self._has_field_filters
+
+    def _get_reload_params(self, resources):
+        """
+        Query parameters to list resources by ID, RELOAD_CHUNK_SIZE
+        resources at a time
+
+        @return: Query parameters
+        @rtype: iterable
+        """
+        _map = self._to_json_mapping.get(self._id_attr)
+        key = _map['json_attr'] if _map is not None else self._id_attr
+        for i in range(0, len(resources), RELOAD_CHUNK_SIZE):
+            yield {key: [x._id for x in
+                         resources[i:i + RELOAD_CHUNK_SIZE]]}
+
+    def _set_reloaded(self, resources, found):
+        """
+        Update resources in place with the attributes listed
+
+        @param resources: Resource objects
+        @type resources: [yakumo.base.Resource]
+        @param found: {ID: attributes}
+        @type found: dict
+        @return: Resource objects not found
+        @rtype: [yakumo.base.Resource]
+        """
+        deleted = []
+        for resource in resources:
+            attrs = found.get(resource._id)
+            if attrs is None:
+                resource._deleted = True
+                deleted.append(resource)
+                continue
+            resource._clear_attrs()
+            resource._set_attrs(attrs)
+            resource._raw = None
+            resource._loaded = True
+            resource._deleted = False
+        return deleted
+
+    def reload_many(self, resources):
+        """
+        Reload resources at once
+
+        Managers which can filter lists by ID (Neutron) list the resources
+        with a request per RELOAD_CHUNK_SIZE resources; the others reload
+        them in parallel. Resources not found are marked as deleted.
+
+        @param resources: Resource objects of the manager
+        @type resources: [yakumo.base.Resource]
+        @return: Resource objects not found
+        @rtype: [yakumo.base.Resource]
+        """
+        resources = list(resources)
+        if not self._can_reload_by_list():
+            def reload(resource):
+                try:
+                    resource.reload()
+                    resource._deleted = False
+                except exception.NotFound:
+                    resource._deleted = True
+                return resource
+            return [x for x in self._map_parallel(reload, resources)
+                    if x._deleted]
+        found = {}
+        for params in self._get_reload_params(resources):
+            for x in self._list_json(params):
+                attrs = self._json2attr(x)
+                found[attrs.get(self._id_attr)] = attrs
+        return self._set_reloaded(resources, found)
+
+    def _can_sync_changes(self):
+        return self._has_detail and self._sync_mark is not None and \
+            (self._changes_since_param is not None or
+             self._sort_by_updated_params is not None)
+
+    def _get_updated(self, item):
+        """
+        Update time of an item of the list
+
+        @return: (parsed, as is) (None if unknown)
+        @rtype: (datetime.datetime, str)
+        """
+        value = item.get(self._updated_json_attr)
+        updated = mapper.DateTime.to_attr(self, value)
+        if updated is None:
+            return None
+        return updated, value
+
+    def _sync_full(self):
+        """
+        List all resources for Manager.sync()
+
+        @return: (all resources, resources listed, resources deleted)
+        @rtype: (ResourceSet, ResourceSet, ResourceSet)
+        """
+        old = self._synced
+        mark = None
+        if self._has_detail:
+            resources = []
+            for x in self._list_json():
+                updated = self._get_updated(x)
+                if updated is not None and \
+                        (mark is None or updated[0] > mark[0]):
+                    mark = updated
+                resources.append(self._make_listed(x, {}))
+            resources = collection.ResourceSet(resources)
+        else:
+            resources = self.find()
+        deleted = collection.ResourceSet()
+        if old is not None:
+            deleted = old - resources
+            for resource in deleted:
+                resource._deleted = True
+        self._synced = resources
+        self._sync_mark = mark
+        return resources, collection.ResourceSet(resources), deleted
+
+    def _list_changes(self, since):
+        """
+        List JSON of resources changed since the high-water mark
+
+        Lists sorted by update time are read until SYNC_SORT_CHECK_SIZE
+        items older than the mark, which must be in descending order too;
+        some APIs ignore unknown sort keys.
+
+        @param since: High-water mark
+        @type since: (datetime.datetime, str)
+        @return: (JSON of resources, new high-water mark) (None if the API
+        didn't sort the list)
+        @rtype: ([dict], (datetime.datetime, str))
+        """
+        if self._changes_since_param is not None:
+            params = {self._changes_since_param: since[1]}
+        else:
+            params = dict(self._sort_by_updated_params)
+        is_sorted = self._changes_since_param is None
+        mark = since
+        last = None
+        older = 0
+        listed = []
+        for x in self._list_json(params):
+            updated = self._get_updated(x)
+            if updated is None:
+                if not older:
+                    listed.append(x)
+                continue
+            if is_sorted:
+                if last is not None and updated[0] > last:
+                    return None
+                last = updated[0]
+            if updated[0] < since[0]:
+                if not is_sorted:
+                    continue
+                older += 1
+                if older >= SYNC_SORT_CHECK_SIZE:
+                    break
+                continue
+            if updated[0] > mark[0]:
+                mark = updated
+            listed.append(x)
+        return listed, mark
+
+    def _sync_changes(self):
+        """
+        List resources changed since the last sync for Manager.sync()
+
+        @return: (all resources, resources changed, resources deleted)
+        @rtype: (ResourceSet, ResourceSet, ResourceSet)
+        """
+        try:
+            ret = self._list_changes(self._sync_mark)
+        except exception.BadRequest:
+            # the API can't sort by update time
+            ret = None
+        if ret is None:
+            return self._sync_full()
+        listed = [self._make_listed(x, {}) for x in ret[0]]
+        mark = ret[1]
+
+        synced = self._synced
+        changed = []
+        added = []
+        deleted = []
+        for resource in listed:
+            existing = synced.get(resource._id)
+            if self._deleted_status is not None and \
+                    getattr(resource, resource._state_attr, None) == \
+                    self._deleted_status:
+                if existing is not None:
+                    existing._deleted = True
+                    deleted.append(existing)
+                continue
+            if existing is None:
+                added.append(resource)
+                changed.append(resource)
+                continue
+            if resource._raw is not None:
+                resource._decode_all()
+            existing._clear_attrs()
+            existing._set_attrs(resource.__dict__)
+            existing._raw = None
+            existing._loaded = True
+            changed.append(existing)
+        if deleted:
+            deleted_set = set(deleted)
+            synced[:] = [x for x in synced if x not in deleted_set]
+        synced.extend(added)
+        # attributes of resources may be changed in place
+        synced._clear_indexes()
+        self._sync_mark = mark
+        return (synced, collection.ResourceSet(changed),
+                collection.ResourceSet(deleted))
+
+    def sync(self, full=False):
+        """
+        Update the local collection of the manager incrementally
+
+        The first call lists all resources. Following calls list only
+        resources changed since the latest update time seen (the high-water
+        mark) and merge them into the collection, for managers which can
+        filter (Nova servers: changes-since) or sort lists by update time;
+        resources updated at the high-water mark itself are listed again.
+        Deleted resources are found in the changes if the API lists them
+        (Nova servers); otherwise, with a full sync. The others list all
+        resources every time.
+
+        @keyword full: Whether to list all resources to find deleted ones
+        @type full: bool
+        @return: (all resources, resources changed, resources deleted);
+        resources changed are all resources on full syncs
+        @rtype: (yakumo.collection.ResourceSet,
+        yakumo.collection.ResourceSet, yakumo.collection.ResourceSet)
+        """
+        if full or self._synced is None or not self._can_sync_changes():
+            return self._sync_full()
+        return self._sync_changes()
+
+    def list(self, fields=None):
         """
         Aquire an existing resource object
 
+        @keyword fields: Attributes to receive if the API supports field
+        selection (Neutron); the others are loaded on the first access
+        @type fields: [str]
         @return: List of Resource objects
-        @rtype: [yakumo.base.Resource]
+        @rtype: yakumo.collection.ResourceSet
         """
-        return self.find()
+        return self.find(fields=fields)
 
 
 class SubManager(Manager):
@@ -443,7 +1161,7 @@ class SubManager(Manager):
             self.parent_resource._manager._client, *args, **kwargs)
 
 
-class GlanceV2Resource(Resource):
+class GlanceV2Resource(Resource, _AsyncGlanceV2ResourceMixin):
     """Base class for resource managers which don't use _json_resource_key."""
 
     def update(self, **kwargs):
@@ -456,12 +1174,17 @@ class GlanceV2Resource(Resource):
         json_params = self._attr2json(kwargs)
         self._http.put(utils.join_path(self._url_resource_path, self._id),
                        data=json_params)
+        self._manager._invalidate_cache()
 
 
-class GlanceV2Manager(Manager):
+class GlanceV2Manager(Manager, _AsyncGlanceV2ManagerMixin):
     """Base class for resource managers which don't use _json_resource_key."""
 
     _has_extra_attr = True
+    _revalidate_method = 'GET'
+
+    def _from_response(self, id, headers, body):
+        return self.resource_class(self, **self._json2attr(body))
 
     def create(self, **kwargs):
         """
@@ -474,6 +1197,7 @@ class GlanceV2Manager(Manager):
         """
         json_params = self._attr2json(kwargs)
         ret = self._http.post(self._url_resource_path, data=json_params)
+        self._invalidate_cache()
         attrs = self._json2attr(ret)
         return self.get_empty(attrs[self._id_attr])
 
@@ -502,7 +1226,7 @@ class GlanceV2SubManager(SubManager, GlanceV2Manager):
     pass
 
 
-class SwiftV1Resource(Resource):
+class SwiftV1Resource(Resource, _AsyncSwiftV1ResourceMixin):
     """resource class for resources on Object Storage V1 API"""
 
     def update(self, **kwargs):
@@ -520,6 +1244,7 @@ class SwiftV1Resource(Resource):
         headers = self._attr2json(attrs)
         self._http.post_raw(self._url_resource_path, self._id,
                             headers=headers)
+        self._manager._invalidate_cache()
         self.reload()
 
     def get_metadata(self):
@@ -562,10 +1287,17 @@ class SwiftV1Resource(Resource):
         self.update()
 
 
-class SwiftV1Manager(Manager):
+class SwiftV1Manager(Manager, _AsyncSwiftV1ManagerMixin):
     """manager class for resources on Object Storage V1 API"""
 
     _id_attr = 'name'
+    _list_mapping = {}
+    _revalidate_method = 'HEAD'
+
+    def _from_response(self, name, headers, body):
+        json_params = dict(headers)
+        json_params['name'] = name
+        return self.resource_class(self, **self._json2attr(json_params))
 
     def _attr2json(self, attrs):
         metadata = attrs.pop('metadata', {})
@@ -608,6 +1340,7 @@ class SwiftV1Manager(Manager):
         headers = self._attr2json(kwargs)
         self._http.put_raw(self._url_resource_path, name,
                            headers=headers, data=data)
+        self._invalidate_cache()
         return self.get_empty(name)
 
     def get(self, name):
@@ -630,14 +1363,64 @@ class SwiftV1Manager(Manager):
         except:
             return None
 
-    def _find_gen(self, **kwargs):
-        try:
-            ret = self._http.get(self._url_resource_path)
-        except:
-            return
-        for x in ret:
-            if 'name' in x:
-                yield self.get_empty(x['name'])
+    def _list_json(self, params=None):
+        """
+        Iterate JSON items in the container/object list
+
+        Swift returns at most `limit` (10000 by default) items a request,
+        so the list is walked with the name of the last item as marker.
+
+        @keyword params: Query parameters
+        @type params: dict
+        @return: JSON items
+        @rtype: iterable
+        """
+        params = dict(params or {})
+        limit = self._page_size or self._session.page_size
+        params['limit'] = min(limit or constant.SWIFT_LIST_LIMIT,
+                              constant.SWIFT_LIST_LIMIT)
+        while True:
+            ret = self._http.get(self._url_resource_path, params=params)
+            for x in ret:
+                yield x
+            if len(ret) < params['limit'] or 'name' not in ret[-1]:
+                return
+            params['marker'] = ret[-1]['name']
+
+    def _listed_resource(self, item):
+        """
+        Create a resource object from an item of the listing
+
+        Attributes in the listing are mapped by _list_mapping ({listing
+        key: header}); the others are loaded on the first access.
+
+        @param item: Item of the listing
+        @type item: dict
+        @return: Resource object
+        @rtype: yakumo.base.Resource
+        """
+        headers = {self._list_mapping[key]: value
+                   for key, value in item.items()
+                   if key in self._list_mapping}
+        headers['name'] = item['name']
+        return self._make_resource(self._json2attr(headers),
+                                   partial=True)
+
+    def _find_gen(self, fields=None, **kwargs):
+        items = self._list_json()
+        while True:
+            try:
+                x = six.next(items)
+            except Exception:
+                return
+            if 'name' not in x:
+                continue
+            ret = self._listed_resource(x)
+            for k, v in kwargs.items():
+                if getattr(ret, k, None) != v:
+                    break
+            else:
+                yield ret
 
 
 class SwiftV1SubManager(SubManager, SwiftV1Manager):
@@ -0,0 +1,222 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Concurrent fan-out executor for manager/resource calls
+"""
+
+import collections
+from concurrent import futures
+import threading
+
+from . import base
+
+
+MAX_WORKERS = 8
+
+
+class Result(object):
+    """result of a call submitted to Batch"""
+
+    def __init__(self, item, future):
+        self.item = item
+        self._future = future
+
+    @property
+    def value(self):
+        """
+        Return value of the call (None if it failed)
+        """
+        if self.exception is not None:
+            return None
+        return self._future.result()
+
+    @property
+    def exception(self):
+        """
+        Exception raised by the call (None if it succeeded)
+        """
+        return self._future.exception()
+
+    @property
+    def ok(self):
+        return self.exception is None
+
+    def __repr__(self):
+        if self.ok:
+            return '<%s.%s (item=%r, value=%r)>' % (
+                self.__module__, self.__class__.__name__,
+                self.item, self.value)
+        return '<%s.%s (item=%r, exception=%r)>' % (
+            self.__module__, self.__class__.__name__,
+            self.item, self.exception)
+
+
+class Batch(object):
+    """Run manager/resource calls concurrently on a thread pool
+
+    Calls are capped per service type (e.g. 'compute', 'volume') when
+    per_service_limit is given. The service of a call is taken from the
+    Resource/Manager object the method is bound to or from the first
+    Resource/Manager argument. Calls over the limit wait in a queue of
+    the service, so they don't keep worker threads from other services.
+
+    Usage:
+
+    >>> with c.batch(max_workers=16, per_service_limit={'compute': 4}) as b:
+    ...     b.call('stop', c.server.list())
+    >>> [r for r in b.results() if not r.ok]
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, per_service_limit=None):
+        """
+        Create a Batch object
+
+        @keyword max_workers: Number of worker threads
+        @type max_workers: int
+        @keyword per_service_limit: Maximum concurrent calls per service;
+        an int applied to every service or a dict keyed by service type
+        @type per_service_limit: int or dict
+        @return: Batch object
+        @rtype: yakumo.batch.Batch
+        """
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._per_service_limit = per_service_limit
+        self._queues = {}
+        self._running = {}
+        self._lock = threading.Lock()
+        self._results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, tb):
+        self.shutdown()
+
+    @staticmethod
+    def _get_service(func, args):
+        for obj in (getattr(func, '__self__', None),) + tuple(args):
+            if isinstance(obj, base.Resource):
+                return obj._manager.service_type
+            if isinstance(obj, base.Manager):
+                return obj.service_type
+        return None
+
+    def _get_limit(self, service):
+        limit = self._per_service_limit
+        if isinstance(limit, dict):
+            limit = limit.get(service)
+        if not limit or service is None:
+            return None
+        return limit
+
+    def _enqueue(self, service, limit, call):
+        with self._lock:
+            queue = self._queues.setdefault(service, collections.deque())
+            queue.append(call)
+            if self._running.get(service, 0) >= limit:
+                return
+            self._running[service] = self._running.get(service, 0) + 1
+            call = queue.popleft()
+        self._executor.submit(self._run, service, call)
+
+    def _dequeue(self, service):
+        with self._lock:
+            queue = self._queues[service]
+            if not queue:
+                self._running[service] -= 1
+                return None
+            return queue.popleft()
+
+    def _run(self, service, call):
+        # run queued calls of the service on this thread until none is left
+        while call is not None:
+            future, func, args, kwargs = call
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+            call = self._dequeue(service)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Submit a call
+
+        @param func: Callable (usually a Manager/Resource method)
+        @type func: callable
+        @return: Result object
+        @rtype: yakumo.batch.Result
+        """
+        service = self._get_service(func, args)
+        limit = self._get_limit(service)
+        if limit is None:
+            future = self._executor.submit(func, *args, **kwargs)
+        else:
+            future = futures.Future()
+            self._enqueue(service, limit, (future, func, args, kwargs))
+        item = getattr(func, '__self__', None)
+        if item is None and args:
+            item = args[0]
+        result = Result(item, future)
+        self._results.append(result)
+        return result
+
+    def map(self, func, items, *args, **kwargs):
+        """
+        Submit func(item, *args, **kwargs) for each item
+
+        @param func: Callable
+        @type func: callable
+        @param items: Items to process
+        @type items: iterable
+        @return: List of Result objects
+        @rtype: [yakumo.batch.Result]
+        """
+        return [self.submit(func, item, *args, **kwargs) for item in items]
+
+    def call(self, method, items, *args, **kwargs):
+        """
+        Submit item.method(*args, **kwargs) for each item
+
+        @param method: Method name (e.g. 'delete')
+        @type method: str
+        @param items: Resource objects
+        @type items: [yakumo.base.Resource]
+        @return: List of Result objects
+        @rtype: [yakumo.batch.Result]
+        """
+        return [self.submit(getattr(item, method), *args, **kwargs)
+                for item in items]
+
+    def results(self):
+        """
+        Wait for all submitted calls and return their results
+
+        @return: List of Result objects in submission order
+        @rtype: [yakumo.batch.Result]
+        """
+        futures.wait([r._future for r in self._results])
+        return list(self._results)
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker threads
+
+        @keyword wait: Whether to wait for the submitted calls
+        @type wait: bool
+        @rtype: None
+        """
+        self._executor.shutdown(wait=wait)
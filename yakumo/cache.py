@@ -0,0 +1,302 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Caches for sessions
+"""
+
+import collections
+import re
+import threading
+import time
+
+
+REFERENCE_CACHE_TTL = 300
+RESPONSE_CACHE_TTL = 30
+
+VERSION_PATTERN = re.compile(r'^v\d+(\.\d+)?$')
+
+# services listing resources under their parents (e.g. Swift lists
+# containers at the account and objects at the container); a change also
+# invalidates the listings of the parents
+NESTED_SERVICES = ('object-store',)
+
+# a lookup missing in a catalog older than this reloads the catalog
+REFRESH_ON_MISS_AFTER = 5
+
+
+class ReferenceCache(object):
+    """TTL cache of small, slow-changing catalogs
+
+    Catalogs like volume types, flavors and availability zones are cached
+    as lists of resources keyed by (service type, list path), so
+    references to them can be resolved without a request per resource.
+    """
+
+    def __init__(self, ttl=REFERENCE_CACHE_TTL):
+        """
+        Create a ReferenceCache object
+
+        @keyword ttl: Seconds to keep a catalog
+        @type ttl: float
+        @return: ReferenceCache object
+        @rtype: yakumo.cache.ReferenceCache
+        """
+        self.ttl = ttl
+        self._entries = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _count(self, key, name):
+        stats = self._stats.setdefault(key, {
+            'hits': 0,
+            'misses': 0,
+            'loads': 0,
+            'invalidations': 0,
+        })
+        stats[name] += 1
+
+    def _load(self, key, loader):
+        resources = list(loader())
+        with self._lock:
+            self._entries[key] = (time.time(), resources)
+            self._count(key, 'loads')
+        return resources
+
+    def _get(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] >= self.ttl:
+            return self._load(key, loader), True
+        return entry[1], time.time() - entry[0] < REFRESH_ON_MISS_AFTER
+
+    def lookup(self, key, loader, **kwargs):
+        """
+        Find a resource in a cached catalog
+
+        kwargs is key=value style query conditions.
+
+        @param key: Catalog key
+        @type key: tuple
+        @param loader: Called to get the catalog, e.g. Manager.list
+        @type loader: callable
+        @return: Resource object (None if no matched resource)
+        @rtype: yakumo.base.Resource
+        """
+        resources, fresh = self._get(key, loader)
+        ret = self._find(resources, kwargs)
+        if ret is None and not fresh:
+            # the catalog may have been changed by others
+            ret = self._find(self._load(key, loader), kwargs)
+        with self._lock:
+            self._count(key, 'misses' if ret is None else 'hits')
+        return ret
+
+    @staticmethod
+    def _find(resources, kwargs):
+        for resource in resources:
+            for k, v in kwargs.items():
+                if getattr(resource, k, None) != v:
+                    break
+            else:
+                return resource
+        return None
+
+    def invalidate(self, key=None):
+        """
+        Drop a cached catalog
+
+        @keyword key: Catalog key (None: all catalogs)
+        @type key: tuple
+        @rtype: None
+        """
+        with self._lock:
+            if key is None:
+                keys = list(self._entries)
+            else:
+                keys = [key]
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._count(key, 'invalidations')
+
+    def get_stats(self):
+        """
+        Hit rate statistics
+
+        @return: {(service, path): {'hits', 'misses', 'loads',
+        'invalidations', 'size'}}
+        @rtype: dict
+        """
+        with self._lock:
+            ret = {}
+            for key, value in self._stats.items():
+                stats = dict(value)
+                entry = self._entries.get(key)
+                stats['size'] = len(entry[1]) if entry else 0
+                ret[key] = stats
+            return ret
+
+
+def get_collection(path):
+    """
+    Collection part of a path affected by a change to the path
+
+    The first segment after version segments, e.g. v2.0/ports for
+    v2.0/ports/{id}, servers for servers/{id}/action.
+
+    @param path: Path without the endpoint
+    @type path: str
+    @return: Collection path ('' for the whole service)
+    @rtype: str
+    """
+    segments = [x for x in path.split('?', 1)[0].split('/') if x]
+    ret = []
+    for segment in segments:
+        ret.append(segment)
+        if not VERSION_PATTERN.match(segment):
+            break
+    return '/'.join(ret)
+
+
+def get_parents(path):
+    """
+    Paths of the parents of a path, e.g. '' and 'c1' for c1/obj
+
+    @param path: Path without the endpoint
+    @type path: str
+    @return: Paths
+    @rtype: [str]
+    """
+    segments = [x for x in path.split('?', 1)[0].split('/') if x]
+    return ['/'.join(segments[:i]) for i in range(len(segments))]
+
+
+class ResponseCache(object):
+    """LRU cache of GET response bodies with TTL
+
+    Bodies are stored per (service type, path with query) and decoded on
+    every hit, so callers never share decoded objects. A change to a path
+    invalidates the entries of its collection in the same service, and
+    the listings of its parents in NESTED_SERVICES.
+    """
+
+    def __init__(self, maxsize, ttl=RESPONSE_CACHE_TTL):
+        """
+        Create a ResponseCache object
+
+        @param maxsize: Maximum number of entries
+        @type maxsize: int
+        @keyword ttl: Seconds to keep an entry
+        @type ttl: float
+        @return: ResponseCache object
+        @rtype: yakumo.cache.ResponseCache
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+        }
+
+    def get(self, service, path):
+        """
+        Find a cached body
+
+        @param service: Service type
+        @type service: str
+        @param path: Path with query
+        @type path: str
+        @return: Response body (None if not cached)
+        @rtype: bytes
+        """
+        key = (service, path)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and time.time() >= entry[0]:
+                self._stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            # move it to the most recently used end
+            self._entries[key] = entry
+            self._stats['hits'] += 1
+            return entry[1]
+
+    def put(self, service, path, body):
+        """
+        Store a body
+
+        @param service: Service type
+        @type service: str
+        @param path: Path with query
+        @type path: str
+        @param body: Response body
+        @type body: bytes
+        @rtype: None
+        """
+        key = (service, path)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + self.ttl, body)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, service=None, path=None):
+        """
+        Drop entries affected by a change
+
+        @keyword service: Service type (None: all services)
+        @type service: str
+        @keyword path: Path changed (None: the whole service)
+        @type path: str
+        @rtype: None
+        """
+        prefix = get_collection(path) if path is not None else ''
+        parents = set()
+        if path is not None and service in NESTED_SERVICES:
+            parents = set(get_parents(path))
+        with self._lock:
+            for key in list(self._entries):
+                _service, _path = key
+                if service is not None and _service != service:
+                    continue
+                if prefix and _path != prefix and \
+                        not _path.startswith(prefix + '/') and \
+                        not _path.startswith(prefix + '?') and \
+                        _path.split('?', 1)[0] not in parents:
+                    continue
+                del self._entries[key]
+                self._stats['invalidations'] += 1
+
+    def get_stats(self):
+        """
+        Hit rate statistics
+
+        @return: {'hits', 'misses', 'evictions', 'expirations',
+        'invalidations', 'size', 'maxsize'}
+        @rtype: dict
+        """
+        with self._lock:
+            ret = dict(self._stats)
+            ret['size'] = len(self._entries)
+            ret['maxsize'] = self.maxsize
+            return ret
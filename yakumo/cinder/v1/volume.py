@@ -107,6 +107,10 @@ class Manager(base.Manager):
     _json_resource_key = 'volume'
     _json_resources_key = 'volumes'
     _hidden_methods = ["update"]
+    _query_filters = {
+        'name': 'display_name',
+        'status': 'status',
+    }
     _url_resource_list_path = '/volumes/detail'
     _url_resource_path = '/volumes'
 
@@ -123,7 +127,7 @@ class Manager(base.Manager):
             ret['source_image'] = self._client.image.get_empty(image)
         volume_type = json_params.get('volume_type')
         if volume_type:
-            ret['volume_type'] = self._client.volume_type.find_one(
+            ret['volume_type'] = self._client.volume_type.lookup(
                 name=volume_type)
         return ret
 
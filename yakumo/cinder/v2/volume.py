@@ -235,7 +235,12 @@ class Manager(base.Manager):
     _attr_mapping = ATTRIBUTE_MAPPING
     _json_resource_key = 'volume'
     _json_resources_key = 'volumes'
+    _query_filters = {
+        'name': 'name',
+        'status': 'status',
+    }
     _url_resource_list_path = '/volumes/detail'
+    _sort_by_updated_params = {'sort': 'updated_at:desc'}
     _url_resource_path = '/volumes'
 
     def _attr2json(self, attrs):
@@ -251,7 +256,7 @@ class Manager(base.Manager):
             ret['source_image'] = self._client.image.get_empty(image)
         volume_type = json_params.get('volume_type')
         if volume_type:
-            ret['volume_type'] = self._client.volume_type.find_one(
+            ret['volume_type'] = self._client.volume_type.lookup(
                 name=volume_type)
         return ret
 
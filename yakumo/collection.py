@@ -0,0 +1,244 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Collections of resources
+"""
+
+import collections
+
+
+def _mutator(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._clear_indexes()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class ResourceSet(list):
+    """List of resources with indexes built on demand
+
+    Indexes by attribute value are built on the first lookup and dropped
+    when the list is modified, so lookups, grouping and set operations
+    don't scan the list every time.
+    """
+
+    def __init__(self, *args):
+        super(ResourceSet, self).__init__(*args)
+        self._indexes = {}
+        self._members = None
+
+    def _clear_indexes(self):
+        self._indexes = {}
+        self._members = None
+
+    append = _mutator('append')
+    extend = _mutator('extend')
+    insert = _mutator('insert')
+    pop = _mutator('pop')
+    remove = _mutator('remove')
+    reverse = _mutator('reverse')
+    sort = _mutator('sort')
+    __delitem__ = _mutator('__delitem__')
+    __iadd__ = _mutator('__iadd__')
+    __imul__ = _mutator('__imul__')
+    __setitem__ = _mutator('__setitem__')
+    if hasattr(list, 'clear'):
+        clear = _mutator('clear')
+    if hasattr(list, '__delslice__'):
+        __delslice__ = _mutator('__delslice__')
+        __setslice__ = _mutator('__setslice__')
+
+    def _get_members(self):
+        if self._members is None:
+            self._members = set(self)
+        return self._members
+
+    def __contains__(self, resource):
+        try:
+            return resource in self._get_members()
+        except TypeError:
+            # unhashable
+            return super(ResourceSet, self).__contains__(resource)
+
+    def _get_index(self, attr):
+        """
+        Index of resources by an attribute
+
+        Resources referring to other resources (e.g. port.device) are
+        also indexed by the ID of the resource referred to.
+
+        @param attr: Attribute name
+        @type attr: str
+        @return: ({value: [Resource objects]}, [(unhashable value,
+        Resource object)], {ID of a referred resource: [Resource objects]})
+        @rtype: (dict, list, dict)
+        """
+        from . import base
+
+        index = self._indexes.get(attr)
+        if index is None:
+            hashable = collections.OrderedDict()
+            unhashable = []
+            by_id = {}
+            for resource in self:
+                value = getattr(resource, attr, None)
+                try:
+                    hashable.setdefault(value, []).append(resource)
+                except TypeError:
+                    unhashable.append((value, resource))
+                    continue
+                if isinstance(value, base.Resource):
+                    by_id.setdefault(value._id, []).append(resource)
+            index = self._indexes[attr] = (hashable, unhashable, by_id)
+        return index
+
+    def _lookup(self, attr, value):
+        hashable, unhashable, by_id = self._get_index(attr)
+        try:
+            ret = hashable.get(value)
+        except TypeError:
+            return [resource for _value, resource in unhashable
+                    if _value == value]
+        if ret is None:
+            ret = by_id.get(value, [])
+        return ret
+
+    def get(self, id):
+        """
+        Aquire a resource by ID
+
+        @param id: ID of the resource
+        @type id: str
+        @return: Resource object (None if not found)
+        @rtype: yakumo.base.Resource
+        """
+        for resource in self._lookup('_id', id):
+            return resource
+        return None
+
+    def find(self, **kwargs):
+        """
+        Query resources matched the conditions
+
+        kwargs is key=value style query conditions. The first condition
+        is looked up with an index. Attributes referring to resources
+        match either the resource or its ID, e.g. device=server.id.
+
+        @return: Resources matched
+        @rtype: yakumo.collection.ResourceSet
+        """
+        if not kwargs:
+            return ResourceSet(self)
+        items = list(kwargs.items())
+        attr, value = items[0]
+        return ResourceSet(
+            resource for resource in self._lookup(attr, value)
+            if all(getattr(resource, k, None) == v for k, v in items[1:]))
+
+    def find_one(self, **kwargs):
+        """
+        Aquire a resource matched the conditions
+
+        kwargs is key=value style query conditions.
+
+        @return: Resource object (None if not found)
+        @rtype: yakumo.base.Resource
+        """
+        for resource in self.find(**kwargs):
+            return resource
+        return None
+
+    def group_by(self, attr):
+        """
+        Group resources by an attribute
+
+        @param attr: Attribute name
+        @type attr: str
+        @return: {value: ResourceSet}; unhashable values aren't included
+        @rtype: dict
+        """
+        hashable, unhashable, by_id = self._get_index(attr)
+        return collections.OrderedDict(
+            (key, ResourceSet(value)) for key, value in hashable.items())
+
+    def get_ids(self):
+        """
+        IDs of resources
+
+        @return: IDs
+        @rtype: [str]
+        """
+        return [resource._id for resource in self]
+
+    def union(self, other):
+        """
+        Resources in this or the other collection, without duplicates
+
+        @param other: Resources
+        @type other: iterable
+        @return: Resources
+        @rtype: yakumo.collection.ResourceSet
+        """
+        ret = ResourceSet()
+        seen = set()
+        for resource in list(self) + list(other):
+            if resource not in seen:
+                seen.add(resource)
+                ret.append(resource)
+        return ret
+
+    def intersection(self, other):
+        """
+        Resources in both this and the other collection
+
+        @param other: Resources
+        @type other: iterable
+        @return: Resources in the order of this collection
+        @rtype: yakumo.collection.ResourceSet
+        """
+        other = set(other)
+        return ResourceSet(x for x in self if x in other)
+
+    def difference(self, other):
+        """
+        Resources in this collection but not in the other
+
+        @param other: Resources
+        @type other: iterable
+        @return: Resources in the order of this collection
+        @rtype: yakumo.collection.ResourceSet
+        """
+        other = set(other)
+        return ResourceSet(x for x in self if x not in other)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __getitem__(self, index):
+        ret = super(ResourceSet, self).__getitem__(index)
+        if isinstance(index, slice):
+            return ResourceSet(ret)
+        return ret
+
+    if hasattr(list, '__getslice__'):
+        def __getslice__(self, i, j):
+            return ResourceSet(super(ResourceSet, self).__getslice__(i, j))
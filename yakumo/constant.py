@@ -18,3 +18,6 @@ Constants
 """
 
 UNDEF = '__UNDEF__'
+
+# default (and maximum) number of items in a Swift listing
+SWIFT_LIST_LIMIT = 10000
@@ -40,6 +40,42 @@ class NotFound(Exception):
     """404 NotFound"""
 
 
+class MethodNotAllowed(Exception):
+    """405 Method Not Allowed"""
+
+
+class Conflict(Exception):
+    """409 Conflict"""
+
+
+class RequestEntityTooLarge(Exception):
+    """413 Request Entity Too Large"""
+
+
+class TooManyRequests(Exception):
+    """429 Too Many Requests"""
+
+
+class InternalServerError(Exception):
+    """500 Internal Server Error"""
+
+
+class BadGateway(Exception):
+    """502 Bad Gateway"""
+
+
+class ServiceUnavailable(Exception):
+    """503 Service Unavailable"""
+
+
+class GatewayTimeout(Exception):
+    """504 Gateway Timeout"""
+
+
+class ClientException(Exception):
+    """Unexpected HTTP status"""
+
+
 class NoSuchAPI(Exception):
     pass
 
@@ -49,5 +85,25 @@ mapping = {
     401: Unauthorized,
     402: PaymentRequired,
     403: Forbidden,
-    404: NotFound
+    404: NotFound,
+    405: MethodNotAllowed,
+    409: Conflict,
+    413: RequestEntityTooLarge,
+    429: TooManyRequests,
+    500: InternalServerError,
+    502: BadGateway,
+    503: ServiceUnavailable,
+    504: GatewayTimeout,
 }
+
+
+def from_status(status_code):
+    """
+    Exception class for an HTTP status code
+
+    @param status_code: HTTP status code
+    @type status_code: int
+    @return: Exception class (ClientException if unknown)
+    @rtype: type
+    """
+    return mapping.get(status_code, ClientException)
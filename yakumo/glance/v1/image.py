@@ -113,16 +113,25 @@ class Resource(base.Resource):
                                headers=headers)
         self.reload()
 
-    def download(self, file=None):
+    def download(self, file=None, resume=False, chunk_size=None,
+                 preallocate=False):
         """
         Download an image into a local file
 
         @keyword file: File name to save (required)
         @type file: str
+        @keyword resume: Resume from a partial file via HTTP Range
+        @type resume: bool
+        @keyword chunk_size: Buffer size in bytes
+        @type chunk_size: int
+        @keyword preallocate: Preallocate the file to the image size
+        @type preallocate: bool
         @rtype: None
         """
         try:
-            self._http.get_file(self._url_resource_path, self._id, file=file)
+            self._http.get_file(self._url_resource_path, self._id, file=file,
+                                resume=resume, chunk_size=chunk_size,
+                                preallocate=preallocate)
         except:
             pass
 
@@ -135,9 +144,25 @@ class Manager(base.Manager):
     _attr_mapping = ATTRIBUTE_MAPPING
     _json_resource_key = 'image'
     _json_resources_key = 'images'
+    _query_filters = {
+        'name': 'name',
+        'status': 'status',
+        'container_format': 'container_format',
+        'disk_format': 'disk_format',
+    }
+    _revalidate_method = 'HEAD'
     _url_resource_list_path = '/v1/images/detail'
     _url_resource_path = '/v1/images'
 
+    def _from_response(self, id, headers, body):
+        json_params = {}
+        for json_param in self._to_attr_mapping.keys():
+            h = 'x-image-meta-%s' % json_param
+            if h in headers:
+                json_params[json_param] = headers[h]
+        attrs = self._json2attr(json_params)
+        return self.resource_class(self, **attrs)
+
     def create(self, name=UNDEF, uri=UNDEF, disk_format=UNDEF,
                container_format=UNDEF, size=UNDEF, virtual_size=UNDEF,
                checksum=UNDEF, min_ram=UNDEF, min_disk=UNDEF, owner=UNDEF,
@@ -208,13 +233,7 @@ class Manager(base.Manager):
         """
         try:
             ret = self._http.head(self._url_resource_path, id)
-            json_params = {}
-            for json_param in self._to_attr_mapping.keys():
-                h = 'x-image-meta-%s' % json_param
-                if h in ret:
-                    json_params[json_param] = ret[h]
-            attrs = self._json2attr(json_params)
-            return self.resource_class(self, **attrs)
+            return self._from_response(id, ret, None)
         except:
             raise
             return None
@@ -130,16 +130,24 @@ class Resource(base.GlanceV2Resource):
                            data=utils.gen_chunk(file))
         self.reload()
 
-    def download(self, file=None):
+    def download(self, file=None, resume=False, chunk_size=None,
+                 preallocate=False):
         """
         Download an image into a local file
 
         @keyword file: File name to save (required)
         @type file: str
+        @keyword resume: Resume from a partial file via HTTP Range
+        @type resume: bool
+        @keyword chunk_size: Buffer size in bytes
+        @type chunk_size: int
+        @keyword preallocate: Preallocate the file to the image size
+        @type preallocate: bool
         @rtype: None
         """
         self._http.get_file(self._url_resource_path, self._id, 'file',
-                            file=file)
+                            file=file, resume=resume, chunk_size=chunk_size,
+                            preallocate=preallocate)
 
     def activate(self):
         """
@@ -192,6 +200,19 @@ class Manager(base.GlanceV2Manager):
     _attr_mapping = ATTRIBUTE_MAPPING
     _json_resource_key = 'image'
     _json_resources_key = 'images'
+    _query_filters = {
+        'name': 'name',
+        'status': 'status',
+        'visibility': 'visibility',
+        'owner': 'owner',
+        'container_format': 'container_format',
+        'disk_format': 'disk_format',
+        'tag': 'tag',
+    }
+    _sort_by_updated_params = {
+        'sort_key': 'updated_at',
+        'sort_dir': 'desc',
+    }
     _url_resource_path = '/v2/images'
 
     def create(self, id=UNDEF, name=UNDEF, visibility=UNDEF, tags=UNDEF,
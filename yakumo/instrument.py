@@ -0,0 +1,243 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Per-request instrumentation for sessions
+"""
+
+import bisect
+import collections
+import logging
+import re
+import threading
+
+
+# upper bounds of latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+ID_PATTERN = re.compile(
+    r'^('
+    r'[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?'
+    r'[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}'  # UUID
+    r'|[0-9a-fA-F]{32,}'                # hex digest
+    r'|\d+'                             # integer
+    r')$')
+
+# path segments following these collections are names, e.g. key pairs
+NAME_COLLECTIONS = {
+    'compute': ('os-keypairs',),
+}
+
+# services whose paths consist of names; object storage paths are
+# /{container}/{object} after the account in the endpoint
+CONTAINER_SERVICES = ('object-store',)
+
+# maximum number of keys in a Histogram; the others are aggregated into
+# (service, method, OTHER_PATH)
+MAX_KEYS = 1000
+OTHER_PATH = '{other}'
+
+LOG = logging.getLogger(__name__)
+
+RequestRecord = collections.namedtuple('RequestRecord', [
+    'service',          # service type
+    'method',           # HTTP method
+    'path',             # templated path like /servers/{id}/action
+    'status',           # status code (None on connection errors)
+    'latency',          # seconds until response headers, retries included
+    'request_bytes',    # request body size (None if unknown)
+    'response_bytes',   # response body size (None if unknown)
+    'retries',          # number of retries
+])
+
+
+def template_path(*args, **kwargs):
+    """
+    Make a templated path from path components
+
+    IDs (UUIDs, hex digests and integers) are replaced with {id} and the
+    query string is dropped, e.g. /servers/{id}/action. Names are
+    replaced as well: key pairs with {name}, and containers and objects
+    of object storage with {container} and {object}.
+
+    @keyword service: Service type
+    @type service: str
+    @return: Templated path
+    @rtype: str
+    """
+    service = kwargs.get('service')
+    path = '/'.join([str(x).strip('/') for x in args if x is not None])
+    path = path.split('?', 1)[0]
+    names = [x for x in path.split('/') if x]
+    if service in CONTAINER_SERVICES:
+        return '/' + '/'.join(['{container}', '{object}'][:len(names)])
+    name_collections = NAME_COLLECTIONS.get(service, ())
+    segments = []
+    for segment in names:
+        if segments and segments[-1] in name_collections:
+            segment = '{name}'
+        elif ID_PATTERN.match(segment):
+            segment = '{id}'
+        segments.append(segment)
+    return '/' + '/'.join(segments)
+
+
+class Instrumentation(object):
+    """Dispatch request records to registered callbacks"""
+
+    def __init__(self):
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """
+        Register a callback
+
+        @param callback: Called with a RequestRecord for every request
+        @type callback: callable
+        @rtype: None
+        """
+        with self._lock:
+            self._callbacks = self._callbacks + [callback]
+
+    def remove_callback(self, callback):
+        """
+        Unregister a callback
+
+        @param callback: Callback registered
+        @type callback: callable
+        @rtype: None
+        """
+        with self._lock:
+            self._callbacks = [x for x in self._callbacks
+                               if x is not callback]
+
+    def emit(self, record):
+        """
+        Pass a record to the callbacks
+
+        Exceptions raised by callbacks are logged and don't fail the
+        request.
+
+        @param record: Request record
+        @type record: yakumo.instrument.RequestRecord
+        @rtype: None
+        """
+        for callback in self._callbacks:
+            try:
+                callback(record)
+            except Exception:
+                LOG.exception("request callback %r failed", callback)
+
+
+class Histogram(object):
+    """In-memory aggregator of request records
+
+    Records are aggregated per (service, method, templated path). It is
+    a callback for Instrumentation. Paths beyond max_keys keys are
+    aggregated into OTHER_PATH.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, max_keys=MAX_KEYS):
+        self.buckets = tuple(buckets)
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def __call__(self, record):
+        key = (record.service, record.method, record.path)
+        index = bisect.bisect_left(self.buckets, record.latency)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None and len(self._stats) >= self.max_keys:
+                key = (record.service, record.method, OTHER_PATH)
+                stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {
+                    'count': 0,
+                    'errors': 0,
+                    'retries': 0,
+                    'statuses': {},
+                    'latency_sum': 0.0,
+                    'latency_max': 0.0,
+                    'latency_buckets': [0] * (len(self.buckets) + 1),
+                    'request_bytes': 0,
+                    'response_bytes': 0,
+                }
+            stats['count'] += 1
+            if record.status is None or record.status >= 400:
+                stats['errors'] += 1
+            stats['retries'] += record.retries
+            stats['statuses'][record.status] = \
+                stats['statuses'].get(record.status, 0) + 1
+            stats['latency_sum'] += record.latency
+            stats['latency_max'] = max(stats['latency_max'], record.latency)
+            stats['latency_buckets'][index] += 1
+            stats['request_bytes'] += record.request_bytes or 0
+            stats['response_bytes'] += record.response_bytes or 0
+
+    def percentile(self, stats, q):
+        """
+        Estimate a latency percentile from bucket counts
+
+        @param stats: Stats of a key (an item of get_stats())
+        @type stats: dict
+        @param q: Percentile (0-100)
+        @type q: float
+        @return: Upper bound of the bucket containing the percentile
+        (latency_max for the overflow bucket)
+        @rtype: float
+        """
+        rank = stats['count'] * q / 100.0
+        total = 0
+        for bound, count in zip(self.buckets, stats['latency_buckets']):
+            total += count
+            if count and total >= rank:
+                return bound
+        return stats['latency_max']
+
+    def get_stats(self):
+        """
+        Snapshot of the aggregated stats
+
+        @return: {(service, method, path): {'count', 'errors', 'retries',
+        'statuses', 'latency_sum', 'latency_max', 'latency_avg',
+        'latency_p50', 'latency_p90', 'latency_p99', 'latency_buckets',
+        'request_bytes', 'response_bytes'}}
+        @rtype: dict
+        """
+        with self._lock:
+            ret = {}
+            for key, value in self._stats.items():
+                stats = dict(value)
+                stats['statuses'] = dict(value['statuses'])
+                stats['latency_buckets'] = list(value['latency_buckets'])
+                ret[key] = stats
+        for stats in ret.values():
+            stats['latency_avg'] = stats['latency_sum'] / stats['count']
+            stats['latency_p50'] = self.percentile(stats, 50)
+            stats['latency_p90'] = self.percentile(stats, 90)
+            stats['latency_p99'] = self.percentile(stats, 99)
+        return ret
+
+    def reset(self):
+        """
+        Clear the aggregated stats
+
+        @rtype: None
+        """
+        with self._lock:
+            self._stats = {}
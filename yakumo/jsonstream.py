@@ -0,0 +1,150 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Incremental parser for JSON list responses
+"""
+
+import codecs
+import json
+
+
+WHITESPACE = ' \t\n\r'
+COMPACT_THRESHOLD = 65536
+
+
+class ListStream(object):
+    """Yield the items of a JSON array while the body is being received
+
+    The array is either the whole document or the value of `key` in the
+    top level object, like {"servers": [...], "servers_links": [...]}.
+    Other top level members are decoded as usual and available in
+    `extras` once the iteration has finished.
+
+    Only one item is held in memory at a time (plus the unparsed part of
+    the last chunk received).
+    """
+
+    def __init__(self, chunks, key=None, close=None):
+        """
+        Create a ListStream object
+
+        @param chunks: Iterable of bytes (e.g. Response.iter_content())
+        @type chunks: iterable
+        @keyword key: Top level key of the array (None: the document is
+        an array)
+        @type key: str
+        @keyword close: Called when the iteration has finished
+        @type close: callable
+        @return: ListStream object
+        @rtype: yakumo.jsonstream.ListStream
+        """
+        self.key = key
+        self.extras = {}
+        self._chunks = iter(chunks)
+        self._close = close
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        if self._eof:
+            return False
+        if self._pos > COMPACT_THRESHOLD:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buf += text
+                return True
+        self._buf += self._decoder.decode(b'', final=True)
+        self._eof = True
+        return False
+
+    def _peek(self):
+        while True:
+            while self._pos < len(self._buf) and \
+                    self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON data")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError("Expecting '%s' at %d" % (char, self._pos))
+        self._pos += 1
+
+    def _decode(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+                # a number may be cut at the end of the buffer
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except ValueError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _iter_array(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._decode()
+            if self._peek() == ',':
+                self._pos += 1
+                continue
+            self._expect(']')
+            return
+
+    def _iter_object(self):
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._decode()
+            self._expect(':')
+            if key == self.key and self._peek() == '[':
+                for item in self._iter_array():
+                    yield item
+            else:
+                self.extras[key] = self._decode()
+            if self._peek() == ',':
+                self._pos += 1
+                continue
+            self._expect('}')
+            return
+
+    def __iter__(self):
+        try:
+            if self.key is None:
+                items = self._iter_array()
+            else:
+                items = self._iter_object()
+            for item in items:
+                yield item
+        finally:
+            if self._close is not None:
+                self._close()
@@ -20,7 +20,25 @@ Mapper classes
 import base64
 import json
 from datetime import datetime
+import re
+
 import dateutil.parser
+import dateutil.tz
+import six
+
+
+# ISO 8601 timestamps emitted by OpenStack services, e.g.
+# 2017-01-23T04:56:07Z, 2017-01-23T04:56:07.000000,
+# 2017-01-23T04:56:07+09:00 and 2017-01-23 04:56:07
+ISO8601_PATTERN = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})'
+    r'(?:\.(\d{1,6})\d*)?'
+    r'(?:(Z)|([+-])(\d{2}):?(\d{2}))?$')
+
+# maximum number of timestamp strings memoised by DateTime
+DATETIME_CACHE_SIZE = 10000
+
+UTC = dateutil.tz.tzutc()
 
 
 def make_mappings(source, to_json, to_attr):
@@ -38,6 +56,21 @@ def make_mappings(source, to_json, to_attr):
             }
 
 
+def make_converters(to_json, to_attr):
+    # converter tables for _json2attr/_attr2json; None means no conversion
+    json2attr = {}
+    for json_attr, _map in to_attr.items():
+        _mapper = _map['mapper']
+        json2attr[json_attr] = (
+            _map['attr'], None if _mapper is Noop else _mapper.to_attr)
+    attr2json = {}
+    for attr, _map in to_json.items():
+        _mapper = _map['mapper']
+        attr2json[attr] = (
+            _map['json_attr'], None if _mapper is Noop else _mapper.to_json)
+    return json2attr, attr2json
+
+
 class NoopClass(object):
 
     @staticmethod
@@ -123,15 +156,61 @@ class Base64(object):
         return base64.b64encode(attr.encode('utf-8')).decode('ascii')
 
 
+def parse_iso8601(value):
+    # fast path for ISO8601_PATTERN; None for other formats
+    m = ISO8601_PATTERN.match(value)
+    if m is None:
+        return None
+    (year, month, day, hour, minute, second, fraction,
+     utc, sign, tz_hour, tz_minute) = m.groups()
+    tzinfo = None
+    if utc:
+        tzinfo = UTC
+    elif sign:
+        offset = int(tz_hour) * 3600 + int(tz_minute) * 60
+        if sign == '-':
+            offset = -offset
+        tzinfo = UTC if offset == 0 else dateutil.tz.tzoffset(None, offset)
+    microsecond = int(fraction.ljust(6, '0')) if fraction else 0
+    return datetime(int(year), int(month), int(day), int(hour),
+                    int(minute), int(second), microsecond, tzinfo)
+
+
 class DateTimeClass(object):
 
-    @staticmethod
-    def to_attr(manager_class, attr, do_raise=False):
+    def __init__(self):
+        self._cache = {}
+
+    def _parse(self, attr):
+        try:
+            ret = parse_iso8601(attr)
+        except ValueError:
+            # out of range, e.g. month 13
+            return None
+        if ret is not None:
+            return ret
         try:
             return dateutil.parser.parse(attr)
-        except:
+        except (ValueError, OverflowError):
             return None
 
+    def to_attr(self, manager_class, attr, do_raise=False):
+        if not isinstance(attr, six.string_types):
+            try:
+                return dateutil.parser.parse(attr)
+            except Exception:
+                return None
+        # datetime objects are immutable, so they can be shared
+        try:
+            return self._cache[attr]
+        except KeyError:
+            pass
+        ret = self._parse(attr)
+        if len(self._cache) >= DATETIME_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[attr] = ret
+        return ret
+
     @staticmethod
     def to_json(manager_class, attr):
         try:
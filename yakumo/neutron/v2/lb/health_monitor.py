@@ -59,6 +59,7 @@ class Manager(base.Manager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'health_monitor'
     _json_resources_key = 'health_monitors'
     _url_resource_path = '/v2.0/lb/health_monitors'
@@ -56,6 +56,7 @@ class Manager(base.SubManager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'member'
     _json_resources_key = 'members'
     _url_resource_path = '/v2.0/lb/members'
@@ -83,6 +84,6 @@ class Manager(base.SubManager):
                                            weight=weight,
                                            is_enabled=is_enabled)
 
-    def _find_gen(self, **kwargs):
+    def _get_conditions(self, kwargs):
         kwargs['pool'] = self.parent_resource
-        return super(Manager, self)._find_gen(**kwargs)
+        return kwargs
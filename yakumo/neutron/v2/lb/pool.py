@@ -90,6 +90,7 @@ class Manager(base.Manager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'pool'
     _json_resources_key = 'pools'
     _url_resource_path = '/v2.0/lb/pools'
@@ -65,6 +65,7 @@ class Manager(base.Manager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'loadbalancer'
     _json_resources_key = 'loadbalancers'
     _url_resource_path = '/v2.0/lbaas/loadbalancers'
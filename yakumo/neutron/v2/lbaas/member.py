@@ -57,6 +57,7 @@ class Manager(base.SubManager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'member'
     _json_resources_key = 'members'
     _url_resource_path = '/v2.0/lbaas/pools/%s/members'
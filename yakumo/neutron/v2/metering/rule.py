@@ -43,6 +43,7 @@ class Manager(base.Manager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _hidden_methods = ["update"]
     _json_resource_key = '"metering_label_rule'
     _json_resources_key = '"metering_label_rules'
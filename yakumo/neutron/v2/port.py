@@ -96,8 +96,13 @@ class Manager(base.Manager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'port'
     _json_resources_key = 'ports'
+    _sort_by_updated_params = {
+        'sort_key': 'updated_at',
+        'sort_dir': 'desc',
+    }
     _url_resource_path = '/v2.0/ports'
 
     def _attr2json(self, attrs):
@@ -108,13 +113,22 @@ class Manager(base.Manager):
     def _json2attr(self, json_params):
         ret = super(Manager, self)._json2attr(json_params)
         owner = json_params.get('device_owner')
-        device = ret['device']
+        device = ret.get('device')
+        if device is None:
+            return ret
         if owner in ('compute:nova', 'compute:None'):
             ret['device'] = self._client.server.get_empty(device)
         elif owner == 'network:router_interface':
             ret['device'] = self._client.router.get_empty(device)
         return ret
 
+    def _get_field_params(self, fields, conditions):
+        ret = super(Manager, self)._get_field_params(fields, conditions)
+        # device_owner tells the type of device
+        if 'device_id' in ret.get('fields', []):
+            ret['fields'].append('device_owner')
+        return ret
+
     def create(self, name=UNDEF, network=UNDEF, project=UNDEF, device=UNDEF,
                device_owner=UNDEF, allowed_address_pairs=UNDEF,
                mac_address=UNDEF, fixed_ips=UNDEF, security_groups=UNDEF,
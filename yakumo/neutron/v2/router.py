@@ -123,8 +123,13 @@ class Manager(base.Manager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'router'
     _json_resources_key = 'routers'
+    _sort_by_updated_params = {
+        'sort_key': 'updated_at',
+        'sort_dir': 'desc',
+    }
     _url_resource_path = '/v2.0/routers'
 
     def create(self, name=UNDEF, routes=UNDEF, is_enabled=UNDEF):
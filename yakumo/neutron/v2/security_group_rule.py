@@ -48,6 +48,7 @@ class Manager(base.SubManager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _hidden_methods = ["update"]
     _json_resource_key = 'security_group_rule'
     _json_resources_key = 'security_group_rules'
@@ -86,11 +87,6 @@ class Manager(base.SubManager):
                                            remote_group=remote_group,
                                            remote_ip_prefix=remote_ip_prefix)
 
-    def _find_gen(self, **kwargs):
-        """
-        Find a security group rule
-
-        :param key=value: search condition
-        """
+    def _get_conditions(self, kwargs):
         kwargs['security_group'] = self.parent_resource
-        return super(Manager, self)._find_gen(**kwargs)
+        return kwargs
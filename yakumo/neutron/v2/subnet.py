@@ -74,8 +74,13 @@ class Manager(base.Manager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'subnet'
     _json_resources_key = 'subnets'
+    _sort_by_updated_params = {
+        'sort_key': 'updated_at',
+        'sort_dir': 'desc',
+    }
     _url_resource_path = '/v2.0/subnets'
 
     def create(self, name=UNDEF, network=UNDEF, project=UNDEF,
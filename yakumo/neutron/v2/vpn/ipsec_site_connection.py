@@ -124,6 +124,7 @@ class Manager(base.Manager):
     resource_class = Resource
     service_type = 'network'
     _attr_mapping = ATTRIBUTE_MAPPING
+    _has_field_filters = True
     _json_resource_key = 'ipsec_site_connection'
     _json_resources_key = 'ipsec_site_connections'
     _url_resource_path = '/v2.0/vpn/ipsec-site-connections'
@@ -48,6 +48,6 @@ class Manager(base.Manager):
 
     def get(self, name):
         try:
-            return self.find_one(name=name)
+            return self.lookup(name=name)
         except exception.Forbidden:
             return self.get_empty(name)
@@ -19,6 +19,7 @@ Resource class and its manager for key pairs in Compute API v2
 
 import os
 import stat
+import sys
 
 from yakumo import base
 from yakumo.constant import UNDEF
@@ -36,11 +37,17 @@ ATTRIBUTE_MAPPING = [
 ]
 
 
+if sys.version_info >= (3, 7):
+    from yakumo.aio import NovaKeyPairManagerMixin as _AsyncManagerMixin
+else:
+    _AsyncManagerMixin = object
+
+
 class Resource(base.Resource):
     """Resource class for key pairs in Compute API v2"""
 
 
-class Manager(base.Manager):
+class Manager(base.Manager, _AsyncManagerMixin):
     """Manager class for key pairs in Compute API v2"""
 
     resource_class = Resource
@@ -82,12 +89,27 @@ class Manager(base.Manager):
             os.chmod(private_key_file, stat.S_IRUSR)
         return self.resource_class(self, **attrs)
 
-    def _find_gen(self, **kwargs):
-        ret = self._http.get(self._url_resource_list_path)
-        for x in ret[self._json_resources_key]:
-            ret = self.get(x[self._json_resource_key]['name'])
+    def _find_listed(self, listing, kwargs):
+        """
+        Key pairs in a list response matched the conditions
+
+        @param listing: JSON of the list
+        @type listing: dict
+        @param kwargs: Query conditions
+        @type kwargs: dict
+        @return: Resource objects
+        @rtype: iterable
+        """
+        for x in listing[self._json_resources_key]:
+            # the list has name, fingerprint and public_key of key pairs
+            attrs = self._json2attr(x[self._json_resource_key])
+            ret = self._make_resource(attrs, partial=True)
             for k, v in kwargs.items():
                 if getattr(ret, k, None) != v:
                     break
             else:
                 yield ret
+
+    def _find_gen(self, fields=None, **kwargs):
+        ret = self._http.get(self._url_resource_list_path)
+        return self._find_listed(ret, kwargs)
@@ -17,6 +17,8 @@
 Resource class and its manager for security group rules in Compute API v2
 """
 
+import sys
+
 from yakumo import base
 from yakumo.constant import UNDEF
 from yakumo import mapper
@@ -34,6 +36,13 @@ ATTRIBUTE_MAPPING = [
 ]
 
 
+if sys.version_info >= (3, 7):
+    from yakumo.aio import NovaSecurityGroupRuleManagerMixin \
+        as _AsyncManagerMixin
+else:
+    _AsyncManagerMixin = object
+
+
 class Resource(base.Resource):
     """Resource class for security group rules in Compute API v2"""
 
@@ -47,7 +56,7 @@ class Resource(base.Resource):
         self._reload_rules()
 
 
-class Manager(base.SubManager):
+class Manager(base.SubManager, _AsyncManagerMixin):
     """Manager class for security group rules in Compute API v2"""
 
     resource_class = Resource
@@ -117,7 +126,7 @@ class Manager(base.SubManager):
             if rule.id == id:
                 return rule
 
-    def _find_gen(self, **kwargs):
+    def _find_gen(self, fields=None, **kwargs):
         """
         Find a security group rule
 
@@ -552,14 +552,29 @@ class Manager(base.Manager):
     _hidden_methods = ["update"]
     _json_resource_key = 'server'
     _json_resources_key = 'servers'
+    _changes_since_param = 'changes-since'
+    _deleted_status = 'DELETED'
+    _query_filters = {
+        'name': 'name',
+        'status': 'status',
+        'host': 'host',
+        'flavor': 'flavor',
+        'image': 'image',
+    }
+    _updated_json_attr = 'updated'
     _url_resource_path = '/servers'
     _url_resource_list_path = '/servers/detail'
 
     def _json2attr(self, json_params):
         flavor_id = json_params.pop('flavor', {}).get('id')
+        # image is {'id': ..., 'links': ...}, or '' for servers booted
+        # from volumes
+        image = json_params.pop('image', None)
         ret = super(Manager, self)._json2attr(json_params)
         if flavor_id:
             ret['flavor'] = self._client.flavor.get_empty(flavor_id)
+        if isinstance(image, dict) and image.get('id'):
+            ret['image'] = self._client.image.get_empty(image['id'])
         return ret
 
     def create(self, name=UNDEF, image=UNDEF, flavor=UNDEF,
@@ -0,0 +1,179 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Client-side per-service rate limiter
+"""
+
+import threading
+import time
+
+
+class TokenBucket(object):
+    """Token bucket handing out reservations
+
+    A reservation always succeeds and tells the caller how long to wait,
+    so callers are served in order and never spin.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Create a TokenBucket object
+
+        @param rate: Sustained requests per second
+        @type rate: float
+        @keyword burst: Bucket size (default: max(1, rate))
+        @type burst: float
+        @return: TokenBucket object
+        @rtype: yakumo.ratelimit.TokenBucket
+        """
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, self.rate))
+        self.tokens = self.burst
+        self.updated = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token
+
+        @return: Seconds to wait before sending
+        @rtype: float
+        """
+        with self._lock:
+            now = time.time()
+            self.tokens = min(self.burst,
+                              self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter(object):
+    """Token bucket rate limiter keyed by service type
+
+    Usage:
+
+    >>> limiter = RateLimiter({'compute': 10, 'network': 20})
+    >>> limiter.acquire('compute')
+    """
+
+    def __init__(self, rates=None, bursts=None):
+        """
+        Create a RateLimiter object
+
+        @keyword rates: Requests per second keyed by service type
+        (e.g. 'compute', 'network', 'volume', 'image', 'object-store',
+        'identity'); '*' applies to services not listed
+        @type rates: dict
+        @keyword bursts: Bucket sizes keyed by service type
+        @type bursts: dict
+        @return: RateLimiter object
+        @rtype: yakumo.ratelimit.RateLimiter
+        """
+        self.rates = dict(rates or {})
+        self.bursts = dict(bursts or {})
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a RateLimiter object from cloud config options
+
+        Options: rate_limit (a number for every service or a dict keyed by
+        service type) and rate_limit_burst (same form)
+
+        @param config: cloud config
+        @type config: dict
+        @return: RateLimiter object (None if not configured)
+        @rtype: yakumo.ratelimit.RateLimiter
+        """
+        rates = config.get('rate_limit')
+        if not rates:
+            return None
+        bursts = config.get('rate_limit_burst') or {}
+        if not isinstance(rates, dict):
+            rates = {'*': float(rates)}
+        if not isinstance(bursts, dict):
+            bursts = {'*': float(bursts)}
+        return cls(rates, bursts)
+
+    def _get_bucket(self, service):
+        with self._lock:
+            if service not in self._buckets:
+                rate = self.rates.get(service, self.rates.get('*'))
+                burst = self.bursts.get(service, self.bursts.get('*'))
+                bucket = None
+                if rate:
+                    bucket = TokenBucket(rate, burst)
+                self._buckets[service] = bucket
+            return self._buckets[service]
+
+    def _record(self, service, wait):
+        with self._lock:
+            stats = self._stats.setdefault(service, {
+                'requests': 0,
+                'delayed': 0,
+                'wait_total': 0.0,
+                'wait_max': 0.0,
+            })
+            stats['requests'] += 1
+            if wait > 0:
+                stats['delayed'] += 1
+                stats['wait_total'] += wait
+                stats['wait_max'] = max(stats['wait_max'], wait)
+
+    def reserve(self, service):
+        """
+        Reserve a slot for a request
+
+        @param service: Service type
+        @type service: str
+        @return: Seconds to wait before sending
+        @rtype: float
+        """
+        bucket = self._get_bucket(service)
+        wait = 0.0
+        if bucket is not None:
+            wait = bucket.reserve()
+        self._record(service, wait)
+        return wait
+
+    def acquire(self, service):
+        """
+        Block until a request to the service may be sent
+
+        @param service: Service type
+        @type service: str
+        @rtype: None
+        """
+        wait = self.reserve(service)
+        if wait > 0:
+            time.sleep(wait)
+
+    def get_stats(self):
+        """
+        Queueing statistics
+
+        @return: {service: {'requests', 'delayed', 'wait_total',
+        'wait_max'}}
+        @rtype: dict
+        """
+        with self._lock:
+            return {key: dict(value) for key, value in self._stats.items()}
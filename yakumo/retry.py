@@ -0,0 +1,278 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Retry policy and retry/latency counters for sessions
+"""
+
+from email.utils import mktime_tz
+from email.utils import parsedate_tz
+import random
+import threading
+import time
+
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'])
+
+# The server rejected these requests without processing them, so they
+# are safe to resend whatever the method is.
+RETRY_STATUSES = frozenset([409, 413, 429, 503])
+
+# The server may have processed these requests; resend idempotent ones only.
+IDEMPOTENT_RETRY_STATUSES = frozenset([500, 502, 504])
+
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF = 30.0
+MAX_RETRY_AFTER = 60.0
+BUDGET_RATIO = 0.2
+BUDGET_MINIMUM = 10
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header value
+
+    @param value: delay-seconds or HTTP-date
+    @type value: str
+    @return: Seconds to wait (None if unparsable)
+    @rtype: float
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    date = parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0.0, mktime_tz(date) - time.time())
+
+
+class RetryBudget(object):
+    """Limit retries to a ratio of the requests sent
+
+    Each request deposits `ratio` tokens and each retry withdraws one,
+    so a broken endpoint can't multiply the load on the cloud. The
+    balance is capped at (and starts from) `minimum` tokens.
+    """
+
+    def __init__(self, ratio=BUDGET_RATIO, minimum=BUDGET_MINIMUM):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.balance = float(minimum)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.balance = min(self.balance + self.ratio, self.minimum)
+
+    def withdraw(self):
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """When and how long to wait before resending a request"""
+
+    def __init__(self, total=RETRIES, backoff_factor=BACKOFF_FACTOR,
+                 max_backoff=MAX_BACKOFF, statuses=RETRY_STATUSES,
+                 idempotent_statuses=IDEMPOTENT_RETRY_STATUSES,
+                 idempotent_methods=IDEMPOTENT_METHODS,
+                 respect_retry_after=True, max_retry_after=MAX_RETRY_AFTER,
+                 budget=None):
+        """
+        Create a RetryPolicy object
+
+        @keyword total: Maximum retries per request
+        @type total: int
+        @keyword backoff_factor: Base delay in seconds; the n-th retry waits
+        a random time up to backoff_factor * 2 ** n (full jitter)
+        @type backoff_factor: float
+        @keyword max_backoff: Upper bound of the backoff delay in seconds
+        @type max_backoff: float
+        @keyword statuses: Status codes retried for any method
+        @type statuses: set
+        @keyword idempotent_statuses: Status codes retried for idempotent
+        methods only
+        @type idempotent_statuses: set
+        @keyword idempotent_methods: Methods safe to resend after a
+        connection error or idempotent_statuses
+        @type idempotent_methods: set
+        @keyword respect_retry_after: Whether to wait as Retry-After says
+        @type respect_retry_after: bool
+        @keyword max_retry_after: Upper bound of Retry-After in seconds
+        @type max_retry_after: float
+        @keyword budget: Retry budget (default: RetryBudget())
+        @type budget: yakumo.retry.RetryBudget
+        @return: RetryPolicy object
+        @rtype: yakumo.retry.RetryPolicy
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.idempotent_statuses = frozenset(idempotent_statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        if budget is None:
+            budget = RetryBudget()
+        self.budget = budget
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a RetryPolicy object from cloud config options
+
+        Options: retries, retry_backoff, retry_max_backoff,
+        retry_budget_ratio
+
+        @param config: cloud config
+        @type config: dict
+        @return: RetryPolicy object (None if retries are disabled)
+        @rtype: yakumo.retry.RetryPolicy
+        """
+        total = int(config.get('retries', RETRIES))
+        if total <= 0:
+            return None
+        budget = RetryBudget(
+            ratio=float(config.get('retry_budget_ratio', BUDGET_RATIO)))
+        return cls(total=total,
+                   backoff_factor=float(config.get('retry_backoff',
+                                                   BACKOFF_FACTOR)),
+                   max_backoff=float(config.get('retry_max_backoff',
+                                                MAX_BACKOFF)),
+                   budget=budget)
+
+    def is_retryable(self, method, status=None, error=False):
+        """
+        Check whether a failed attempt may be resent
+
+        @param method: HTTP method
+        @type method: str
+        @keyword status: Status code (None if no response)
+        @type status: int
+        @keyword error: Whether a connection error/timeout happened
+        @type error: bool
+        @rtype: bool
+        """
+        if status in self.statuses:
+            return True
+        if method.upper() not in self.idempotent_methods:
+            return False
+        return error or status in self.idempotent_statuses
+
+    def should_retry(self, method, attempt, status=None, error=False):
+        """
+        Check whether to resend a request, consuming the retry budget
+
+        @param method: HTTP method
+        @type method: str
+        @param attempt: Number of retries already done
+        @type attempt: int
+        @keyword status: Status code (None if no response)
+        @type status: int
+        @keyword error: Whether a connection error/timeout happened
+        @type error: bool
+        @rtype: bool
+        """
+        if attempt >= self.total:
+            return False
+        if not self.is_retryable(method, status=status, error=error):
+            return False
+        return self.budget.withdraw()
+
+    def get_backoff(self, attempt, retry_after=None):
+        """
+        Delay before the next attempt
+
+        @param attempt: Number of retries already done
+        @type attempt: int
+        @keyword retry_after: Retry-After header value
+        @type retry_after: str
+        @return: Seconds to wait
+        @rtype: float
+        """
+        if self.respect_retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.max_retry_after)
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+
+class RetryStats(object):
+    """Retry and latency counters per (service, method)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def record(self, service, method, retries, latency, failed=False):
+        """
+        Record a finished request
+
+        @param service: Service type
+        @type service: str
+        @param method: HTTP method
+        @type method: str
+        @param retries: Number of retries done
+        @type retries: int
+        @param latency: Seconds taken including retries
+        @type latency: float
+        @keyword failed: Whether the request finally failed
+        @type failed: bool
+        @rtype: None
+        """
+        with self._lock:
+            counter = self._counters.setdefault((service, method), {
+                'calls': 0,
+                'retries': 0,
+                'failures': 0,
+                'latency_total': 0.0,
+                'latency_max': 0.0,
+            })
+            counter['calls'] += 1
+            counter['retries'] += retries
+            if failed:
+                counter['failures'] += 1
+            counter['latency_total'] += latency
+            counter['latency_max'] = max(counter['latency_max'], latency)
+
+    def get(self):
+        """
+        Snapshot of the counters
+
+        @return: {(service, method): {'calls', 'retries', 'failures',
+        'latency_total', 'latency_max'}}
+        @rtype: dict
+        """
+        with self._lock:
+            return {key: dict(value)
+                    for key, value in self._counters.items()}
+
+    def reset(self):
+        """
+        Clear the counters
+
+        @rtype: None
+        """
+        with self._lock:
+            self._counters = {}
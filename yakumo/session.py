@@ -15,6 +15,7 @@
 """
 utility function(s) for session
 """
+import calendar
 from contextlib import contextmanager
 import functools
 import json
@@ -23,14 +24,32 @@ import os_client_config
 from os_client_config import cloud_config
 import random
 import requests
+import six
+from six.moves.urllib import parse
+import threading
+import time
 from simplejson.scanner import JSONDecodeError
 
+from . import cache
 from . import exception
+from . import instrument
+from . import jsonstream
 from . import patch
+from . import ratelimit
+from . import retry
 from . import utils
 
 
-CHUNK_SIZE = 4096
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+STREAM_CHUNK_SIZE = 65536
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+COMPRESSED_ENCODING = 'gzip, deflate'
+TOKEN_REFRESH_MARGIN = 120
+HYDRATE_WORKERS = 8
+CACHE_SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+TRUE_STRINGS = ('1', 'true', 'yes', 'on')
+FALSE_STRINGS = ('0', 'false', 'no', 'off', '')
 
 
 # Patch it!
@@ -69,6 +88,9 @@ class SessionProxy(object):
     def head(self, *args, **kwargs):
         return self.session.head(self.service, *args, **kwargs)
 
+    def revalidate(self, *args, **kwargs):
+        return self.session.revalidate(self.service, *args, **kwargs)
+
     def delete(self, *args, **kwargs):
         return self.session.delete(self.service, *args, **kwargs)
 
@@ -81,6 +103,9 @@ class SessionProxy(object):
     def put(self, *args, **kwargs):
         return self.session.put(self.service, *args, **kwargs)
 
+    def get_stream(self, *args, **kwargs):
+        return self.session.get_stream(self.service, *args, **kwargs)
+
     def get_raw(self, *args, **kwargs):
         return self.session.get_raw(self.service, *args, **kwargs)
 
@@ -104,15 +129,105 @@ def reauth(func):
 
     @functools.wraps(func)
     def _wrapper(self, *args, **kwargs):
+        token = self.token
         try:
             return func(self, *args, **kwargs)
-        except exception.NotFound:
-            self.get_token()
+        except exception.Unauthorized:
+            self.renew_token(token)
             return func(self, *args, **kwargs)
 
     return _wrapper
 
 
+def parse_bool(value, default=False):
+    """
+    Boolean option given as is or as a string from a config file or the
+    environment ('true'/'false', 'yes'/'no', 'on'/'off', '1'/'0')
+
+    :return: bool
+    """
+    if value is None:
+        return default
+    if isinstance(value, six.string_types):
+        value = value.strip().lower()
+        if value in TRUE_STRINGS:
+            return True
+        if value in FALSE_STRINGS:
+            return False
+        raise ValueError("invalid boolean value: %r" % value)
+    return bool(value)
+
+
+def get_resume_offset(file, resume):
+    """
+    Size of the partial file to resume a download from
+
+    :return: int
+    """
+    if resume and os.path.exists(file):
+        return os.path.getsize(file)
+    return 0
+
+
+def get_range_total(headers):
+    """
+    Total size from a Content-Range header ('bytes */1234')
+
+    :return: int or None
+    """
+    try:
+        return int(headers.get('Content-Range', '').rsplit('/', 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def open_download(file, offset, size=None):
+    """
+    Open a file to download into, positioned at offset
+
+    The file is preallocated up to size bytes if size is given.
+
+    :return: file object
+    """
+    if offset:
+        f = open(file, 'r+b')
+        f.seek(offset)
+    else:
+        f = open(file, 'wb')
+    if size:
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except (AttributeError, OSError):
+            f.truncate(size)
+    return f
+
+
+def is_replayable(kwargs):
+    """
+    Check whether the request body can be sent again
+
+    :return: bool
+    """
+    if kwargs.get('files'):
+        return False
+    data = kwargs.get('data')
+    return data is None or isinstance(data, (six.string_types, bytes,
+                                             dict, list, tuple))
+
+
+def is_transient(error):
+    """
+    Check whether a request which failed without a response may succeed
+    if sent again (connection errors and timeouts except SSL errors)
+
+    :return: bool
+    """
+    if isinstance(error, requests.exceptions.SSLError):
+        return False
+    return isinstance(error, (requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout))
+
+
 def exception_translator(func):
 
     @functools.wraps(func)
@@ -120,7 +235,7 @@ def exception_translator(func):
         try:
             return func(self, *args, **kwargs)
         except exception.HTTPError as e:
-            raise exception.mapping[e.response.status_code]()
+            raise exception.from_status(e.response.status_code)()
 
     return _wrapper
 
@@ -155,6 +270,9 @@ class Session(object):
     def __init__(self, config):
         self.config = config.config
         self.keystone_session = config.get_session()
+        self.token = None
+        self.token_expires = None
+        self._token_lock = threading.Lock()
         self.get_token()
         self.endpoints = {}
         for service in config.get_services():
@@ -163,6 +281,41 @@ class Session(object):
                 self.endpoints[service] = config.get_session_endpoint(service)
             except:
                 pass
+        self.pool_connections = int(self.config.get('pool_connections',
+                                                    POOL_CONNECTIONS))
+        self.pool_maxsize = int(self.config.get('pool_maxsize',
+                                                POOL_MAXSIZE))
+        self.pool_block = parse_bool(self.config.get('pool_block'))
+        self.compression = parse_bool(self.config.get('compression'), True)
+        self.stream_lists = parse_bool(self.config.get('stream_lists'))
+        self.page_size = int(self.config.get('page_size') or 0) or None
+        self.lazy_attrs = parse_bool(self.config.get('lazy_attrs'))
+        self.hydrate_workers = int(self.config.get('hydrate_workers',
+                                                   HYDRATE_WORKERS))
+        self.download_chunk_size = int(self.config.get('download_chunk_size',
+                                                       DOWNLOAD_CHUNK_SIZE))
+        self.retry_policy = retry.RetryPolicy.from_config(self.config)
+        self.retry_stats = retry.RetryStats()
+        self.rate_limiter = ratelimit.RateLimiter.from_config(self.config)
+        reference_cache_ttl = float(self.config.get(
+            'reference_cache_ttl', cache.REFERENCE_CACHE_TTL))
+        self.reference_cache = None
+        if reference_cache_ttl > 0:
+            self.reference_cache = cache.ReferenceCache(reference_cache_ttl)
+        response_cache_size = int(self.config.get('response_cache_size', 0))
+        self.response_cache = None
+        if response_cache_size > 0:
+            self.response_cache = cache.ResponseCache(
+                response_cache_size,
+                ttl=float(self.config.get('response_cache_ttl',
+                                          cache.RESPONSE_CACHE_TTL)))
+        self.histogram = instrument.Histogram()
+        self.instrumentation = instrument.Instrumentation()
+        self.instrumentation.add_callback(self.histogram)
+        self.async_session = None
+        self.http_sessions = {}
+        for service in self.endpoints:
+            self.http_sessions[service] = self.make_http_session()
 
     def has_endpoint(self, service):
         return service in self.endpoints
@@ -170,16 +323,198 @@ class Session(object):
     def get_proxy(self, service):
         return SessionProxy(self, service)
 
+    def get_async_session(self):
+        """
+        Get the asyncio counterpart of this session (requires aiohttp)
+
+        :return: yakumo.aio.AsyncSession object
+        """
+        if self.async_session is None:
+            from . import aio
+            self.async_session = aio.AsyncSession(self)
+        return self.async_session
+
     def get_token(self):
+        """
+        Acquire a token and its expiry from the keystone session
+        """
+        with self._token_lock:
+            self._get_token()
+
+    def _get_token(self):
         self.token = self.keystone_session.get_token()
+        self.token_expires = None
+        auth_ref = getattr(self.keystone_session.auth, 'auth_ref', None)
+        expires = getattr(auth_ref, 'expires', None)
+        if expires is not None:
+            self.token_expires = calendar.timegm(expires.utctimetuple())
+
+    def token_will_expire(self):
+        """
+        Check whether the token expires within TOKEN_REFRESH_MARGIN
+
+        :return: bool
+        """
+        if self.token_expires is None:
+            return False
+        return time.time() + TOKEN_REFRESH_MARGIN >= self.token_expires
+
+    def ensure_token(self):
+        """
+        Refresh the token before it expires
+        """
+        if not self.token_will_expire():
+            return
+        with self._token_lock:
+            if self.token_will_expire():
+                self._get_token()
+
+    def renew_token(self, stale_token):
+        """
+        Re-authenticate after the token was rejected (401)
+
+        Nothing is done if another thread has already replaced the
+        rejected token.
+        """
+        with self._token_lock:
+            if self.token != stale_token:
+                return
+            self.keystone_session.invalidate()
+            self._get_token()
+
+    def make_http_session(self):
+        """
+        Create a keep-alive HTTP session with its own connection pool
+
+        :return: requests.Session object
+        """
+        http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block)
+        http.mount('http://', adapter)
+        http.mount('https://', adapter)
+        return http
+
+    def close(self):
+        """
+        Close all pooled connections
+        """
+        for http in self.http_sessions.values():
+            http.close()
+
+    def request(self, service, method, *args, **kwargs):
+        """
+        Send a request via the connection pool of the service
+
+        :return: requests.Response object
+        """
+        url = utils.join_path(self.endpoints[service], *args)
+        http = self.http_sessions.get(service)
+        if http is None:
+            http = self.http_sessions[service] = self.make_http_session()
+        policy = self.retry_policy
+        if policy is not None:
+            policy.budget.deposit()
+            if not is_replayable(kwargs):
+                policy = None
+        headers = kwargs.setdefault('headers', {})
+        if method not in CACHE_SAFE_METHODS:
+            self.invalidate_cache(service, *args)
+        start = time.time()
+        retries = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(service)
+            self.ensure_token()
+            headers['X-Auth-Token'] = self.token
+            response = None
+            try:
+                response = http.request(method, url, **kwargs)
+                status = response.status_code
+                if status < 400 or policy is None or \
+                        not policy.should_retry(method, retries,
+                                                status=status):
+                    break
+                delay = policy.get_backoff(
+                    retries, response.headers.get('Retry-After'))
+                response.close()
+            except requests.exceptions.RequestException as e:
+                if policy is None or not is_transient(e) or \
+                        not policy.should_retry(method, retries, error=True):
+                    self.record(service, method, args, None, retries,
+                                time.time() - start)
+                    raise
+                delay = policy.get_backoff(retries)
+            time.sleep(delay)
+            retries += 1
+        response_bytes = response.headers.get('Content-Length')
+        if response_bytes is not None:
+            response_bytes = int(response_bytes)
+        elif not kwargs.get('stream'):
+            response_bytes = len(response.content)
+        request_bytes = response.request.headers.get('Content-Length')
+        if request_bytes is not None:
+            request_bytes = int(request_bytes)
+        self.record(service, method, args, status, retries,
+                    time.time() - start, request_bytes, response_bytes)
+        if method not in CACHE_SAFE_METHODS:
+            # responses cached while the request was in flight
+            self.invalidate_cache(service, *args)
+        response.raise_for_status()
+        return response
+
+    def record(self, service, method, path, status, retries, latency,
+               request_bytes=None, response_bytes=None):
+        """
+        Record a finished request in the retry stats and instrumentation
+
+        path is the list of path components of the request.
+        """
+        self.retry_stats.record(service, method, retries, latency,
+                                failed=status is None or status >= 400)
+        self.instrumentation.emit(instrument.RequestRecord(
+            service=service,
+            method=method,
+            path=instrument.template_path(*path, service=service),
+            status=status,
+            latency=latency,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+            retries=retries))
 
     @staticmethod
     def json_body(kwargs):
         jsondata = json.dumps(kwargs.get('data', {}))
         kwargs['data'] = jsondata
 
+    def get_cache_path(self, args, kwargs):
+        """
+        Key of a GET request in the response cache
+
+        Requests with their own headers (e.g. Range) aren't cached.
+
+        :return: path with query (None if not cacheable)
+        """
+        if self.response_cache is None or kwargs.get('headers') or \
+                kwargs.get('stream'):
+            return None
+        path = utils.join_path(*args)
+        params = kwargs.get('params')
+        if params:
+            path += '?' + parse.urlencode(sorted(params.items()), doseq=True)
+        return path
+
+    def invalidate_cache(self, service, *args):
+        """
+        Drop cached responses affected by a change to a path
+        """
+        if self.response_cache is not None:
+            self.response_cache.invalidate(service, utils.join_path(*args))
+
     def make_headers(self, kwargs, content_type=None,
-                     accept='application/json'):
+                     accept='application/json', compress=True):
         kwargs.setdefault('headers', {})
         headers = kwargs['headers']
         if 'Content-Type' not in headers:
@@ -189,49 +524,104 @@ class Session(object):
                 headers['Content-Type'] = "application/json; charset=UTF-8"
         if 'Accept' not in headers:
             headers['Accept'] = accept
-        headers['Accept-Encoding'] = 'identity'
-        headers['X-Auth-Token'] = self.token
+        if 'Accept-Encoding' not in headers:
+            if compress and self.compression:
+                headers['Accept-Encoding'] = COMPRESSED_ENCODING
+            else:
+                headers['Accept-Encoding'] = 'identity'
 
     @reauth
     @exception_translator
     @safe_json_load
     @config_wrapper
     def get(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
+        path = self.get_cache_path(args, kwargs)
+        if path is not None:
+            body = self.response_cache.get(service, path)
+            if body is not None:
+                return json.loads(body.decode('utf-8'))
         self.make_headers(kwargs)
-        response = requests.get(url, **kwargs)
-        response.raise_for_status()
-        return response.json()
+        response = self.request(service, 'GET', *args, **kwargs)
+        ret = response.json()
+        if path is not None:
+            self.response_cache.put(service, path, response.content)
+        return ret
+
+    @reauth
+    @exception_translator
+    @config_wrapper
+    def get_stream(self, service, *args, **kwargs):
+        """
+        GET a JSON list and parse it while it is being received
+
+        kwargs: 'key' is the top level key of the array (None if the
+        document itself is an array); the others are passed to requests
+
+        :return: yakumo.jsonstream.ListStream object
+        """
+        key = kwargs.pop('key', None)
+        self.make_headers(kwargs)
+        response = self.request(service, 'GET', *args, stream=True, **kwargs)
+        return jsonstream.ListStream(
+            response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+            key=key, close=response.close)
 
     @reauth
     @exception_translator
     @config_wrapper
     def head(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         self.make_headers(kwargs)
-        response = requests.head(url, **kwargs)
-        response.raise_for_status()
+        response = self.request(service, 'HEAD', *args, **kwargs)
         return response.headers
 
+    @staticmethod
+    def make_conditional_headers(kwargs):
+        etag = kwargs.pop('etag', None)
+        last_modified = kwargs.pop('last_modified', None)
+        if etag:
+            kwargs['headers']['If-None-Match'] = etag
+        if last_modified:
+            kwargs['headers']['If-Modified-Since'] = last_modified
+
+    @reauth
+    @exception_translator
+    @config_wrapper
+    def revalidate(self, service, method, *args, **kwargs):
+        """
+        Conditional GET or HEAD
+
+        kwargs: 'etag' and 'last_modified' are validators sent as
+        If-None-Match and If-Modified-Since; the others are passed to
+        requests
+
+        :return: (whether modified, response headers, JSON body (None for
+        HEAD or if not modified))
+        """
+        self.make_headers(kwargs)
+        self.make_conditional_headers(kwargs)
+        response = self.request(service, method, *args, **kwargs)
+        if response.status_code == 304:
+            return False, response.headers, None
+        body = None
+        if method == 'GET' and response.content:
+            body = response.json()
+        return True, response.headers, body
+
     @reauth
     @exception_translator
     @config_wrapper
     def delete(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         self.make_headers(kwargs)
-        response = requests.delete(url, **kwargs)
-        response.raise_for_status()
+        self.request(service, 'DELETE', *args, **kwargs)
 
     @reauth
     @exception_translator
     @safe_json_load
     @config_wrapper
     def patch(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         self.make_headers(kwargs)
         self.json_body(kwargs)
-        response = requests.patch(url, **kwargs)
-        response.raise_for_status()
+        response = self.request(service, 'PATCH', *args, **kwargs)
         return response.json()
 
     @reauth
@@ -239,11 +629,9 @@ class Session(object):
     @safe_json_load
     @config_wrapper
     def post(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         self.make_headers(kwargs)
         self.json_body(kwargs)
-        response = requests.post(url, **kwargs)
-        response.raise_for_status()
+        response = self.request(service, 'POST', *args, **kwargs)
         return response.json()
 
     @reauth
@@ -251,21 +639,17 @@ class Session(object):
     @safe_json_load
     @config_wrapper
     def put(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         self.make_headers(kwargs)
         self.json_body(kwargs)
-        response = requests.put(url, **kwargs)
-        response.raise_for_status()
+        response = self.request(service, 'PUT', *args, **kwargs)
         return response.json()
 
     @reauth
     @exception_translator
     @config_wrapper
     def get_raw(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
-        self.make_headers(kwargs)
-        response = requests.get(url, **kwargs)
-        response.raise_for_status()
+        self.make_headers(kwargs, compress=False)
+        response = self.request(service, 'GET', *args, **kwargs)
         return response.content
 
     @reauth
@@ -273,10 +657,8 @@ class Session(object):
     @safe_json_load
     @config_wrapper
     def post_raw(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         self.make_headers(kwargs, content_type="application/octet-stream")
-        response = requests.post(url, **kwargs)
-        response.raise_for_status()
+        response = self.request(service, 'POST', *args, **kwargs)
         return response.json()
 
     @reauth
@@ -284,10 +666,8 @@ class Session(object):
     @safe_json_load
     @config_wrapper
     def put_raw(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         self.make_headers(kwargs, content_type="application/octet-stream")
-        response = requests.put(url, **kwargs)
-        response.raise_for_status()
+        response = self.request(service, 'PUT', *args, **kwargs)
         return response.json()
 
     @reauth
@@ -295,15 +675,52 @@ class Session(object):
     @safe_json_load
     @config_wrapper
     def get_file(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         file = kwargs.pop('file')
-        self.make_headers(kwargs)
-        response = requests.get(url, stream=True, **kwargs)
-        response.raise_for_status()
-        with open(file, 'wb') as f:
-            for c in response.iter_content(chunk_size=CHUNK_SIZE):
-                f.write(c)
-                f.flush()
+        chunk_size = kwargs.pop('chunk_size', None) or \
+            self.download_chunk_size
+        preallocate = kwargs.pop('preallocate', False)
+        offset = get_resume_offset(file, kwargs.pop('resume', False))
+        self.make_headers(kwargs, compress=False)
+        headers = kwargs['headers']
+        if offset:
+            headers['Range'] = 'bytes=%d-' % offset
+        try:
+            response = self.request(service, 'GET', *args, stream=True,
+                                    **kwargs)
+        except requests.exceptions.HTTPError as e:
+            if not offset or e.response.status_code != 416:
+                raise
+            # Range Not Satisfiable
+            e.response.close()
+            if get_range_total(e.response.headers) == offset:
+                # already downloaded completely
+                return e.response.headers
+            offset = 0
+            headers.pop('Range')
+            response = self.request(service, 'GET', *args, stream=True,
+                                    **kwargs)
+        if response.status_code != 206:
+            offset = 0
+        size = None
+        if preallocate and response.headers.get('Content-Length'):
+            size = offset + int(response.headers['Content-Length'])
+        try:
+            with open_download(file, offset, size) as f:
+                try:
+                    raw = response.raw
+                    raw.decode_content = True
+                    buf = memoryview(bytearray(chunk_size))
+                    while True:
+                        n = raw.readinto(buf)
+                        if not n:
+                            break
+                        f.write(buf[:n])
+                finally:
+                    # drop preallocated space not written so that the
+                    # download can be resumed later
+                    f.truncate()
+        finally:
+            response.close()
         return response.headers
 
     @reauth
@@ -311,12 +728,10 @@ class Session(object):
     @safe_json_load
     @config_wrapper
     def post_file(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         with open(kwargs.pop('file'), 'rb') as f:
             kwargs['files'] = {'file': f}
             self.make_headers(kwargs)
-            response = requests.post(url, **kwargs)
-        response.raise_for_status()
+            response = self.request(service, 'POST', *args, **kwargs)
         return response.json()
 
     @reauth
@@ -324,10 +739,8 @@ class Session(object):
     @safe_json_load
     @config_wrapper
     def put_file(self, service, *args, **kwargs):
-        url = utils.join_path(self.endpoints[service], *args)
         with open(kwargs.pop('file'), 'rb') as f:
             kwargs['files'] = {'file': f}
             self.make_headers(kwargs)
-            response = requests.put(url, **kwargs)
-        response.raise_for_status()
+            response = self.request(service, 'PUT', *args, **kwargs)
         return response.json()
@@ -0,0 +1,233 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+In-memory inventory of resources
+"""
+
+from concurrent import futures
+import time
+
+from . import base
+
+
+# collections fetched for each service type
+SERVICE_COLLECTIONS = {
+    'compute': ['server', 'flavor', 'key_pair'],
+    'image': ['image'],
+    'network': ['network', 'subnet', 'port'],
+    'volume': ['volume', 'volume_type'],
+}
+
+DEFAULT_SERVICES = ['compute', 'image', 'network', 'volume']
+
+# IDs in dicts of Noop-mapped list attributes joined to loaded resources:
+# {collection: {attribute: (key of the ID, collection referred, key set)}}
+ITEM_REFERENCES = {
+    'volume': {'attachments': ('server_id', 'server', 'server')},
+}
+
+
+class Snapshot(object):
+    """Collections of resources fetched at once
+
+    Each collection is listed once, and references between loaded
+    resources (e.g. server.flavor, port.network, subnet.network) are
+    replaced with the loaded resources, so they are followed without
+    requests. References to resources out of the snapshot are left as
+    they are and loaded on the first access as usual.
+
+    IDs in lists of dicts aren't references; those in ITEM_REFERENCES
+    are joined by adding a key, e.g. volume.attachments[i]['server'] is
+    the server of attachments[i]['server_id'].
+
+    Usage:
+
+    >>> snap = c.snapshot(services=['compute', 'network'])
+    >>> for server in snap['server']:
+    ...     ports = snap.find('port', device=server.id)
+    ...     networks = [port.network.name for port in ports]
+    """
+
+    def __init__(self, client, services=None):
+        """
+        Create a Snapshot object
+
+        Don't call this method directly; use Client.snapshot() instead.
+
+        @param client: client object
+        @type client: yakumo.Client
+        @keyword services: Service types (keys of SERVICE_COLLECTIONS) or
+        manager paths (e.g. 'server', 'neutron.port'); DEFAULT_SERVICES
+        if None
+        @type services: [str]
+        @return: Snapshot object
+        @rtype: yakumo.snapshot.Snapshot
+        """
+        self._client = client
+        self.collections = {}
+        self.taken_at = None
+        self._resources = {}
+        self._load(self._get_managers(services or DEFAULT_SERVICES))
+
+    def _get_manager(self, path):
+        resource = self._client
+        for name in path.split('.'):
+            resource = getattr(resource, name, None)
+            if resource is None:
+                return None
+        return resource
+
+    def _get_managers(self, services):
+        """
+        Managers to list
+
+        Collections of service types are skipped if the cloud doesn't
+        provide them.
+
+        @return: {collection name: Manager object}
+        @rtype: dict
+        """
+        ret = {}
+        for service in services:
+            if service in SERVICE_COLLECTIONS:
+                for path in SERVICE_COLLECTIONS[service]:
+                    manager = self._get_manager(path)
+                    if isinstance(manager, base.Manager):
+                        ret[path] = manager
+                continue
+            manager = self._get_manager(service)
+            if not isinstance(manager, base.Manager):
+                raise ValueError('no such manager: %s' % service)
+            ret[service] = manager
+        return ret
+
+    def _load(self, managers):
+        session = self._client._session
+        names = list(managers)
+        self.taken_at = time.time()
+        with futures.ThreadPoolExecutor(
+                max_workers=max(1, min(session.hydrate_workers,
+                                       len(names)))) as executor:
+            results = executor.map(lambda x: managers[x].list(), names)
+            for name, resources in zip(names, results):
+                self.collections[name] = resources
+        for resources in self.collections.values():
+            for resource in resources:
+                self._resources[resource] = resource
+        for name, resources in self.collections.items():
+            for resource in resources:
+                self._join(resource, ITEM_REFERENCES.get(name, {}))
+
+    def _join(self, resource, item_references):
+        """
+        Replace references of a resource with the resources loaded
+
+        @param resource: Resource object
+        @type resource: yakumo.base.Resource
+        @param item_references: {attribute: (key of the ID, collection
+        referred, key set)} for the collection of the resource
+        @type item_references: dict
+        @rtype: None
+        """
+        if resource._raw is not None:
+            resource._decode_all()
+        for key, value in list(resource.__dict__.items()):
+            if key.startswith('_'):
+                continue
+            joined = self._resolve_value(value)
+            if joined is not value:
+                setattr(resource, key, joined)
+            if key in item_references and isinstance(value, list):
+                self._join_items(value, *item_references[key])
+
+    def _join_items(self, items, id_key, name, key):
+        collection = self.collections.get(name)
+        if collection is None:
+            return
+        for item in items:
+            if not isinstance(item, dict) or item.get(id_key) is None:
+                continue
+            joined = collection.get(item[id_key])
+            if joined is not None:
+                item[key] = joined
+
+    def _resolve_value(self, value):
+        if isinstance(value, base.Resource):
+            return self._resources.get(value, value)
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = self._resolve_value(item)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                value[key] = self._resolve_value(item)
+        return value
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+    def __contains__(self, name):
+        return name in self.collections
+
+    def resolve(self, resource):
+        """
+        Resource loaded in the snapshot for a reference
+
+        @param resource: Resource object (may be empty)
+        @type resource: yakumo.base.Resource
+        @return: Resource object loaded (the argument if not in the
+        snapshot)
+        @rtype: yakumo.base.Resource
+        """
+        return self._resources.get(resource, resource)
+
+    def get(self, name, id):
+        """
+        Aquire a resource in a collection by ID
+
+        @param name: Collection name, e.g. 'server'
+        @type name: str
+        @param id: ID of the resource
+        @type id: str
+        @return: Resource object (None if not found)
+        @rtype: yakumo.base.Resource
+        """
+        return self.collections[name].get(id)
+
+    def find(self, name, **kwargs):
+        """
+        Query resources in a collection matched the conditions
+
+        kwargs is key=value style query conditions.
+
+        @param name: Collection name, e.g. 'port'
+        @type name: str
+        @return: Resources matched
+        @rtype: yakumo.collection.ResourceSet
+        """
+        return self.collections[name].find(**kwargs)
+
+    def find_one(self, name, **kwargs):
+        """
+        Aquire a resource in a collection matched the conditions
+
+        kwargs is key=value style query conditions.
+
+        @param name: Collection name, e.g. 'port'
+        @type name: str
+        @return: Resource object (None if not found)
+        @rtype: yakumo.base.Resource
+        """
+        return self.collections[name].find_one(**kwargs)
@@ -159,6 +159,10 @@ class Manager(base.SwiftV1Manager):
     _has_detail = False
     _url_resource_path = None
     _json_resource_key = 'container'
+    _list_mapping = {
+        'count': 'x-container-object-count',
+        'bytes': 'x-container-bytes-used',
+    }
 
     def create(self, name, read_acl=UNDEF, write_acl=UNDEF,
                sync_to=UNDEF, sync_key=UNDEF,
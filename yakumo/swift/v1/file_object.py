@@ -158,15 +158,24 @@ class Resource(base.SwiftV1Resource):
                            headers=headers)
         return container.object.get_empty(name)
 
-    def download(self, file=None):
+    def download(self, file=None, resume=False, chunk_size=None,
+                 preallocate=False):
         """
         Download an object into a file
 
         @keyword file: File name to save
         @type file: str
+        @keyword resume: Resume from a partial file via HTTP Range
+        @type resume: bool
+        @keyword chunk_size: Buffer size in bytes
+        @type chunk_size: int
+        @keyword preallocate: Preallocate the file to the object size
+        @type preallocate: bool
         @rtype: None
         """
-        self._http.get_file(self._url_resource_path, self._id, file=file)
+        self._http.get_file(self._url_resource_path, self._id, file=file,
+                            resume=resume, chunk_size=chunk_size,
+                            preallocate=preallocate)
 
     def set_metadata(self, **metadata):
         """
@@ -206,6 +215,12 @@ class Manager(base.SwiftV1SubManager):
     _has_detail = False
     _url_resource_path = '/%s'
     _json_resource_key = 'object'
+    _list_mapping = {
+        'hash': 'etag',
+        'bytes': 'content-length',
+        'content_type': 'content-type',
+        'last_modified': 'last-modified',
+    }
 
     def create(self, name, content_disposition=UNDEF, content_encoding=UNDEF,
                content_type=UNDEF, etag=UNDEF, if_none_match=UNDEF,
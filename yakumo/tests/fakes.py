@@ -0,0 +1,86 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Fake client and session for unit tests
+"""
+
+
+class FakeSession(object):
+    """Session without endpoints; managers list what tests give them"""
+
+    hydrate_workers = 2
+    lazy_attrs = False
+    page_size = None
+    reference_cache = None
+    response_cache = None
+    stream_lists = False
+
+    def __init__(self):
+        self.async_session = FakeAsyncSession()
+
+    def get_proxy(self, service):
+        return None
+
+    def get_async_session(self):
+        return self.async_session
+
+
+class FakeAsyncSession(object):
+    """Async session handing out proxies set by tests"""
+
+    def __init__(self):
+        self.proxies = {}
+
+    def get_proxy(self, service):
+        return self.proxies.get(service)
+
+
+class FakeTime(object):
+    """Clock advancing only when tests sleep or move it"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeClient(object):
+    """Client holding managers set by tests"""
+
+    def __init__(self):
+        self._session = FakeSession()
+
+
+def set_listing(manager, items):
+    """
+    Make a manager list the items given instead of calling the API
+
+    @param manager: Manager object
+    @type manager: yakumo.base.Manager
+    @param items: JSON of resources
+    @type items: [dict]
+    @rtype: None
+    """
+    def _list_json(params=None):
+        for item in items:
+            yield dict(item)
+    manager._list_json = _list_json
@@ -0,0 +1,250 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from yakumo.neutron.v2.lb import pool
+from yakumo.neutron.v2 import security_group as neutron_security_group
+from yakumo.nova.v2 import key_pair
+from yakumo.nova.v2 import security_group as nova_security_group
+from yakumo import exception
+from yakumo import session
+from yakumo.tests import fakes
+from yakumo.tests import test_base
+from yakumo.tests import test_session
+
+if sys.version_info >= (3, 7):
+    import asyncio
+
+    import aiohttp
+    from aiohttp import web
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'asyncio support needs 3.7+')
+class ReloadManyTest(unittest.TestCase):
+
+    def test_concurrency_is_bounded(self):
+        client = fakes.FakeClient()
+        client._session.hydrate_workers = 3
+        manager = test_base.Manager(client)
+        resources = [manager.get_empty('id%d' % i) for i in range(20)]
+        state = {'running': 0, 'peak': 0}
+
+        async def areload():
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+            await asyncio.sleep(0.001)
+            state['running'] -= 1
+
+        for resource in resources:
+            resource.areload = areload
+        deleted = asyncio.run(manager.areload_many(resources))
+        self.assertEqual([], deleted)
+        self.assertEqual(3, state['peak'])
+
+
+class FakeAsyncHTTP(object):
+    """Async proxy answering GETs with the JSON of paths"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+
+    async def get(self, path, params=None):
+        self.requests.append((path, params))
+        return copy.deepcopy(self.routes[path.strip('/')])
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'asyncio support needs 3.7+')
+class FindTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = fakes.FakeClient()
+        self.client.neutron = fakes.FakeClient()
+        self.client.neutron.lb = fakes.FakeClient()
+        self.proxies = self.client._session.async_session.proxies
+
+    def test_key_pair(self):
+        manager = key_pair.Manager(self.client)
+        self.proxies['compute'] = FakeAsyncHTTP({'os-keypairs': {
+            'keypairs': [
+                {'keypair': {'name': 'key1', 'fingerprint': 'f1'}},
+                {'keypair': {'name': 'key2', 'fingerprint': 'f2'}},
+            ],
+        }})
+        self.assertEqual(['key1', 'key2'],
+                         asyncio.run(manager.alist()).get_ids())
+        found = asyncio.run(manager.afind(fields=['name'], fingerprint='f2'))
+        self.assertEqual(['key2'], found.get_ids())
+
+    def test_nova_security_group_rule(self):
+        manager = nova_security_group.Manager(self.client)
+        sg = manager.resource_class(manager, id='sg1', _rules=[
+            {'id': 'rule1', 'ip_protocol': 'tcp'},
+            {'id': 'rule2', 'ip_protocol': 'udp'},
+        ])
+        # no proxy; rules are read from the security group
+        found = asyncio.run(sg.rules.afind(protocol='udp'))
+        self.assertEqual(['rule2'], found.get_ids())
+        self.assertEqual('rule1', asyncio.run(sg.rules.aget('rule1')).id)
+
+    def test_neutron_security_group_rule(self):
+        manager = self.client.neutron.security_group = \
+            neutron_security_group.Manager(self.client)
+        http = self.proxies['network'] = FakeAsyncHTTP({
+            'v2.0/security-group-rules': {'security_group_rules': [
+                {'id': 'rule1', 'security_group_id': 'sg1'},
+                {'id': 'rule2', 'security_group_id': 'sg2'},
+            ]},
+        })
+        sg = manager.get_empty('sg1')
+        self.assertEqual(['rule1'], asyncio.run(sg.rules.alist()).get_ids())
+        self.assertEqual({'security_group_id': 'sg1'}, http.requests[0][1])
+        fakes.set_listing(sg.rules, http.routes[
+            'v2.0/security-group-rules']['security_group_rules'])
+        self.assertEqual(['rule1'], sg.rules.list().get_ids())
+
+    def test_lb_member(self):
+        manager = self.client.neutron.lb.pool = pool.Manager(self.client)
+        http = self.proxies['network'] = FakeAsyncHTTP({
+            'v2.0/lb/members': {'members': [
+                {'id': 'member1', 'pool_id': 'pool1', 'weight': 1},
+                {'id': 'member2', 'pool_id': 'pool2', 'weight': 1},
+            ]},
+        })
+        pool1 = manager.get_empty('pool1')
+        found = asyncio.run(pool1.member.afind(weight=1))
+        self.assertEqual(['member1'], found.get_ids())
+        self.assertEqual('pool1', http.requests[0][1]['pool_id'])
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'asyncio support needs 3.7+')
+class GetFileTest(unittest.TestCase):
+
+    body = b'0123456789abcdef'
+
+    def setUp(self):
+        self.session = session.Session(
+            test_session.FakeCloudConfig(download_chunk_size=4))
+        self.status = None
+        self.fail_at = None
+        self.requested = []
+        self.dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.dir, 'obj')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, data):
+        with open(self.file, 'wb') as f:
+            f.write(data)
+
+    def read(self):
+        with open(self.file, 'rb') as f:
+            return f.read()
+
+    async def handle(self, request):
+        range_ = request.headers.get('Range')
+        self.requested.append(range_)
+        if self.status is not None:
+            return web.Response(status=self.status)
+        total = len(self.body)
+        response = web.StreamResponse()
+        body = self.body
+        if range_:
+            start = int(range_[len('bytes='):-1])
+            if start >= total:
+                response.set_status(416)
+                response.headers['Content-Range'] = 'bytes */%d' % total
+                body = b''
+            else:
+                response.set_status(206)
+                response.headers['Content-Range'] = \
+                    'bytes %d-%d/%d' % (start, total - 1, total)
+                body = body[start:]
+        response.content_length = len(body)
+        await response.prepare(request)
+        if self.fail_at is not None:
+            await response.write(body[:self.fail_at])
+            self.fail_at = None
+            request.transport.close()
+            return response
+        await response.write(body)
+        await response.write_eof()
+        return response
+
+    def get_file(self, **kwargs):
+        async def run():
+            app = web.Application()
+            app.router.add_get('/{path:.*}', self.handle)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            self.session.endpoints['object-store'] = \
+                'http://127.0.0.1:%d/v1/AUTH_x' % port
+            asession = self.session.get_async_session()
+            try:
+                return await asession.get_file(
+                    'object-store', 'c1', 'obj', file=self.file, **kwargs)
+            finally:
+                await asession.close()
+                await runner.cleanup()
+        return asyncio.run(run())
+
+    def test_resume(self):
+        self.write(self.body[:5])
+        headers = self.get_file(resume=True)
+        self.assertEqual(self.body, self.read())
+        self.assertEqual(['bytes=5-'], self.requested)
+        self.assertEqual('bytes 5-15/16', headers['Content-Range'])
+
+    def test_resume_completed(self):
+        self.write(self.body)
+        headers = self.get_file(resume=True)
+        self.assertEqual(self.body, self.read())
+        self.assertEqual(['bytes=16-'], self.requested)
+        self.assertEqual('bytes */16', headers['Content-Range'])
+
+    def test_resume_larger(self):
+        self.write(self.body * 2)
+        self.get_file(resume=True)
+        self.assertEqual(self.body, self.read())
+        self.assertEqual(['bytes=32-', None], self.requested)
+
+    def test_truncate_on_failure(self):
+        self.fail_at = 8
+        self.assertRaises(aiohttp.ClientPayloadError, self.get_file,
+                          preallocate=True)
+        self.assertEqual(self.body[:8], self.read())
+        self.get_file(resume=True, preallocate=True)
+        self.assertEqual(self.body, self.read())
+        self.assertEqual([None, 'bytes=8-'], self.requested)
+
+    def test_error(self):
+        self.write(self.body)
+        self.status = 410
+        self.assertRaises(exception.ClientException, self.get_file,
+                          resume=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
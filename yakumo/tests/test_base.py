@@ -0,0 +1,712 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from yakumo import base
+from yakumo import constant
+from yakumo import exception
+from yakumo import mapper
+from yakumo.nova.v2 import key_pair
+from yakumo.nova.v2 import security_group
+from yakumo.swift.v1 import container
+from yakumo.tests import fakes
+
+
+ATTRIBUTE_MAPPING = [
+    ('id', 'id', mapper.Noop),
+    ('name', 'name', mapper.Noop),
+    ('status', 'status', mapper.Noop),
+]
+
+
+class Resource(base.Resource):
+    pass
+
+
+class Manager(base.Manager):
+
+    resource_class = Resource
+    service_type = 'fake'
+    _attr_mapping = ATTRIBUTE_MAPPING
+    _json_resource_key = 'item'
+    _json_resources_key = 'items'
+
+
+class NoDetailManager(Manager):
+
+    _has_detail = False
+
+    def __init__(self, client, items):
+        super(NoDetailManager, self).__init__(client)
+        self._items = dict((x['id'], x) for x in items)
+        fakes.set_listing(self, [{'id': x['id']} for x in items])
+
+    def get(self, id):
+        # None as base.Manager.get() returns on errors except NotFound
+        attrs = self._items.get(id)
+        if attrs is None:
+            return None
+        return self.resource_class(self, **attrs)
+
+
+class FindWithoutDetailTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = NoDetailManager(fakes.FakeClient(), [
+            {'id': 'a', 'name': 'x', 'status': 'ACTIVE'},
+            {'id': 'b', 'name': 'y', 'status': 'ERROR'},
+            {'id': 'c', 'name': 'z', 'status': 'ACTIVE'},
+        ])
+
+    def test_skip_failed_get(self):
+        del self.manager._items['b']
+        self.assertEqual(['a', 'c'], self.manager.list().get_ids())
+
+    def test_conditions(self):
+        self.assertEqual(['a', 'c'],
+                         self.manager.find(status='ACTIVE').get_ids())
+        self.assertIsNone(self.manager.find_one(name='nope'))
+
+
+class ListHTTP(object):
+    """Proxy answering GETs with a list"""
+
+    def __init__(self, listing):
+        self.listing = listing
+
+    def get(self, path, params=None):
+        return self.listing
+
+
+class FieldsTest(unittest.TestCase):
+    """fields is ignored by managers without field selection"""
+
+    def setUp(self):
+        self.client = fakes.FakeClient()
+
+    def test_key_pair(self):
+        manager = key_pair.Manager(self.client)
+        manager._http = ListHTTP({'keypairs': [
+            {'keypair': {'name': 'key1', 'fingerprint': 'f1'}},
+            {'keypair': {'name': 'key2', 'fingerprint': 'f2'}},
+        ]})
+        self.assertEqual(['key1', 'key2'],
+                         manager.list(fields=['name']).get_ids())
+        self.assertEqual(['key2'], manager.find(
+            fields=['fingerprint'], fingerprint='f2').get_ids())
+
+    def test_swift_container(self):
+        manager = container.Manager(self.client)
+        fakes.set_listing(manager, [{'name': 'c1', 'count': 0},
+                                    {'name': 'c2', 'count': 1}])
+        self.assertEqual(['c1', 'c2'],
+                         manager.list(fields=['name']).get_ids())
+        self.assertEqual('c2', manager.find_one(fields=['name'],
+                                                object_count=1).name)
+
+    def test_nova_security_group_rule(self):
+        manager = security_group.Manager(self.client)
+        sg = manager.resource_class(manager, id='sg1', _rules=[
+            {'id': 'rule1', 'ip_protocol': 'tcp'},
+        ])
+        self.assertEqual(['rule1'], sg.rules.list(fields=['id']).get_ids())
+
+
+class FakeHTTP(object):
+    """Proxy answering conditional requests like an API with ETags"""
+
+    def __init__(self, item, etag):
+        self.item = item
+        self.etag = etag
+        self.requests = []
+
+    def revalidate(self, method, *args, **kwargs):
+        self.requests.append((method, kwargs))
+        headers = {'ETag': self.etag}
+        if kwargs.get('etag') == self.etag:
+            return False, headers, None
+        return True, headers, {'item': dict(self.item)}
+
+
+class RevalidatingManager(Manager):
+
+    _revalidate_method = 'GET'
+
+
+class RevalidateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = RevalidatingManager(fakes.FakeClient())
+        self.http = self.manager._http = FakeHTTP(
+            {'id': 'a', 'name': 'x', 'status': 'ACTIVE'}, 'e1')
+        self.resource = self.manager.resource_class(
+            self.manager, id='a', name='x', status='BUILD')
+
+    def test_reload(self):
+        self.assertTrue(self.resource.reload())
+        self.assertEqual('ACTIVE', self.resource.status)
+        self.assertEqual('e1', self.resource._etag)
+        # not modified
+        self.resource.status = 'BUILD'
+        self.assertFalse(self.resource.reload())
+        self.assertEqual('BUILD', self.resource.status)
+        self.http.etag = 'e2'
+        self.http.item['name'] = 'y'
+        self.assertTrue(self.resource.reload())
+        self.assertEqual('y', self.resource.name)
+        self.assertEqual([None, 'e1', 'e1'],
+                         [x[1]['etag'] for x in self.http.requests])
+        self.assertEqual(['GET'] * 3, [x[0] for x in self.http.requests])
+
+
+class ItemsHTTP(object):
+    """Proxy answering GETs of items"""
+
+    def __init__(self, items):
+        self.items = dict((x['id'], x) for x in items)
+
+    def get(self, path):
+        item = self.items.get(path.strip('/'))
+        if item is None:
+            raise exception.NotFound()
+        return {'item': dict(item)}
+
+
+class ListFilterManager(Manager):
+
+    _has_field_filters = True
+
+
+class ReloadManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.items = [{'id': x, 'name': x, 'status': 'ACTIVE'}
+                      for x in 'abcde']
+
+    def make_resources(self, manager):
+        return [manager.resource_class(manager, id=x, status='BUILD')
+                for x in 'abcdef']
+
+    def test_parallel(self):
+        manager = Manager(fakes.FakeClient())
+        manager._http = ItemsHTTP(self.items)
+        resources = self.make_resources(manager)
+        resources[0]._deleted = True
+        deleted = manager.reload_many(resources)
+        self.assertEqual([resources[5]], deleted)
+        self.assertTrue(resources[5].is_deleted())
+        self.assertFalse(resources[0].is_deleted())
+        self.assertEqual(['ACTIVE'] * 5, [x.status for x in resources[:5]])
+        self.assertEqual('c', resources[2].name)
+
+    def test_list(self):
+        manager = ListFilterManager(fakes.FakeClient())
+        requests = []
+
+        def _list_json(params=None):
+            requests.append(params)
+            for item in self.items:
+                if item['id'] in params['id']:
+                    yield dict(item)
+        manager._list_json = _list_json
+        resources = self.make_resources(manager)
+        chunk_size = base.RELOAD_CHUNK_SIZE
+        base.RELOAD_CHUNK_SIZE = 4
+        try:
+            deleted = manager.reload_many(resources)
+        finally:
+            base.RELOAD_CHUNK_SIZE = chunk_size
+        self.assertEqual([{'id': ['a', 'b', 'c', 'd']}, {'id': ['e', 'f']}],
+                         requests)
+        self.assertEqual([resources[5]], deleted)
+        self.assertTrue(resources[5].is_deleted())
+        self.assertEqual(['ACTIVE'] * 5, [x.status for x in resources[:5]])
+
+
+class PagedHTTP(object):
+    """Proxy serving a list in pages linked as the services do"""
+
+    def __init__(self, items, style='items_links'):
+        self.items = items
+        self.style = style
+        self.requested = []
+
+    def get(self, path, params=None):
+        params = dict(params or {})
+        self.requested.append(params)
+        limit = int(params.get('limit', len(self.items)))
+        ids = [x['id'] for x in self.items]
+        start = 0
+        if 'marker' in params:
+            start = ids.index(params['marker']) + 1
+        page = self.items[start:start + limit]
+        ret = {'items': [dict(x) for x in page]}
+        if start + limit >= len(self.items):
+            return ret
+        href = '/v2/items?limit=%d&marker=%s' % (limit, page[-1]['id'])
+        if self.style == 'items_links':
+            ret['items_links'] = [
+                {'rel': 'self', 'href': 'http://example.com/v2/items'},
+                {'rel': 'next', 'href': 'http://example.com' + href},
+            ]
+        elif self.style == 'next':
+            ret['next'] = href
+        elif self.style == 'links':
+            ret['links'] = {'next': 'http://example.com' + href}
+        elif self.style == 'same':
+            ret['next'] = '/v2/items?limit=%d' % limit
+        return ret
+
+
+class SwiftHTTP(object):
+    """Proxy serving a Swift listing by marker"""
+
+    def __init__(self, names):
+        self.names = names
+        self.requested = []
+
+    def get(self, path, params=None):
+        self.requested.append(dict(params))
+        names = [x for x in self.names
+                 if params.get('marker') is None or x > params['marker']]
+        return [{'name': x} for x in names[:params['limit']]]
+
+
+class PaginationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = fakes.FakeClient()
+        self.client._session.page_size = 2
+        self.items = [{'id': x, 'name': x.upper(), 'status': 'ACTIVE'}
+                      for x in 'abcde']
+
+    def make_manager(self, style, manager_class=Manager):
+        manager = manager_class(self.client)
+        manager._http = PagedHTTP(self.items, style)
+        return manager
+
+    def test_next_links(self):
+        for style in ('items_links', 'next', 'links'):
+            manager = self.make_manager(style)
+            self.assertEqual(['a', 'b', 'c', 'd', 'e'],
+                             manager.list().get_ids())
+            self.assertEqual([{'limit': '2'},
+                              {'limit': '2', 'marker': 'b'},
+                              {'limit': '2', 'marker': 'd'}],
+                             manager._http.requested)
+
+    def test_last_page(self):
+        manager = self.make_manager('items_links')
+        self.client._session.page_size = None
+        self.assertEqual(5, len(manager.list()))
+        self.assertEqual([{}], manager._http.requested)
+
+    def test_filters_kept(self):
+        # some services drop the filters from the next links
+        manager = self.make_manager('next', ListFilterManager)
+        self.assertEqual(5, len(manager.find(status='ACTIVE')))
+        self.assertEqual(['ACTIVE'] * 3, [x.get('status') for x in
+                                          manager._http.requested])
+
+    def test_same_link(self):
+        manager = self.make_manager('same')
+        self.assertEqual(['a', 'b'], manager.list().get_ids())
+        self.assertEqual(1, len(manager._http.requested))
+
+    def test_find_one(self):
+        manager = self.make_manager('items_links')
+        self.assertEqual('a', manager.find_one(name='A').id)
+        self.assertEqual(1, len(manager._http.requested))
+        self.assertEqual('c', manager.find_one(name='C').id)
+        self.assertEqual(3, len(manager._http.requested))
+
+    def test_swift_marker(self):
+        manager = container.Manager(self.client)
+        manager._http = SwiftHTTP(['c1', 'c2', 'c3', 'c4', 'c5'])
+        self.assertEqual(['c1', 'c2', 'c3', 'c4', 'c5'],
+                         [x.name for x in manager.list()])
+        self.assertEqual([None, 'c2', 'c4'],
+                         [x.get('marker') for x in manager._http.requested])
+        # the last page is full
+        manager._http = SwiftHTTP(['c1', 'c2', 'c3', 'c4'])
+        self.assertEqual(4, len(manager.list()))
+        self.assertEqual([None, 'c2', 'c4'],
+                         [x.get('marker') for x in manager._http.requested])
+        self.assertEqual([2, 2, 2],
+                         [x['limit'] for x in manager._http.requested])
+
+
+FILTER_MAPPING = ATTRIBUTE_MAPPING + [
+    ('parent', 'parent_id', mapper.Resource('parents')),
+    ('enabled', 'enabled', mapper.Noop),
+    ('metadata', 'metadata', mapper.Noop),
+]
+
+
+class QueryFilterManager(Manager):
+
+    _attr_mapping = FILTER_MAPPING
+    _query_filters = {'name': 'name', 'tag': 'tag'}
+
+
+class FieldFilterManager(Manager):
+
+    _attr_mapping = FILTER_MAPPING
+    _has_field_filters = True
+
+
+class QueryParamsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = fakes.FakeClient()
+        self.client.parents = Manager(self.client)
+        self.parent = self.client.parents.get_empty('p1')
+
+    def test_query_filters(self):
+        manager = QueryFilterManager(self.client)
+        params, conditions = manager._get_query_params(
+            dict(name='A', status='ACTIVE', tag='t1'))
+        self.assertEqual({'name': 'A', 'tag': 't1'}, params)
+        # tag isn't an attribute to check
+        self.assertEqual({'name': 'A', 'status': 'ACTIVE'}, conditions)
+
+    def test_field_filters(self):
+        manager = FieldFilterManager(self.client)
+        kwargs = dict(name='A', parent=self.parent, enabled=True,
+                      metadata={'key': 'value'})
+        params, conditions = manager._get_query_params(dict(kwargs))
+        self.assertEqual({'name': 'A', 'parent_id': 'p1',
+                          'enabled': 'true'}, params)
+        self.assertEqual(kwargs, conditions)
+
+    def test_no_filters(self):
+        manager = Manager(self.client)
+        params, conditions = manager._get_query_params(dict(name='A'))
+        self.assertEqual({}, params)
+        self.assertEqual({'name': 'A'}, conditions)
+
+    def test_checked_on_client(self):
+        # the fake API ignores the query parameters
+        manager = QueryFilterManager(self.client)
+        manager._http = PagedHTTP([
+            {'id': 'a', 'name': 'A'},
+            {'id': 'b', 'name': 'AB'},
+        ], style=None)
+        self.assertEqual(['a'], manager.find(name='A', tag='t1').get_ids())
+        self.assertEqual([{'name': 'A', 'tag': 't1'}],
+                         manager._http.requested)
+
+    def test_resource_condition(self):
+        manager = FieldFilterManager(self.client)
+        manager._http = PagedHTTP([
+            {'id': 'a', 'parent_id': 'p1'},
+            {'id': 'b', 'parent_id': 'p2'},
+        ], style=None)
+        self.assertEqual(['a'], manager.find(parent=self.parent).get_ids())
+        self.assertEqual([{'parent_id': 'p1'}], manager._http.requested)
+
+    def test_field_params(self):
+        manager = FieldFilterManager(self.client)
+        self.assertEqual({'fields': ['id', 'name', 'parent_id']},
+                         manager._get_field_params(
+                             ['name'], {'parent': self.parent}))
+        self.assertEqual({}, manager._get_field_params(None, {}))
+        self.assertEqual({}, QueryFilterManager(
+            self.client)._get_field_params(['name'], {}))
+
+
+class LazyManager(ListFilterManager):
+
+    _attr_mapping = ATTRIBUTE_MAPPING + [
+        ('size', 'size_gb', mapper.IntStr),
+    ]
+
+
+class PostProcessingManager(LazyManager):
+
+    def _json2attr(self, json_params):
+        ret = super(PostProcessingManager, self)._json2attr(json_params)
+        ret['size'] *= 1024
+        return ret
+
+
+class LazyAttrsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = fakes.FakeClient()
+        self.client._session.lazy_attrs = True
+        self.items = [
+            {'id': 'a', 'name': 'A', 'status': 'ACTIVE', 'size_gb': '1'},
+            {'id': 'b', 'name': 'B', 'status': 'ERROR', 'size_gb': '2'},
+        ]
+
+    def make_manager(self, manager_class=LazyManager):
+        manager = manager_class(self.client)
+        fakes.set_listing(manager, self.items)
+        manager._http = ItemsHTTP([
+            dict(x, status='DELETED', size_gb='3') for x in self.items])
+        return manager
+
+    def test_decoded_on_access(self):
+        resource = self.make_manager().list()[0]
+        self.assertEqual(self.items[0], resource._raw)
+        self.assertNotIn('size', resource.__dict__)
+        self.assertEqual(1, resource.size)
+        self.assertEqual(1, resource.__dict__['size'])
+        self.assertIsNone(resource.__dict__.get('name'))
+        self.assertEqual('A', resource.name)
+
+    def test_post_processing(self):
+        resource = self.make_manager(PostProcessingManager).list()[0]
+        self.assertEqual(1024, resource.size)
+        # decoded at once by the overridden _json2attr()
+        self.assertIsNone(resource._raw)
+        self.assertEqual('A', resource.__dict__['name'])
+
+    def test_conditions(self):
+        manager = self.make_manager()
+        self.assertEqual(['b'], manager.find(status='ERROR').get_ids())
+        self.assertEqual([], manager.find(size=3).get_ids())
+
+    def test_get_attrs(self):
+        resource = self.make_manager().list()[1]
+        self.assertEqual({'id': 'b', 'name': 'B', 'status': 'ERROR',
+                          'size': 2}, resource.get_attrs())
+        self.assertIsNone(resource._raw)
+
+    def test_partial(self):
+        manager = self.make_manager()
+        # the API returns the fields selected only
+        fakes.set_listing(manager, [{'id': 'a', 'name': 'A'}])
+        resource = manager.find_one(fields=['name'])
+        self.assertFalse(resource._loaded)
+        self.assertEqual('A', resource.name)
+        self.assertFalse(resource._loaded)
+        # not selected, so loaded by GET
+        self.assertEqual(3, resource.size)
+        self.assertTrue(resource._loaded)
+        self.assertIsNone(resource._raw)
+        self.assertEqual('DELETED', resource.status)
+
+    def test_reload(self):
+        resource = self.make_manager().list()[0]
+        self.assertEqual('ACTIVE', resource.status)
+        self.assertTrue(resource.reload())
+        self.assertIsNone(resource._raw)
+        self.assertEqual('DELETED', resource.status)
+        self.assertEqual(3, resource.size)
+        self.assertEqual('A', resource.name)
+
+
+class ChildManager(base.SubManager):
+
+    resource_class = Resource
+    service_type = 'fake'
+    _attr_mapping = ATTRIBUTE_MAPPING
+    _json_resource_key = 'child'
+    _json_resources_key = 'children'
+    _url_resource_path = '/items/%s/children'
+
+
+class ParentResource(Resource):
+
+    _sub_manager_list = {'children': ChildManager}
+
+
+class ParentManager(Manager):
+
+    resource_class = ParentResource
+
+
+class ResourceManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = ParentManager(fakes.FakeClient())
+        self.manager._http = ItemsHTTP([{'id': 'p1', 'name': 'P1'}])
+
+    def test_manager_attrs(self):
+        resource = self.manager.get_empty('p1')
+        self.assertIs(self.manager._http, resource._http)
+        self.assertIs(self.manager._attrs, resource._attrs)
+        self.assertEqual('id', resource._id_attr)
+        self.assertEqual('item', resource._json_resource_key)
+        self.assertNotIn('_http', resource.__dict__)
+
+    def test_sub_manager(self):
+        resource = self.manager.get_empty('p1')
+        self.assertNotIn('children', resource.__dict__)
+        children = resource.children
+        self.assertIsInstance(children, ChildManager)
+        self.assertIs(resource, children.parent_resource)
+        self.assertEqual('/items/p1/children', children._url_resource_path)
+        self.assertIs(children, resource.children)
+        other = self.manager.get_empty('p2').children
+        self.assertIsNot(children, other)
+        self.assertEqual('/items/p2/children', other._url_resource_path)
+
+    def test_sub_manager_kept(self):
+        resource = self.manager.get_empty('p1')
+        children = resource.children
+        self.assertEqual('P1', resource.name)
+        self.assertTrue(resource.reload())
+        self.assertIs(children, resource.children)
+        self.assertNotIn('children', resource.get_attrs())
+
+    def test_sub_manager_without_id(self):
+        resource = ParentResource(self.manager, name='P1')
+        self.assertRaises(AttributeError, getattr, resource, 'children')
+
+
+def old_json2attr(manager, json_params):
+    """_json2attr() before the mappings were compiled"""
+    to_json, to_attr = {}, {}
+    mapper.make_mappings(manager._attr_mapping, to_json, to_attr)
+    result = {}
+    for key, value in json_params.items():
+        _map = to_attr.get(key)
+        if _map is not None:
+            result[_map['attr']] = _map['mapper'].to_attr(manager, value)
+        elif manager._has_extra_attr and \
+                not key.startswith('_') and key not in base.BAD_ATTRS:
+            result[key] = value
+    return result
+
+
+def old_attr2json(manager, attrs):
+    """_attr2json() before the mappings were compiled"""
+    to_json, to_attr = {}, {}
+    mapper.make_mappings(manager._attr_mapping, to_json, to_attr)
+    result = {}
+    for key, value in attrs.items():
+        if value is constant.UNDEF:
+            continue
+        _map = to_json.get(key)
+        if _map is not None:
+            result[_map['json_attr']] = _map['mapper'].to_json(manager, value)
+        elif manager._has_extra_attr and \
+                not key.startswith('_') and key not in base.BAD_ATTRS:
+            result[key] = value
+    return result
+
+
+class MappingManager(Manager):
+
+    _attr_mapping = ATTRIBUTE_MAPPING + [
+        ('size', 'size_gb', mapper.IntStr),
+        ('size', 'size_mb', mapper.IntStr),
+        ('is_public', 'public', mapper.BoolStr),
+        ('created_at', 'created', mapper.DateTime),
+        ('parent', 'parent_id', mapper.Resource('parents')),
+        ('members', 'member_ids', mapper.List(mapper.Resource('parents'))),
+    ]
+
+
+class ExtraAttrManager(MappingManager):
+
+    _has_extra_attr = True
+    _attr_mapping = MappingManager._attr_mapping + [
+        ('name', 'display_name', mapper.Noop),
+    ]
+
+
+class CompiledMappingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = fakes.FakeClient()
+        self.client.parents = Manager(self.client)
+        self.json = {
+            'id': 'a', 'name': 'A', 'display_name': 'B', 'status': 'ACTIVE',
+            'size_gb': '1', 'size_mb': '1024', 'public': 'true',
+            'created': '2017-01-02T03:04:05Z', 'parent_id': 'p1',
+            'member_ids': ['p1', 'p2'], 'extra': 'x', '_private': 'y',
+            'self': 'z',
+        }
+
+    def assertCompiled(self, manager):
+        attrs = old_json2attr(manager, self.json)
+        self.assertEqual(attrs, manager._json2attr(self.json))
+        for name in list(attrs) + ['nope']:
+            self.assertEqual((name in attrs, attrs.get(name)),
+                             manager._decode_attr(self.json, name))
+        attrs['name'] = constant.UNDEF
+        self.assertEqual(old_attr2json(manager, attrs),
+                         manager._attr2json(attrs))
+
+    def test_same_as_mapper(self):
+        self.assertCompiled(MappingManager(self.client))
+
+    def test_subclass(self):
+        manager = MappingManager(self.client)
+        extra = ExtraAttrManager(self.client)
+        self.assertCompiled(extra)
+        self.assertNotIn('extra', manager._json2attr(self.json))
+        self.assertEqual('x', extra._json2attr(self.json)['extra'])
+        self.assertEqual('name',
+                         extra._to_json_mapping['name']['json_attr'])
+        self.assertEqual('name',
+                         extra._to_attr_mapping['display_name']['attr'])
+        self.assertNotIn('display_name', manager._to_attr_mapping)
+        self.assertEqual(['id', 'name', 'status'],
+                         Manager(self.client)._attrs)
+        self.assertIn('parent', manager._attrs)
+
+    def test_compiled_once(self):
+        manager = MappingManager(self.client)
+        table = MappingManager.__dict__['_json2attr_table']
+        self.assertIs(table, MappingManager(self.client)._json2attr_table)
+        self.assertIs(manager._attrs, MappingManager(self.client)._attrs)
+        ExtraAttrManager(self.client)
+        self.assertIsNot(table, ExtraAttrManager._json2attr_table)
+
+
+class SortedManager(Manager):
+
+    _sort_by_updated_params = {'sort_key': 'updated_at', 'sort_dir': 'desc'}
+
+
+def make_item(id, name, minute):
+    return {'id': id, 'name': name, 'status': 'ACTIVE',
+            'updated_at': '2017-01-01T00:%02d:00Z' % minute}
+
+
+class SyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = SortedManager(fakes.FakeClient())
+        self.items = [make_item('c', 'z', 3), make_item('b', 'y', 2),
+                      make_item('a', 'x', 1)]
+        fakes.set_listing(self.manager, self.items)
+        self.manager.sync()
+
+    def test_sorted(self):
+        self.items[:] = [make_item('a', 'w', 4)] + self.items[:2]
+        synced, changed, deleted = self.manager.sync()
+        # items updated at the high-water mark are listed again
+        self.assertEqual(['a', 'c'], changed.get_ids())
+        self.assertEqual('w', synced.get('a').name)
+        self.assertEqual(['c', 'b', 'a'], synced.get_ids())
+
+    def test_unsorted(self):
+        # the API ignored the sort key and listed the oldest first
+        self.items[:] = [make_item('b', 'y', 2), make_item('c', 'z', 3),
+                         make_item('a', 'w', 4)]
+        synced, changed, deleted = self.manager.sync()
+        self.assertEqual('w', synced.get('a').name)
+        self.assertEqual(['b', 'c', 'a'], changed.get_ids())
+
+
+if __name__ == '__main__':
+    unittest.main()
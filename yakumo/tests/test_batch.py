@@ -0,0 +1,78 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import unittest
+
+from yakumo import batch
+from yakumo.tests import fakes
+from yakumo.tests import test_base
+
+
+class ComputeManager(test_base.Manager):
+
+    service_type = 'compute'
+
+
+class VolumeManager(test_base.Manager):
+
+    service_type = 'volume'
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        client = fakes.FakeClient()
+        self.compute = ComputeManager(client)
+        self.volume = VolumeManager(client)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.release = threading.Event()
+
+    def wait(self, manager, value):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        self.release.wait(5)
+        with self.lock:
+            self.running -= 1
+        return value
+
+    def test_results(self):
+        self.release.set()
+        with batch.Batch(max_workers=2) as b:
+            b.map(self.wait, [self.compute, self.volume], 'x')
+            b.submit(int, 'x')
+        results = b.results()
+        self.assertEqual(['x', 'x', None], [r.value for r in results])
+        self.assertIsInstance(results[2].exception, ValueError)
+        self.assertFalse(results[2].ok)
+
+    def test_per_service_limit(self):
+        with batch.Batch(max_workers=2,
+                         per_service_limit={'compute': 1}) as b:
+            compute = b.map(self.wait, [self.compute] * 3, 'c')
+            volume = b.submit(lambda manager: 'v', self.volume)
+            # queued compute calls don't hold the other worker
+            self.assertEqual('v', volume._future.result(5))
+            self.assertFalse(any(r._future.done() for r in compute))
+            self.release.set()
+        self.assertEqual(['c'] * 3, [r.value for r in compute])
+        self.assertEqual(1, self.peak)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from yakumo import cache
+from yakumo.tests import fakes
+
+
+class Item(object):
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.time = fakes.FakeTime()
+        self._time = cache.time
+        cache.time = self.time
+
+    def tearDown(self):
+        cache.time = self._time
+
+
+class ReferenceCacheTest(CacheTestCase):
+
+    key = ('compute', '/flavors/detail')
+
+    def setUp(self):
+        super(ReferenceCacheTest, self).setUp()
+        self.cache = cache.ReferenceCache(ttl=60)
+        self.items = [Item('1', 'small'), Item('2', 'large')]
+        self.loads = 0
+
+    def loader(self):
+        self.loads += 1
+        return list(self.items)
+
+    def test_lookup(self):
+        self.assertEqual('2', self.cache.lookup(self.key, self.loader,
+                                                name='large').id)
+        self.assertEqual('1', self.cache.lookup(self.key, self.loader,
+                                                id='1', name='small').id)
+        self.assertIsNone(self.cache.lookup(self.key, self.loader,
+                                            id='1', name='large'))
+        self.assertEqual(1, self.loads)
+        stats = self.cache.get_stats()[self.key]
+        self.assertEqual(2, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(1, stats['loads'])
+        self.assertEqual(2, stats['size'])
+
+    def test_ttl(self):
+        self.cache.lookup(self.key, self.loader, id='1')
+        self.time.now += 59
+        self.cache.lookup(self.key, self.loader, id='1')
+        self.assertEqual(1, self.loads)
+        self.time.now += 1
+        self.cache.lookup(self.key, self.loader, id='1')
+        self.assertEqual(2, self.loads)
+
+    def test_refresh_on_miss(self):
+        self.cache.lookup(self.key, self.loader, id='1')
+        self.items.append(Item('3', 'huge'))
+        # the catalog has just been loaded
+        self.assertIsNone(self.cache.lookup(self.key, self.loader, id='3'))
+        self.assertEqual(1, self.loads)
+        self.time.now += cache.REFRESH_ON_MISS_AFTER
+        self.assertEqual('huge', self.cache.lookup(self.key, self.loader,
+                                                   id='3').name)
+        self.assertEqual(2, self.loads)
+
+    def test_invalidate(self):
+        other = ('volume', '/types')
+        self.cache.lookup(self.key, self.loader, id='1')
+        self.cache.lookup(other, self.loader, id='1')
+        self.cache.invalidate(self.key)
+        self.cache.lookup(other, self.loader, id='1')
+        self.assertEqual(2, self.loads)
+        self.cache.lookup(self.key, self.loader, id='1')
+        self.assertEqual(3, self.loads)
+        self.cache.invalidate()
+        stats = self.cache.get_stats()
+        self.assertEqual(2, stats[self.key]['invalidations'])
+        self.assertEqual(1, stats[other]['invalidations'])
+        self.assertEqual(0, stats[other]['size'])
+
+
+class GetCollectionTest(unittest.TestCase):
+
+    def test_get_collection(self):
+        self.assertEqual('v2.0/ports', cache.get_collection('/v2.0/ports/x'))
+        self.assertEqual('servers', cache.get_collection('servers/x/action'))
+        self.assertEqual('v2/images', cache.get_collection('/v2/images?a=b'))
+        self.assertEqual('', cache.get_collection('/'))
+
+
+    def test_get_parents(self):
+        self.assertEqual(['', 'c1'], cache.get_parents('/c1/obj'))
+        self.assertEqual(['', 'c1', 'c1/dir'],
+                         cache.get_parents('c1/dir/obj?x=1'))
+        self.assertEqual([''], cache.get_parents('c1'))
+
+
+class ResponseCacheTest(CacheTestCase):
+
+    def setUp(self):
+        super(ResponseCacheTest, self).setUp()
+        self.cache = cache.ResponseCache(3, ttl=30)
+
+    def test_get(self):
+        self.assertIsNone(self.cache.get('compute', '/servers/x'))
+        self.cache.put('compute', '/servers/x', b'{}')
+        self.assertEqual(b'{}', self.cache.get('compute', '/servers/x'))
+        self.assertIsNone(self.cache.get('volume', '/servers/x'))
+        stats = self.cache.get_stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual(1, stats['size'])
+        self.assertEqual(3, stats['maxsize'])
+
+    def test_ttl(self):
+        self.cache.put('compute', '/servers/x', b'{}')
+        self.time.now += 29
+        self.assertEqual(b'{}', self.cache.get('compute', '/servers/x'))
+        self.time.now += 1
+        self.assertIsNone(self.cache.get('compute', '/servers/x'))
+        stats = self.cache.get_stats()
+        self.assertEqual(1, stats['expirations'])
+        self.assertEqual(0, stats['size'])
+
+    def test_lru(self):
+        for path in ('/a', '/b', '/c'):
+            self.cache.put('compute', path, path)
+        self.cache.get('compute', '/a')
+        self.cache.put('compute', '/d', '/d')
+        self.assertIsNone(self.cache.get('compute', '/b'))
+        for path in ('/a', '/c', '/d'):
+            self.assertEqual(path, self.cache.get('compute', path))
+        # storing again makes it the most recently used
+        self.cache.put('compute', '/a', '/a')
+        self.cache.put('compute', '/e', '/e')
+        self.assertIsNone(self.cache.get('compute', '/c'))
+        self.assertEqual(2, self.cache.get_stats()['evictions'])
+
+    def test_invalidate(self):
+        self.cache = cache.ResponseCache(10)
+        # paths are joined by utils.join_path() without the leading slash
+        paths = ['v2.0/ports', 'v2.0/ports?device_id=x', 'v2.0/ports/y',
+                 'v2.0/portsx', 'v2.0/networks']
+        for path in paths:
+            self.cache.put('network', path, path)
+        self.cache.put('compute', 'v2.0/ports', 'compute')
+        self.cache.invalidate('network', 'v2.0/ports/y/z')
+        self.assertEqual([None, None, None, 'v2.0/portsx', 'v2.0/networks'],
+                         [self.cache.get('network', x) for x in paths])
+        self.assertEqual('compute', self.cache.get('compute', 'v2.0/ports'))
+        self.assertEqual(3, self.cache.get_stats()['invalidations'])
+        self.cache.invalidate('network')
+        self.assertIsNone(self.cache.get('network', 'v2.0/networks'))
+        self.assertEqual('compute', self.cache.get('compute', 'v2.0/ports'))
+        self.cache.invalidate()
+        self.assertEqual(0, self.cache.get_stats()['size'])
+
+
+    def test_invalidate_parents(self):
+        self.cache = cache.ResponseCache(10)
+        paths = ['?limit=10000', 'c1?limit=10000', 'c1/obj',
+                 'c2?limit=10000']
+        for path in paths:
+            self.cache.put('object-store', path, path)
+        # a container is listed in the account
+        self.cache.invalidate('object-store', 'c2')
+        self.assertEqual([None, 'c1?limit=10000', 'c1/obj', None],
+                         [self.cache.get('object-store', x) for x in paths])
+        for path in paths:
+            self.cache.put('object-store', path, path)
+        # an object is listed in its container, which has its size
+        self.cache.invalidate('object-store', 'c1/obj2')
+        self.assertEqual([None, None, None, 'c2?limit=10000'],
+                         [self.cache.get('object-store', x) for x in paths])
+        # other services invalidate their collection only
+        self.cache.put('compute', '?limit=10', 'x')
+        self.cache.invalidate('compute', 'servers/x')
+        self.assertEqual('x', self.cache.get('compute', '?limit=10'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from yakumo import collection
+from yakumo.tests import fakes
+from yakumo.tests import test_base
+
+
+class ResourceSetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = test_base.Manager(fakes.FakeClient())
+        self.a = self.make('a', 'x', 'ACTIVE')
+        self.b = self.make('b', 'y', 'ERROR')
+        self.c = self.make('c', 'z', 'ACTIVE')
+        self.resources = collection.ResourceSet([self.a, self.b, self.c])
+
+    def make(self, id, name, status):
+        return self.manager.resource_class(self.manager, id=id, name=name,
+                                           status=status)
+
+    def test_get(self):
+        self.assertIs(self.b, self.resources.get('b'))
+        self.assertIsNone(self.resources.get('d'))
+        self.assertIn(self.make('a', 'x', 'ACTIVE'), self.resources)
+        self.assertNotIn(self.make('d', 'x', 'ACTIVE'), self.resources)
+
+    def test_find(self):
+        found = self.resources.find(status='ACTIVE')
+        self.assertIsInstance(found, collection.ResourceSet)
+        self.assertEqual(['a', 'c'], found.get_ids())
+        self.assertEqual(['c'], self.resources.find(status='ACTIVE',
+                                                    name='z').get_ids())
+        self.assertEqual([], self.resources.find(status='BUILD'))
+        self.assertEqual(['a', 'b', 'c'], self.resources.find().get_ids())
+        self.assertIs(self.c, self.resources.find_one(name='z'))
+        self.assertIsNone(self.resources.find_one(name='w'))
+
+    def test_unhashable(self):
+        self.a.tags = ['1']
+        self.b.tags = ['2']
+        self.assertEqual(['a'], self.resources.find(tags=['1']).get_ids())
+        self.assertEqual([None], list(self.resources.group_by('tags')))
+
+    def test_group_by(self):
+        groups = self.resources.group_by('status')
+        self.assertEqual(['ACTIVE', 'ERROR'], list(groups))
+        self.assertEqual(['a', 'c'], groups['ACTIVE'].get_ids())
+        self.assertIsInstance(groups['ERROR'], collection.ResourceSet)
+
+    def test_set_operations(self):
+        other = collection.ResourceSet([self.make('c', 'z', 'ACTIVE'),
+                                        self.make('d', 'w', 'ACTIVE')])
+        self.assertEqual(['a', 'b', 'c', 'd'],
+                         (self.resources | other).get_ids())
+        self.assertEqual(['c'], (self.resources & other).get_ids())
+        self.assertEqual(['a', 'b'], (self.resources - other).get_ids())
+        self.assertIsInstance(self.resources - other, collection.ResourceSet)
+
+    def test_slice(self):
+        self.assertIsInstance(self.resources[1:], collection.ResourceSet)
+        self.assertEqual(['b', 'c'], self.resources[1:].get_ids())
+        self.assertIs(self.a, self.resources[0])
+
+    def test_invalidation(self):
+        d = self.make('d', 'w', 'ACTIVE')
+        mutations = [
+            lambda x: x.append(d),
+            lambda x: x.extend([d]),
+            lambda x: x.insert(0, d),
+            lambda x: x.__setitem__(0, d),
+            lambda x: x.__iadd__([d]),
+        ]
+        for mutate in mutations:
+            resources = collection.ResourceSet([self.a, self.b, self.c])
+            self.assertEqual(['a', 'c'],
+                             resources.find(status='ACTIVE').get_ids())
+            self.assertNotIn(d, resources)
+            mutate(resources)
+            self.assertIs(d, resources.get('d'))
+            self.assertIn(d, resources)
+            self.assertIn(d, resources.find(status='ACTIVE'))
+
+    def test_invalidation_on_removal(self):
+        mutations = [
+            lambda x: x.pop(0),
+            lambda x: x.remove(self.a),
+            lambda x: x.__delitem__(0),
+            lambda x: x.__delitem__(slice(0, 1)),
+            lambda x: x.__setitem__(slice(0, 1), []),
+        ]
+        for mutate in mutations:
+            resources = collection.ResourceSet([self.a, self.b, self.c])
+            self.assertIs(self.a, resources.get('a'))
+            self.assertIn(self.a, resources)
+            mutate(resources)
+            self.assertIsNone(resources.get('a'))
+            self.assertNotIn(self.a, resources)
+            self.assertEqual(['c'], resources.find(status='ACTIVE').get_ids())
+
+    def test_clear_indexes(self):
+        self.assertEqual(['b'], self.resources.find(name='y').get_ids())
+        # changed in place as Manager.sync() does
+        self.b.name = 'w'
+        self.resources._clear_indexes()
+        self.assertEqual([], self.resources.find(name='y'))
+        self.assertEqual(['b'], self.resources.find(name='w').get_ids())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from yakumo import instrument
+
+
+def make_record(path, service='compute', latency=0.01, status=200):
+    return instrument.RequestRecord(
+        service=service, method='GET', path=path, status=status,
+        latency=latency, request_bytes=None, response_bytes=10, retries=0)
+
+
+class TemplatePathTest(unittest.TestCase):
+
+    def test_ids(self):
+        self.assertEqual(
+            '/servers/{id}/action',
+            instrument.template_path(
+                '/servers', '0b6b4e3c-5d6a-4b7f-9a4e-2f0c6f7a8b9c',
+                'action?x=1', service='compute'))
+        self.assertEqual('/flavors/{id}',
+                         instrument.template_path('flavors', '42'))
+
+    def test_key_pairs(self):
+        self.assertEqual(
+            '/os-keypairs/{name}',
+            instrument.template_path('os-keypairs', 'my-key',
+                                     service='compute'))
+        self.assertEqual(
+            '/os-keypairs',
+            instrument.template_path('os-keypairs', service='compute'))
+
+    def test_object_store(self):
+        for args, path in [
+                ((), '/'),
+                (('photos',), '/{container}'),
+                (('photos', 'a/b/c.jpg'), '/{container}/{object}'),
+                (('photos?format=json',), '/{container}')]:
+            self.assertEqual(
+                path,
+                instrument.template_path(*args, service='object-store'))
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def test_failing_callback(self):
+        records = []
+
+        def broken(record):
+            raise RuntimeError('broken')
+
+        instrumentation = instrument.Instrumentation()
+        instrumentation.add_callback(broken)
+        instrumentation.add_callback(records.append)
+        record = make_record('/servers')
+        with self.assertLogs('yakumo.instrument', level='ERROR'):
+            instrumentation.emit(record)
+        self.assertEqual([record], records)
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_aggregate(self):
+        histogram = instrument.Histogram()
+        histogram(make_record('/servers', latency=0.003))
+        histogram(make_record('/servers', latency=0.2, status=500))
+        stats = histogram.get_stats()[('compute', 'GET', '/servers')]
+        self.assertEqual(2, stats['count'])
+        self.assertEqual(1, stats['errors'])
+        self.assertEqual({200: 1, 500: 1}, stats['statuses'])
+        self.assertEqual(0.25, stats['latency_p90'])
+
+    def test_max_keys(self):
+        histogram = instrument.Histogram(max_keys=3)
+        for i in range(10):
+            histogram(make_record('/path%d' % i))
+        stats = histogram.get_stats()
+        self.assertEqual(4, len(stats))
+        self.assertEqual(
+            7, stats[('compute', 'GET', instrument.OTHER_PATH)]['count'])
+
+
+if __name__ == '__main__':
+    unittest.main()
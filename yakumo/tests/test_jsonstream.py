@@ -0,0 +1,107 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import unittest
+
+from yakumo import jsonstream
+
+
+def split(data, size):
+    data = data.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+DOCUMENT = {
+    'servers': [
+        {'id': 1, 'name': u'サーバ', 'tags': ['a', 'b']},
+        {'id': 2, 'name': 'x', 'metadata': {}},
+        12345,
+        None,
+    ],
+    'servers_links': [{'rel': 'next', 'href': 'http://example.com/'}],
+    'count': 4,
+}
+
+
+class ListStreamTest(unittest.TestCase):
+
+    def test_object(self):
+        data = json.dumps(DOCUMENT, indent=1)
+        for size in (1, 3, 7, len(data)):
+            stream = jsonstream.ListStream(split(data, size), key='servers')
+            self.assertEqual(DOCUMENT['servers'], list(stream))
+            self.assertEqual(DOCUMENT['servers_links'],
+                             stream.extras['servers_links'])
+            self.assertEqual(4, stream.extras['count'])
+            self.assertNotIn('servers', stream.extras)
+
+    def test_array(self):
+        data = json.dumps(DOCUMENT['servers'])
+        for size in (1, 5):
+            stream = jsonstream.ListStream(split(data, size))
+            self.assertEqual(DOCUMENT['servers'], list(stream))
+
+    def test_number_at_end(self):
+        chunks = [b'[1', b'23, 4', b'5]']
+        self.assertEqual([123, 45], list(jsonstream.ListStream(chunks)))
+
+    def test_empty(self):
+        self.assertEqual([], list(jsonstream.ListStream([b' [ ] '])))
+        stream = jsonstream.ListStream([b'{"servers": []}'], key='servers')
+        self.assertEqual([], list(stream))
+        stream = jsonstream.ListStream([b'{}'], key='servers')
+        self.assertEqual([], list(stream))
+
+    def test_incremental(self):
+        def chunks():
+            yield b'[{"id": 1}, '
+            self.fail("read ahead of the first item")
+        stream = iter(jsonstream.ListStream(chunks()))
+        self.assertEqual({'id': 1}, next(stream))
+
+    def test_compact(self):
+        threshold = jsonstream.COMPACT_THRESHOLD
+        jsonstream.COMPACT_THRESHOLD = 8
+        try:
+            items = [{'id': i} for i in range(100)]
+            data = json.dumps(items)
+            stream = jsonstream.ListStream(split(data, 10))
+            self.assertEqual(items, list(stream))
+        finally:
+            jsonstream.COMPACT_THRESHOLD = threshold
+
+    def test_malformed(self):
+        for data, key in ((b'[1, 2', None), (b'[1 2]', None),
+                          (b'[{"id": }]', None), (b'1', None),
+                          (b'{"servers": [1]', 'servers'),
+                          (b'[1]', 'servers')):
+            stream = jsonstream.ListStream([data], key=key)
+            self.assertRaises(ValueError, list, stream)
+
+    def test_close(self):
+        closed = []
+        stream = jsonstream.ListStream([b'[1, 2]'],
+                                       close=lambda: closed.append(1))
+        self.assertEqual([1, 2], list(stream))
+        self.assertEqual([1], closed)
+        stream = jsonstream.ListStream([b'[1, '],
+                                       close=lambda: closed.append(2))
+        self.assertRaises(ValueError, list, stream)
+        self.assertEqual([1, 2], closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from datetime import datetime
+from datetime import timedelta
+import unittest
+
+import dateutil.tz
+import six
+
+from yakumo import mapper
+
+
+class ParseISO8601Test(unittest.TestCase):
+
+    def test_utc(self):
+        self.assertEqual(
+            datetime(2017, 1, 23, 4, 56, 7, tzinfo=dateutil.tz.tzutc()),
+            mapper.parse_iso8601('2017-01-23T04:56:07Z'))
+
+    def test_offset(self):
+        ret = mapper.parse_iso8601('2017-01-23T04:56:07+09:00')
+        self.assertEqual(timedelta(hours=9), ret.utcoffset())
+        ret = mapper.parse_iso8601('2017-01-23T04:56:07-0530')
+        self.assertEqual(-timedelta(hours=5, minutes=30), ret.utcoffset())
+        ret = mapper.parse_iso8601('2017-01-23T04:56:07+00:00')
+        self.assertIs(mapper.UTC, ret.tzinfo)
+
+    def test_naive(self):
+        self.assertEqual(datetime(2017, 1, 23, 4, 56, 7),
+                         mapper.parse_iso8601('2017-01-23 04:56:07'))
+
+    def test_fraction(self):
+        self.assertEqual(
+            120000,
+            mapper.parse_iso8601('2017-01-23T04:56:07.12').microsecond)
+        self.assertEqual(
+            123456,
+            mapper.parse_iso8601('2017-01-23T04:56:07.1234567Z').microsecond)
+
+    def test_other_formats(self):
+        for value in ['Mon, 23 Jan 2017 04:56:07 GMT', '1485147367',
+                      '2017-01-23', '2017-01-23T04:56', '',
+                      '2017-01-23T04:56:07Zjunk']:
+            self.assertIsNone(mapper.parse_iso8601(value), value)
+
+    def test_out_of_range(self):
+        self.assertRaises(ValueError, mapper.parse_iso8601,
+                          '2017-13-23T04:56:07Z')
+
+
+class DateTimeTest(unittest.TestCase):
+
+    def test_fast_path_and_memo(self):
+        value = six.u('2017-01-23T04:56:07Z')
+        ret = mapper.DateTime.to_attr(None, value)
+        self.assertEqual(datetime(2017, 1, 23, 4, 56, 7,
+                                  tzinfo=dateutil.tz.tzutc()), ret)
+        self.assertIs(ret, mapper.DateTime._cache[value])
+        self.assertIs(ret, mapper.DateTime.to_attr(None, value))
+
+    def test_fallback(self):
+        ret = mapper.DateTime.to_attr(None, 'Mon, 23 Jan 2017 04:56:07 GMT')
+        self.assertEqual(datetime(2017, 1, 23, 4, 56, 7,
+                                  tzinfo=dateutil.tz.tzutc()), ret)
+
+    def test_invalid(self):
+        self.assertIsNone(mapper.DateTime.to_attr(None, 'invalid'))
+        self.assertIsNone(
+            mapper.DateTime.to_attr(None, '2017-13-23 04:56:07'))
+        self.assertIsNone(mapper.DateTime.to_attr(None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from yakumo import ratelimit
+from yakumo.tests import fakes
+
+
+class RateLimitTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.time = fakes.FakeTime()
+        self._time = ratelimit.time
+        ratelimit.time = self.time
+
+    def tearDown(self):
+        ratelimit.time = self._time
+
+
+class TokenBucketTest(RateLimitTestCase):
+
+    def test_burst(self):
+        bucket = ratelimit.TokenBucket(2, burst=3)
+        self.assertEqual([0.0, 0.0, 0.0],
+                         [bucket.reserve() for i in range(3)])
+        self.assertEqual(0.5, bucket.reserve())
+        self.assertEqual(1.0, bucket.reserve())
+
+    def test_refill(self):
+        bucket = ratelimit.TokenBucket(2)
+        self.assertEqual(2, bucket.burst)
+        bucket.reserve()
+        bucket.reserve()
+        self.time.now += 0.5
+        self.assertEqual(0.0, bucket.reserve())
+        self.time.now += 60
+        self.assertEqual(0.0, bucket.reserve())
+        # refilled up to the burst only
+        self.assertEqual(1.0, bucket.tokens)
+
+
+class RateLimiterTest(RateLimitTestCase):
+
+    def test_acquire(self):
+        limiter = ratelimit.RateLimiter({'compute': 1})
+        limiter.acquire('compute')
+        limiter.acquire('compute')
+        limiter.acquire('compute')
+        self.assertEqual([1.0, 1.0], self.time.slept)
+        stats = limiter.get_stats()['compute']
+        self.assertEqual(3, stats['requests'])
+        self.assertEqual(2, stats['delayed'])
+        self.assertEqual(2.0, stats['wait_total'])
+        self.assertEqual(1.0, stats['wait_max'])
+
+    def test_services(self):
+        limiter = ratelimit.RateLimiter({'compute': 1, '*': 2},
+                                        bursts={'network': 5})
+        self.assertEqual(1, limiter._get_bucket('compute').burst)
+        self.assertEqual(5, limiter._get_bucket('network').burst)
+        self.assertEqual(2, limiter._get_bucket('volume').rate)
+        limiter = ratelimit.RateLimiter({'compute': 1})
+        for i in range(10):
+            self.assertEqual(0.0, limiter.reserve('volume'))
+        self.assertEqual(0, limiter.get_stats()['volume']['delayed'])
+
+    def test_from_config(self):
+        self.assertIsNone(ratelimit.RateLimiter.from_config({}))
+        limiter = ratelimit.RateLimiter.from_config(
+            {'rate_limit': '5', 'rate_limit_burst': '10'})
+        self.assertEqual({'*': 5.0}, limiter.rates)
+        self.assertEqual({'*': 10.0}, limiter.bursts)
+        limiter = ratelimit.RateLimiter.from_config(
+            {'rate_limit': {'compute': 5}})
+        self.assertEqual({'compute': 5}, limiter.rates)
+        self.assertEqual({}, limiter.bursts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from email.utils import formatdate
+import time
+import unittest
+
+from yakumo import retry
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+
+    def test_seconds(self):
+        self.assertEqual(120.0, retry.parse_retry_after('120'))
+        self.assertEqual(0.0, retry.parse_retry_after('-5'))
+
+    def test_http_date(self):
+        value = formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(30, retry.parse_retry_after(value), delta=2)
+        value = formatdate(time.time() - 30, usegmt=True)
+        self.assertEqual(0.0, retry.parse_retry_after(value))
+
+    def test_invalid(self):
+        self.assertIsNone(retry.parse_retry_after(None))
+        self.assertIsNone(retry.parse_retry_after('soon'))
+
+
+class RetryBudgetTest(unittest.TestCase):
+
+    def test_withdraw(self):
+        budget = retry.RetryBudget(ratio=0.5, minimum=2)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    def test_cap(self):
+        budget = retry.RetryBudget(ratio=0.5, minimum=2)
+        for i in range(10):
+            budget.deposit()
+        self.assertEqual(2, budget.balance)
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_is_retryable(self):
+        policy = retry.RetryPolicy()
+        self.assertTrue(policy.is_retryable('POST', status=503))
+        self.assertTrue(policy.is_retryable('POST', status=429))
+        self.assertFalse(policy.is_retryable('POST', status=500))
+        self.assertFalse(policy.is_retryable('POST', error=True))
+        self.assertTrue(policy.is_retryable('get', status=500))
+        self.assertTrue(policy.is_retryable('DELETE', error=True))
+        self.assertFalse(policy.is_retryable('GET', status=404))
+
+    def test_should_retry(self):
+        policy = retry.RetryPolicy(total=2)
+        self.assertTrue(policy.should_retry('GET', 0, status=503))
+        self.assertTrue(policy.should_retry('GET', 1, status=503))
+        self.assertFalse(policy.should_retry('GET', 2, status=503))
+        self.assertFalse(policy.should_retry('GET', 0, status=400))
+
+    def test_budget(self):
+        policy = retry.RetryPolicy(
+            budget=retry.RetryBudget(ratio=0.1, minimum=1))
+        self.assertTrue(policy.should_retry('GET', 0, status=503))
+        self.assertFalse(policy.should_retry('GET', 0, status=503))
+
+    def test_backoff(self):
+        policy = retry.RetryPolicy(backoff_factor=0.5, max_backoff=3.0)
+        for attempt, ceiling in ((0, 0.5), (1, 1.0), (2, 2.0), (5, 3.0)):
+            for i in range(50):
+                delay = policy.get_backoff(attempt)
+                self.assertTrue(0 <= delay <= ceiling)
+
+    def test_retry_after(self):
+        policy = retry.RetryPolicy(max_retry_after=60.0)
+        self.assertEqual(7.0, policy.get_backoff(0, retry_after='7'))
+        self.assertEqual(60.0, policy.get_backoff(0, retry_after='3600'))
+        self.assertTrue(policy.get_backoff(0, retry_after='soon') <= 0.5)
+        policy = retry.RetryPolicy(respect_retry_after=False)
+        self.assertTrue(policy.get_backoff(0, retry_after='7') <= 0.5)
+
+    def test_from_config(self):
+        self.assertIsNone(retry.RetryPolicy.from_config({'retries': '0'}))
+        policy = retry.RetryPolicy.from_config({
+            'retries': '5',
+            'retry_backoff': '1',
+            'retry_max_backoff': '10',
+            'retry_budget_ratio': '0.5',
+        })
+        self.assertEqual(5, policy.total)
+        self.assertEqual(1.0, policy.backoff_factor)
+        self.assertEqual(10.0, policy.max_backoff)
+        self.assertEqual(0.5, policy.budget.ratio)
+
+
+class RetryStatsTest(unittest.TestCase):
+
+    def test_record(self):
+        stats = retry.RetryStats()
+        stats.record('compute', 'GET', 0, 0.1)
+        stats.record('compute', 'GET', 2, 0.5, failed=True)
+        counter = stats.get()[('compute', 'GET')]
+        self.assertEqual(2, counter['calls'])
+        self.assertEqual(2, counter['retries'])
+        self.assertEqual(1, counter['failures'])
+        self.assertAlmostEqual(0.6, counter['latency_total'])
+        self.assertEqual(0.5, counter['latency_max'])
+        stats.reset()
+        self.assertEqual({}, stats.get())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,369 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import requests
+
+from yakumo import exception
+from yakumo import session
+from yakumo.tests import fakes
+
+
+class FakeAuthRef(object):
+
+    def __init__(self, expires):
+        self.expires = expires
+
+
+class FakeAuth(object):
+
+    auth_ref = None
+
+
+class FakeKeystoneSession(object):
+    """Keystone session handing out numbered tokens"""
+
+    def __init__(self, lifetime=3600):
+        self.auth = FakeAuth()
+        self.lifetime = lifetime
+        self.tokens = 0
+        self.invalidated = 0
+
+    def get_token(self):
+        self.tokens += 1
+        if self.lifetime is not None:
+            self.auth.auth_ref = FakeAuthRef(
+                datetime.datetime.utcfromtimestamp(session.time.time() +
+                                                   self.lifetime))
+        return 'token%d' % self.tokens
+
+    def invalidate(self):
+        self.invalidated += 1
+
+
+def make_session(lifetime=3600):
+    """Session with a fake keystone session only"""
+    ret = session.Session.__new__(session.Session)
+    ret.keystone_session = FakeKeystoneSession(lifetime)
+    ret._token_lock = threading.Lock()
+    ret.get_token()
+    return ret
+
+
+class FakeCloudConfig(object):
+    """Cloud config of an object store"""
+
+    endpoint = 'http://swift.example.com/v1/AUTH_x'
+
+    def __init__(self, **config):
+        self.config = config
+
+    def get_session(self):
+        return FakeKeystoneSession()
+
+    def get_services(self):
+        return ['object-store']
+
+    def get_session_endpoint(self, service):
+        return self.endpoint
+
+
+class FakeRaw(io.BytesIO):
+    """Response body failing at a position"""
+
+    def __init__(self, body, fail_at=None):
+        io.BytesIO.__init__(self, body)
+        self.fail_at = fail_at
+
+    def readinto(self, buf):
+        if self.fail_at is not None and self.tell() >= self.fail_at:
+            raise IOError('connection reset')
+        return io.BytesIO.readinto(self, buf)
+
+
+class RangeHTTP(object):
+    """HTTP session serving a file with Range support"""
+
+    def __init__(self, body, ranges=True):
+        self.body = body
+        self.ranges = ranges
+        self.fail_at = None
+        self.requested = []
+        self.responses = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        range_ = (headers or {}).get('Range') if self.ranges else None
+        self.requested.append(range_)
+        status, body, extra = 200, self.body, {}
+        if range_:
+            start = int(range_[len('bytes='):-1])
+            total = len(self.body)
+            if start >= total:
+                status, body = 416, b''
+                extra['Content-Range'] = 'bytes */%d' % total
+            else:
+                status, body = 206, self.body[start:]
+                extra['Content-Range'] = \
+                    'bytes %d-%d/%d' % (start, total - 1, total)
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(extra)
+        response.headers['Content-Length'] = str(len(body))
+        response.raw = FakeRaw(body, self.fail_at)
+        response.url = url
+        response.request = requests.Request(method, url).prepare()
+        self.fail_at = None
+        self.responses.append(response)
+        return response
+
+
+class GetFileTest(unittest.TestCase):
+
+    body = b'0123456789abcdef'
+
+    def setUp(self):
+        self.session = session.Session(FakeCloudConfig(download_chunk_size=4))
+        self.http = RangeHTTP(self.body)
+        self.session.http_sessions['object-store'] = self.http
+        self.dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.dir, 'obj')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, data):
+        with open(self.file, 'wb') as f:
+            f.write(data)
+
+    def read(self):
+        with open(self.file, 'rb') as f:
+            return f.read()
+
+    def get_file(self, **kwargs):
+        return self.session.get_file('object-store', 'c1', 'obj',
+                                     file=self.file, **kwargs)
+
+    def test_download(self):
+        self.write(b'garbage' * 5)
+        self.get_file()
+        self.assertEqual(self.body, self.read())
+        self.assertEqual([None], self.http.requested)
+
+    def test_resume(self):
+        self.write(self.body[:5])
+        headers = self.get_file(resume=True)
+        self.assertEqual(self.body, self.read())
+        self.assertEqual(['bytes=5-'], self.http.requested)
+        self.assertEqual('bytes 5-15/16', headers['Content-Range'])
+        self.assertTrue(self.http.responses[0].raw.closed)
+
+    def test_resume_completed(self):
+        self.write(self.body)
+        headers = self.get_file(resume=True)
+        self.assertEqual(self.body, self.read())
+        self.assertEqual(['bytes=16-'], self.http.requested)
+        self.assertEqual('bytes */16', headers['Content-Range'])
+        self.assertTrue(self.http.responses[0].raw.closed)
+
+    def test_resume_larger(self):
+        # the object was replaced with a smaller one
+        self.write(self.body * 2)
+        self.get_file(resume=True)
+        self.assertEqual(self.body, self.read())
+        self.assertEqual(['bytes=32-', None], self.http.requested)
+        self.assertTrue(self.http.responses[0].raw.closed)
+
+    def test_resume_without_ranges(self):
+        self.http.ranges = False
+        self.write(self.body[:5])
+        self.get_file(resume=True)
+        self.assertEqual(self.body, self.read())
+
+    def test_preallocate(self):
+        self.get_file(preallocate=True)
+        self.assertEqual(self.body, self.read())
+
+    def test_truncate_on_failure(self):
+        self.http.fail_at = 8
+        self.assertRaises(IOError, self.get_file, preallocate=True)
+        # preallocated space isn't left to be resumed from
+        self.assertEqual(self.body[:8], self.read())
+        self.get_file(resume=True, preallocate=True)
+        self.assertEqual(self.body, self.read())
+        self.assertEqual([None, 'bytes=8-'], self.http.requested)
+
+
+class OptionTest(unittest.TestCase):
+
+    def test_parse_bool(self):
+        for value in (True, 1, 'true', 'True', 'yes', 'on', '1', ' TRUE '):
+            self.assertIs(True, session.parse_bool(value))
+        for value in (False, 0, 'false', 'False', 'no', 'off', '0', ''):
+            self.assertIs(False, session.parse_bool(value, True))
+        self.assertIs(True, session.parse_bool(None, True))
+        self.assertIs(False, session.parse_bool(None))
+        self.assertRaises(ValueError, session.parse_bool, 'maybe')
+
+    def test_session(self):
+        s = session.Session(FakeCloudConfig(
+            compression='false', stream_lists='0', lazy_attrs='yes',
+            pool_block='False'))
+        self.assertFalse(s.compression)
+        self.assertFalse(s.stream_lists)
+        self.assertTrue(s.lazy_attrs)
+        self.assertFalse(s.pool_block)
+        s = session.Session(FakeCloudConfig())
+        self.assertTrue(s.compression)
+        self.assertFalse(s.stream_lists)
+        self.assertFalse(s.lazy_attrs)
+
+
+class FailingHTTP(object):
+    """HTTP session raising errors"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.requested = 0
+
+    def request(self, method, url, **kwargs):
+        self.requested += 1
+        raise self.errors.pop(0)
+
+
+class RetryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.session = session.Session(FakeCloudConfig(retry_backoff=0))
+
+    def request(self, http):
+        self.session.http_sessions['object-store'] = http
+        self.session.request('object-store', 'GET', 'c1')
+
+    def test_transient(self):
+        errors = requests.exceptions
+        http = FailingHTTP(errors.ConnectionError(), errors.ReadTimeout(),
+                           errors.ConnectTimeout(), errors.ConnectionError())
+        self.assertRaises(errors.ConnectionError, self.request, http)
+        self.assertEqual(4, http.requested)
+
+    def test_permanent(self):
+        errors = requests.exceptions
+        for error in (errors.InvalidURL(), errors.MissingSchema(),
+                      errors.SSLError(), errors.TooManyRedirects()):
+            http = FailingHTTP(error, errors.ConnectionError())
+            self.assertRaises(type(error), self.request, http)
+            self.assertEqual(1, http.requested)
+        self.assertEqual(10, self.session.retry_policy.budget.balance)
+
+
+class TokenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.time = fakes.FakeTime()
+        self._time = session.time
+        session.time = self.time
+
+    def tearDown(self):
+        session.time = self._time
+
+    def test_expires(self):
+        s = make_session()
+        self.assertEqual(self.time.now + 3600, s.token_expires)
+        self.assertFalse(s.token_will_expire())
+        self.time.now += 3600 - session.TOKEN_REFRESH_MARGIN
+        self.assertTrue(s.token_will_expire())
+
+    def test_ensure_token(self):
+        s = make_session()
+        s.ensure_token()
+        self.assertEqual('token1', s.token)
+        self.time.now += 3600 - session.TOKEN_REFRESH_MARGIN
+        s.ensure_token()
+        self.assertEqual('token2', s.token)
+        self.assertEqual(0, s.keystone_session.invalidated)
+
+    def test_unknown_expiry(self):
+        s = make_session(lifetime=None)
+        self.assertIsNone(s.token_expires)
+        self.time.now += 86400
+        s.ensure_token()
+        self.assertEqual('token1', s.token)
+
+    def test_renew_token(self):
+        s = make_session()
+        s.renew_token('token1')
+        self.assertEqual('token2', s.token)
+        self.assertEqual(1, s.keystone_session.invalidated)
+        # another thread has already renewed the rejected token
+        s.renew_token('token1')
+        self.assertEqual('token2', s.token)
+        self.assertEqual(1, s.keystone_session.invalidated)
+
+
+class ReauthTest(unittest.TestCase):
+
+    def setUp(self):
+        self.session = make_session(lifetime=None)
+        self.calls = []
+
+    def call(self, errors):
+        @session.reauth
+        def request(s):
+            self.calls.append(s.token)
+            if errors:
+                raise errors.pop(0)
+            return s.token
+        return request(self.session)
+
+    def test_unauthorized(self):
+        self.assertEqual('token2', self.call([exception.Unauthorized()]))
+        self.assertEqual(['token1', 'token2'], self.calls)
+
+    def test_not_found(self):
+        self.assertRaises(exception.NotFound, self.call,
+                          [exception.NotFound()])
+        self.assertEqual(['token1'], self.calls)
+        self.assertEqual(1, self.session.keystone_session.tokens)
+
+    def test_unauthorized_twice(self):
+        self.assertRaises(exception.Unauthorized, self.call,
+                          [exception.Unauthorized(), exception.Unauthorized()])
+        self.assertEqual(['token1', 'token2'], self.calls)
+
+
+class MakeConditionalHeadersTest(unittest.TestCase):
+
+    def test_headers(self):
+        kwargs = {'headers': {}, 'etag': '"e1"',
+                  'last_modified': 'Sat, 01 Jan 2017 00:00:00 GMT'}
+        session.Session.make_conditional_headers(kwargs)
+        self.assertEqual({'headers': {
+            'If-None-Match': '"e1"',
+            'If-Modified-Since': 'Sat, 01 Jan 2017 00:00:00 GMT',
+        }}, kwargs)
+        kwargs = {'headers': {}, 'etag': None}
+        session.Session.make_conditional_headers(kwargs)
+        self.assertEqual({'headers': {}}, kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
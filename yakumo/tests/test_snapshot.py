@@ -0,0 +1,114 @@
+# Copyright 2014-2017 by Akira Yoshiyama <akirayoshiyama@gmail.com>.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+# yakumo.nova.v2 first; it and yakumo.cinder.v2 import each other
+from yakumo.nova.v2 import flavor
+from yakumo.nova.v2 import server
+
+from yakumo.cinder.v2 import volume
+from yakumo.glance.v2 import image
+from yakumo.neutron.v2 import network
+from yakumo.neutron.v2 import port
+from yakumo import snapshot
+from yakumo.tests import fakes
+
+
+SERVERS = [
+    {'id': 'server1', 'name': 'vm1', 'flavor': {'id': 'flavor1'},
+     'image': {'id': 'image1', 'links': []}},
+    {'id': 'server2', 'name': 'vm2', 'flavor': {'id': 'flavor1'},
+     'image': ''},
+]
+FLAVORS = [{'id': 'flavor1', 'name': 'm1.tiny'}]
+IMAGES = [{'id': 'image1', 'name': 'cirros'}]
+NETWORKS = [{'id': 'network1', 'name': 'net1'}]
+PORTS = [
+    {'id': 'port1', 'network_id': 'network1', 'device_id': 'server1',
+     'device_owner': 'compute:nova'},
+    {'id': 'port2', 'network_id': 'network1', 'device_id': 'server1',
+     'device_owner': 'compute:nova'},
+    {'id': 'port3', 'network_id': 'network1', 'device_id': 'server2',
+     'device_owner': 'compute:nova'},
+]
+VOLUMES = [
+    {'id': 'volume1', 'attachments': [
+        {'id': 'volume1', 'volume_id': 'volume1', 'server_id': 'server1',
+         'device': '/dev/vdb'},
+        {'id': 'volume1', 'volume_id': 'volume1', 'server_id': 'server3',
+         'device': '/dev/vdb'},
+    ]},
+]
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        c = self.client = fakes.FakeClient()
+        c.nova = fakes.FakeClient()
+        c.neutron = fakes.FakeClient()
+        c.server = c.nova.server = server.Manager(c)
+        c.flavor = c.nova.flavor = flavor.Manager(c)
+        c.image = image.Manager(c)
+        c.network = c.neutron.network = network.Manager(c)
+        c.port = c.neutron.port = port.Manager(c)
+        c.volume = volume.Manager(c)
+        fakes.set_listing(c.server, SERVERS)
+        fakes.set_listing(c.flavor, FLAVORS)
+        fakes.set_listing(c.image, IMAGES)
+        fakes.set_listing(c.network, NETWORKS)
+        fakes.set_listing(c.port, PORTS)
+        fakes.set_listing(c.volume, VOLUMES)
+        self.snap = snapshot.Snapshot(
+            c, services=['server', 'flavor', 'image', 'network', 'port',
+                         'volume'])
+
+    def test_join(self):
+        server1 = self.snap.get('server', 'server1')
+        self.assertIs(server1.flavor, self.snap.get('flavor', 'flavor1'))
+        self.assertIs(server1.image, self.snap.get('image', 'image1'))
+        self.assertIsNone(self.snap.get('server', 'server2').image)
+        port1 = self.snap.get('port', 'port1')
+        self.assertIs(port1.network, self.snap.get('network', 'network1'))
+        self.assertIs(port1.device, server1)
+
+    def test_find_by_id_of_reference(self):
+        ports = self.snap.find('port', device='server1')
+        self.assertEqual(['port1', 'port2'], ports.get_ids())
+
+    def test_find_by_reference(self):
+        server2 = self.snap.get('server', 'server2')
+        ports = self.snap.find('port', device=server2)
+        self.assertEqual(['port3'], ports.get_ids())
+
+    def test_group_by_reference(self):
+        groups = self.snap['port'].group_by('device')
+        self.assertEqual(
+            [['port1', 'port2'], ['port3']],
+            [x.get_ids() for x in groups.values()])
+
+
+    def test_join_attachments(self):
+        attachments = self.snap.get('volume', 'volume1').attachments
+        self.assertIs(self.snap.get('server', 'server1'),
+                      attachments[0]['server'])
+        self.assertEqual('server1', attachments[0]['server_id'])
+        # not in the snapshot
+        self.assertNotIn('server', attachments[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
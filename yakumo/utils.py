@@ -22,6 +22,7 @@ import os
 import sys
 
 import os_client_config
+from six.moves.urllib import parse
 import yakumo
 
 
@@ -54,6 +55,21 @@ def join_path(*args):
     return '/'.join([str(x).strip('/') for x in args if x is not None])
 
 
+def get_query_params(url):
+    """
+    Query parameters of a URL
+
+    @param url: URL or path with a query string
+    @type url: str
+    @return: {key: value} (value is a list if the key is repeated)
+    @rtype: dict
+    """
+    params = {}
+    for key, values in parse.parse_qs(parse.urlparse(url).query).items():
+        params[key] = values[0] if len(values) == 1 else values
+    return params
+
+
 def get_json_body(base, **params):
     data = {}
     if not params: